@@ -0,0 +1,62 @@
+"""HybridAgentV3 for asyncio servers: one event loop drives many conversations."""
+from typing import AsyncIterator
+
+from agent.hybrid_agent_v3 import HybridAgentV3
+from agent.tool_calls import run_blocking, run_function_calls_async
+
+
+class AsyncHybridAgentV3(HybridAgentV3):
+    """HybridAgentV3 whose turns await Gemini and the database instead of blocking.
+    
+    The turn logic is HybridAgentV3._turn_steps, shared with the sync
+    agent; this class only carries out its I/O steps asynchronously.
+    Gemini is called with send_message_async, and database work (the fast
+    path and every tool call) runs on the async thread pool
+    (ASYNC_TOOL_CALL_WORKERS threads shared by all async agents), so a
+    waiting conversation holds no thread. Each agent still serves one
+    conversation at a time: await a turn before sending the next message.
+    """
+    
+    async def send_message_async(self, user_message: str) -> str:
+        """Send message and return the whole reply."""
+        return "".join([chunk async for chunk in self.send_message_stream_async(user_message)])
+    
+    async def send_message_stream_async(self, user_message: str) -> AsyncIterator[str]:
+        """send_message_stream for the event loop: yields the reply in text chunks."""
+        if not self.chat:
+            yield self.start_chat()
+            return
+        
+        steps = self._turn_steps(user_message)
+        stream = None
+        result, error = None, None
+        while True:
+            try:
+                op, argument = steps.throw(error) if error else steps.send(result)
+            except StopIteration:
+                return
+            result, error = None, None
+            if op == "text":
+                yield argument
+                continue
+            try:
+                if op == "call":
+                    result = await run_blocking(*argument)
+                elif op == "model":
+                    turn, message = argument
+                    stream = turn.stream_model_async(self.chat.send_message_async, message, stream=True)
+                elif op == "chunk":
+                    try:
+                        result = await stream.__anext__()
+                    except StopAsyncIteration:
+                        result = None
+                elif op == "tools":
+                    result = await run_function_calls_async(
+                        *argument, self.PARALLEL_SAFE_FUNCTIONS, self.TOOL_RESPONSE_SHAPES
+                    )
+            except Exception as e:
+                error = e
+    
+    async def reset_conversation_async(self) -> str:
+        """reset_conversation, releasing any held table off the event loop."""
+        return await run_blocking(self.reset_conversation)
@@ -0,0 +1,203 @@
+"""Rule-based extraction of fully specified booking requests, no LLM needed."""
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Minimum overall confidence for the agent to book without the LLM
+FAST_PATH_MIN_CONFIDENCE = 0.9
+
+# Fields a booking request needs; the name is only needed for new users
+REQUIRED_FIELDS = ("phone_number", "restaurant", "date", "time", "party_size")
+
+OPENING_MINUTES = (11 * 60, 23 * 60)
+SLOT_MINUTES = 30
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12
+}
+_NUMBER = r"(\d{1,2}|" + "|".join(NUMBER_WORDS) + r")"
+
+PHONE_RE = re.compile(r"(?<![\d+])(?:\+?91[\s-]?)?(\d{5}[\s-]?\d{5})(?!\d)")
+NAME_RE = re.compile(r"\b(?i:i am|i'm|im|my name is|name is|this is)\s+([A-Z][a-zA-Z'-]+(?:\s+[A-Z][a-zA-Z'-]+)?)")
+# A fast-path request must say it wants a booking...
+INTENT_RE = re.compile(r"\b(book|reserve|make a reservation)\b")
+# ...and must not be about changing one, negate anything, or ask something
+CHANGE_RE = re.compile(r"\b(cancel\w*|modify|modif\w+|change|reschedule|postpone|move|update|edit|delete|remove)\b")
+NEGATION_RE = re.compile(r"\b(not|no|dont|never|cannot|cant|wont|shouldnt|wouldnt|didnt|doesnt|isnt|arent|instead)\b")
+QUESTION_RE = re.compile(r"\?|(?:^|[.!]\s*)(is|are|can|could|do|does|did|what|which|how|when|where|why|will|would|should|may)\b")
+
+# (pattern, confidence); times must also fall on the opening-hours grid
+TIME_PATTERNS = [
+    (re.compile(r"\b(\d{1,2})(?::([0-5]\d))?\s*(am|pm|a\.m\.|p\.m\.)"), 1.0),
+    (re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b()"), 1.0),
+    (re.compile(r"\b(noon)\b()()"), 1.0),
+    # "at 7" with no am/pm
+    (re.compile(r"\bat\s+(\d{1,2})(?::([0-5]\d))?\b()(?!\s*(?:people|persons|guests|pax))"), 0.95),
+]
+# (pattern, confidence) for the party size
+PARTY_PATTERNS = [
+    (re.compile(r"\b(?:party|group|table) (?:of|for) " + _NUMBER + r"\b"), 1.0),
+    (re.compile(r"\b" + _NUMBER + r"\s*(?:people|persons|person|guests|pax|ppl|diners|of us)\b"), 1.0),
+    (re.compile(r"\bfor " + _NUMBER + r"\b(?!\s*(?::|am|pm|a\.m|p\.m|o'?clock))"), 0.95),
+]
+CONFIRM_RE = re.compile(r"^\s*(yes|yep|yeah|yup|sure|ok|okay|confirm|confirmed|go ahead|please do|book it)\b[\s!.]*"
+                        r"(please|thanks|thank you)?[\s!.]*$")
+DECLINE_RE = re.compile(r"^\s*(no|nope|nah|cancel|don't|do not)\b[\s!.]*(thanks|thank you)?[\s!.]*$")
+
+
+def parse_confirmation(message: str) -> Optional[bool]:
+    """True/False for a bare yes/no reply, None for anything else."""
+    text = message.lower().strip()
+    if CONFIRM_RE.match(text):
+        return True
+    if DECLINE_RE.match(text):
+        return False
+    return None
+
+
+class BookingExtractor:
+    """Extracts phone, name, restaurant, date, time and party size from one message.
+    
+    Each field gets its own confidence: 1.0 for explicit forms ("7 PM",
+    "tomorrow", "4 people"), less for forms that rely on convention ("at 7",
+    a bare weekday, "for 4"), and 0.5 when the message gives conflicting
+    values. The request's confidence is the lowest required-field
+    confidence. It is 0 when a field is missing, when there is no booking
+    verb, and when the message cancels or changes something, negates, or
+    asks a question: those go to the LLM however well the fields parse.
+    """
+    
+    def __init__(self, restaurants: List[Dict]):
+        self.restaurants = {}
+        for restaurant in restaurants:
+            self.restaurants[self._normalize(restaurant["name"])] = restaurant
+        # Longest names first so "Luigi's Kitchen" wins over a shorter overlap
+        names = sorted(self.restaurants, key=len, reverse=True)
+        self._restaurant_re = re.compile(
+            r"(?<!\w)(" + "|".join(re.escape(name) for name in names) + r")(?!\w)"
+        ) if names else None
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"['’`]", "", text.lower())
+    
+    def extract(self, message: str, now: Optional[datetime] = None) -> Dict:
+        """Fields found in the message, per-field confidences and the overall confidence."""
+        now = now or datetime.now()
+        fields, confidence = {}, {}
+        
+        phones = {re.sub(r"\D", "", m) for m in PHONE_RE.findall(message)}
+        if phones:
+            fields["phone_number"] = min(phones)
+            confidence["phone_number"] = 1.0 if len(phones) == 1 and fields["phone_number"][0] in "6789" else 0.5
+        # Digits of the phone number must not read as a time or party size
+        rest = PHONE_RE.sub(" ", message)
+        
+        name = NAME_RE.search(rest)
+        if name:
+            fields["name"] = name.group(1)
+            confidence["name"] = 1.0
+        
+        text = self._normalize(rest)
+        if self._restaurant_re:
+            matches = {m for m in self._restaurant_re.findall(text)}
+            if matches:
+                fields["restaurant"] = self.restaurants[max(matches, key=len)]
+                confidence["restaurant"] = 1.0 if len(matches) == 1 else 0.5
+                text = self._restaurant_re.sub(" ", text)
+        
+        for field, parse in (("date", self._parse_date), ("time", self._parse_time),
+                             ("party_size", self._parse_party_size)):
+            value, score = parse(text, now)
+            if value is not None:
+                fields[field] = value
+                confidence[field] = score
+        
+        missing = [field for field in REQUIRED_FIELDS if field not in fields]
+        refused = self._refusal(rest.lower(), text)
+        overall = 0.0 if missing or refused else min(confidence[field] for field in REQUIRED_FIELDS)
+        
+        return {**fields, "field_confidence": confidence, "missing": missing, "refused": refused,
+                "confidence": overall}
+    
+    @staticmethod
+    def _refusal(message: str, text: str) -> Optional[str]:
+        """Why the message is not a plain booking request, or None.
+        
+        Words are matched in text, which has the restaurant name removed.
+        """
+        if QUESTION_RE.search(message.strip()):
+            return "question"
+        if CHANGE_RE.search(text):
+            return "change"
+        if NEGATION_RE.search(text):
+            return "negation"
+        if not INTENT_RE.search(text):
+            return "no booking verb"
+        return None
+    
+    def _parse_date(self, text: str, now: datetime) -> Tuple[Optional[str], float]:
+        candidates = []
+        for match in re.finditer(r"\b(\d{4}-\d{2}-\d{2})\b", text):
+            try:
+                candidates.append((datetime.fromisoformat(match.group(1)).date(), 1.0))
+            except ValueError:
+                pass
+        if re.search(r"\bday after tomorrow\b", text):
+            candidates.append((now.date() + timedelta(days=2), 1.0))
+            text = text.replace("day after tomorrow", " ")
+        if re.search(r"\btomorrow\b", text):
+            candidates.append((now.date() + timedelta(days=1), 1.0))
+        if re.search(r"\b(today|tonight)\b", text):
+            candidates.append((now.date(), 1.0))
+        for match in re.finditer(r"\b(?:(next|this|on|coming)\s+)?(" + "|".join(WEEKDAYS) + r")\b", text):
+            days_ahead = (WEEKDAYS.index(match.group(2)) - now.weekday()) % 7
+            if match.group(1) == "next" and days_ahead == 0:
+                days_ahead = 7
+            candidates.append((now.date() + timedelta(days=days_ahead), 1.0 if match.group(1) else 0.9))
+        
+        return self._single(candidates, lambda day: day.isoformat())
+    
+    def _parse_time(self, text: str, now: datetime) -> Tuple[Optional[str], float]:
+        candidates = []
+        for pattern, score in TIME_PATTERNS:
+            for hour, minute, meridiem in pattern.findall(text):
+                match_score = score
+                if hour == "noon":
+                    minutes = 12 * 60
+                else:
+                    hour, minute = int(hour), int(minute or 0)
+                    if meridiem.startswith("p") and hour != 12:
+                        hour += 12
+                    elif meridiem.startswith("a") and hour == 12:
+                        hour = 0
+                    elif not meridiem and 1 <= hour <= 10:
+                        # During opening hours a bare 1-10 can only mean PM
+                        hour += 12
+                        match_score = min(score, 0.95)
+                    minutes = hour * 60 + minute
+                
+                # Off the booking grid: leave it to the LLM to explain
+                on_grid = OPENING_MINUTES[0] <= minutes <= OPENING_MINUTES[1] and minutes % SLOT_MINUTES == 0
+                candidates.append((minutes, match_score if on_grid else 0.5))
+        
+        return self._single(candidates, lambda minutes: f"{minutes // 60:02d}:{minutes % 60:02d}")
+    
+    def _parse_party_size(self, text: str, now: datetime) -> Tuple[Optional[int], float]:
+        candidates = []
+        for pattern, score in PARTY_PATTERNS:
+            for value in pattern.findall(text):
+                size = NUMBER_WORDS.get(value) or int(value)
+                candidates.append((size, score if 1 <= size <= 20 else 0.5))
+        return self._single(candidates, lambda size: size)
+    
+    @staticmethod
+    def _single(candidates: List[Tuple], render) -> Tuple[Optional[object], float]:
+        """The value if every candidate agrees (best confidence), else a low-confidence pick."""
+        if not candidates:
+            return None, 0.0
+        values = {value for value, _ in candidates}
+        best_value, best_score = max(candidates, key=lambda candidate: candidate[1])
+        return render(best_value), best_score if len(values) == 1 else 0.5
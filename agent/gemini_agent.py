@@ -5,24 +5,48 @@ from typing import Any, Dict, List
 import google.generativeai as genai
 from datetime import datetime
 
+from agent.metrics import SessionMetrics
+from agent.model_factory import get_model
+from agent.response_cache import ConversationCache, catalog_lookup, record_exchange
+from agent.tool_calls import run_function_calls
+from agent.tool_responses import RESTAURANT_FIELDS, ResponseShape
+
 class RestaurantAgent:
     """Conversational AI agent for restaurant reservations."""
     
+    # Tools that only read the database; consecutive calls to these run
+    # concurrently (see agent/tool_calls.py)
+    PARALLEL_SAFE_FUNCTIONS = frozenset({
+        "search_restaurants", "get_restaurant_details", "check_availability",
+        "get_reservation_details", "find_nearby_restaurants", "recommend_restaurants"
+    })
+    # Tools that only read the restaurant catalog; a conversation that calls
+    # nothing else can have its replies cached (see agent/response_cache.py)
+    CATALOG_TOOLS = frozenset({
+        "search_restaurants", "get_restaurant_details", "find_nearby_restaurants", "recommend_restaurants"
+    })
+    # Results trimmed before they go back to the model: projected columns,
+    # top-k pages with a cursor (see agent/tool_responses.py)
+    TOOL_RESPONSE_SHAPES = {
+        "search_restaurants": ResponseShape({"restaurants": RESTAURANT_FIELDS}, page="restaurants"),
+        "find_nearby_restaurants": ResponseShape(
+            {"restaurants": (*RESTAURANT_FIELDS, "distance_km")}, page="restaurants"
+        ),
+        "recommend_restaurants": ResponseShape({"recommendations": RESTAURANT_FIELDS})
+    }
+    
     def __init__(self, api_key: str, database):
         """Initialize the agent with Gemini API."""
-        genai.configure(api_key=api_key)
-        
-        # Using gemini-2.0-flash-exp or gemini-1.5-flash
-        self.model = genai.GenerativeModel(
-            model_name='gemini-1.5-flash',
-            tools=[self._get_function_declarations()]
-        )
+        # Shared across sessions; built on first use for this API key
+        self.model = get_model(RestaurantAgent, api_key)
         
         self.database = database
         self.chat = None
+        self.metrics = SessionMetrics()
         self.conversation_history = []
         
-    def _get_function_declarations(self):
+    @staticmethod
+    def _get_function_declarations():
         """Define all function declarations for the agent."""
         return [
             genai.protos.FunctionDeclaration(
@@ -46,6 +70,10 @@ class RestaurantAgent:
                         "price_range": genai.protos.Schema(
                             type=genai.protos.Type.STRING,
                             description="Price range ($, $$, $$$, $$$$)"
+                        ),
+                        "cursor": genai.protos.Schema(
+                            type=genai.protos.Type.INTEGER,
+                            description="Offset of the next page of results: the next_cursor of a previous search"
                         )
                     }
                 )
@@ -176,6 +204,32 @@ class RestaurantAgent:
                         )
                     }
                 )
+            ),
+            genai.protos.FunctionDeclaration(
+                name="find_nearby_restaurants",
+                description="Find restaurants closest to a neighbourhood (e.g. 'near Koramangala'), nearest first with distance in km",
+                parameters=genai.protos.Schema(
+                    type=genai.protos.Type.OBJECT,
+                    properties={
+                        "location": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Neighbourhood to search around (e.g., Koramangala, Indiranagar, MG Road)"
+                        ),
+                        "cuisine": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Optional cuisine filter"
+                        ),
+                        "min_rating": genai.protos.Schema(
+                            type=genai.protos.Type.NUMBER,
+                            description="Optional minimum rating (0.0 to 5.0)"
+                        ),
+                        "radius_km": genai.protos.Schema(
+                            type=genai.protos.Type.NUMBER,
+                            description="Optional maximum distance in kilometres"
+                        )
+                    },
+                    required=["location"]
+                )
             )
         ]
     
@@ -193,11 +247,13 @@ class RestaurantAgent:
                 if "price_range" in function_args:
                     filters["price_range"] = function_args["price_range"]
                 
-                results = self.database.get_restaurants(filters if filters else None)
-                return {"restaurants": results[:10], "total_found": len(results)}
+                results = catalog_lookup(self.database, self.database.get_restaurants, filters if filters else None)
+                # Paged to the model by TOOL_RESPONSE_SHAPES
+                return {"restaurants": results, "total_found": len(results)}
             
             elif function_name == "get_restaurant_details":
-                restaurant = self.database.get_restaurant_by_id(function_args["restaurant_id"])
+                restaurant = catalog_lookup(self.database, self.database.get_restaurant_by_id,
+                                            function_args["restaurant_id"])
                 return {"restaurant": restaurant} if restaurant else {"error": "Restaurant not found"}
             
             elif function_name == "check_availability":
@@ -232,35 +288,26 @@ class RestaurantAgent:
                 reservation = self.database.get_reservation(function_args["reservation_id"])
                 return {"reservation": reservation} if reservation else {"error": "Reservation not found"}
             
+            elif function_name == "find_nearby_restaurants":
+                filters = {key: function_args[key] for key in ("cuisine", "min_rating") if key in function_args}
+                results, message = catalog_lookup(
+                    self.database, self.database.find_restaurants_near,
+                    function_args["location"],
+                    radius_km=function_args.get("radius_km"),
+                    filters=filters
+                )
+                if results is None:
+                    return {"error": message}
+                return {"restaurants": results}
+            
             elif function_name == "recommend_restaurants":
-                # Recommendation logic based on occasion and preferences
-                all_restaurants = self.database.get_restaurants()
-                
-                recommendations = []
-                occasion = function_args.get("occasion", "").lower()
-                dietary = function_args.get("dietary_restrictions", "").lower()
-                
-                # Simple recommendation logic
-                if "romantic" in occasion or "date" in occasion:
-                    # Prefer fine dining, Italian, French
-                    recommendations = [r for r in all_restaurants if r["price_range"] in ["$$$", "$$$$"] 
-                                     and r["cuisine"] in ["Italian", "French", "Continental"]]
-                elif "business" in occasion or "meeting" in occasion:
-                    # Prefer quiet, upscale places
-                    recommendations = [r for r in all_restaurants if r["price_range"] in ["$$", "$$$"] 
-                                     and r["rating"] >= 4.3]
-                elif "family" in occasion:
-                    # Prefer larger capacity, varied options
-                    recommendations = [r for r in all_restaurants if r["capacity"] >= 50]
-                elif "vegetarian" in dietary or "vegan" in dietary:
-                    recommendations = [r for r in all_restaurants if r["cuisine"] in ["Vegetarian", "Vegan", "Indian", "Mediterranean"]]
-                else:
-                    # General high-rated recommendations
-                    recommendations = [r for r in all_restaurants if r["rating"] >= 4.4]
-                
-                # Sort by rating and return top 5
-                recommendations.sort(key=lambda x: x["rating"], reverse=True)
-                return {"recommendations": recommendations[:5]}
+                # Precomputed top-5 per occasion / dietary bucket
+                recommendations = catalog_lookup(
+                    self.database, self.database.recommend_restaurants,
+                    function_args.get("occasion", ""),
+                    function_args.get("dietary_restrictions", "")
+                )
+                return {"recommendations": recommendations}
             
             else:
                 return {"error": f"Unknown function: {function_name}"}
@@ -284,6 +331,7 @@ Provide personalized recommendations based on the user's needs."""
         
         self.chat = self.model.start_chat(history=[])
         self.conversation_history = []
+        self.conversation_cache = ConversationCache(type(self).__name__, self.database, self.CATALOG_TOOLS)
         return "Chat started! How can I help you with restaurant reservations today?"
     
     def send_message(self, user_message: str) -> str:
@@ -293,44 +341,43 @@ Provide personalized recommendations based on the user's needs."""
         
         self.conversation_history.append({"role": "user", "content": user_message})
         
+        turn = self.metrics.start_turn()
         try:
-            response = self.chat.send_message(user_message)
+            # Another session may already have asked the same thing
+            cached_reply = self.conversation_cache.lookup(user_message)
+            if cached_reply is not None:
+                record_exchange(self.chat, user_message, cached_reply)
+                self.conversation_history.append({"role": "assistant", "content": cached_reply})
+                self.metrics.finish_turn(turn, "cache")
+                return cached_reply
+            
+            execute = turn.track(self.conversation_cache.track(self._execute_function))
+            response = turn.call_model(self.chat.send_message, user_message)
             
             # Handle function calls
             while response.candidates[0].content.parts:
-                part = response.candidates[0].content.parts[0]
-                
-                # Check if it's a function call
-                if hasattr(part, 'function_call') and part.function_call:
-                    function_call = part.function_call
-                    function_name = function_call.name
-                    function_args = dict(function_call.args)
-                    
-                    # Execute the function
-                    function_response = self._execute_function(function_name, function_args)
-                    
-                    # Send function response back to the model
-                    response = self.chat.send_message(
-                        genai.protos.Content(
-                            parts=[genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=function_name,
-                                    response={"result": function_response}
-                                )
-                            )]
-                        )
+                # Run every function call in the turn and answer them in one message
+                with turn.timing_tools():
+                    function_responses = run_function_calls(
+                        response.candidates[0].content.parts, execute, self.PARALLEL_SAFE_FUNCTIONS,
+                        self.TOOL_RESPONSE_SHAPES
                     )
-                else:
+                if function_responses is None:
                     # Regular text response
                     break
+                
+                response = turn.call_model(self.chat.send_message, function_responses)
             
             # Get the final text response
             final_response = response.text
+            self.conversation_cache.store(final_response)
+            self.metrics.finish_turn(turn)
             self.conversation_history.append({"role": "assistant", "content": final_response})
             
             return final_response
             
         except Exception as e:
+            self.metrics.finish_turn(turn, "error")
             error_msg = f"I'm sorry, I encountered an error: {str(e)}"
             self.conversation_history.append({"role": "assistant", "content": error_msg})
             return error_msg
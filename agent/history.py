@@ -0,0 +1,62 @@
+"""Bounded chat history: the last few turns verbatim, older ones folded into a summary."""
+from typing import Callable, List
+
+import google.generativeai as genai
+
+# Turns (a user message and everything up to the next one) kept verbatim
+HISTORY_MAX_TURNS = 6
+
+SUMMARY_PREFIX = "[Conversation summary]"
+SUMMARY_ACK = "Understood, I'll continue from there."
+
+
+def _is_user_message(content) -> bool:
+    """A user turn starts with typed text; function responses also have role 'user'."""
+    return content.role == "user" and any(part.text for part in content.parts)
+
+
+def _is_summary(content) -> bool:
+    return _is_user_message(content) and content.parts[0].text.startswith(SUMMARY_PREFIX)
+
+
+def split_turns(history: List) -> List[List]:
+    """Group history into turns, each starting at a user message (any summary pair is dropped)."""
+    if history and _is_summary(history[0]):
+        history = history[2:]
+    turns = []
+    for content in history:
+        if _is_user_message(content) or not turns:
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+
+class HistoryManager:
+    """Keeps a ChatSession's history to max_turns turns plus a state summary.
+    
+    Older turns, with their function calls and full restaurant lists, are
+    replaced by one user/model exchange carrying summarize()'s text, which
+    the agent builds from user_context. The summary is rebuilt on every
+    compaction, so it always reflects the current state.
+    """
+    
+    def __init__(self, summarize: Callable[[], str], max_turns: int = HISTORY_MAX_TURNS):
+        self.summarize = summarize
+        self.max_turns = max_turns
+        self.trimmed_turns = 0
+    
+    def compact(self, chat) -> bool:
+        """Trim chat.history in place if it holds more than max_turns turns."""
+        turns = split_turns(chat.history)
+        if len(turns) <= self.max_turns:
+            return False
+        
+        self.trimmed_turns += len(turns) - self.max_turns
+        summary = (f"{SUMMARY_PREFIX} {self.trimmed_turns} earlier turns were trimmed. "
+                   f"What we know so far:\n{self.summarize()}")
+        chat.history = [
+            genai.protos.Content(role="user", parts=[genai.protos.Part(text=summary)]),
+            genai.protos.Content(role="model", parts=[genai.protos.Part(text=SUMMARY_ACK)]),
+            *(content for turn in turns[-self.max_turns:] for content in turn)
+        ]
+        return True
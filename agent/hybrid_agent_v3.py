@@ -1,24 +1,53 @@
 """Hybrid AI Agent V3 - Natural conversation with smart data collection."""
 import json
 import re
+import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Generator, Iterator, Optional, Tuple
 import google.generativeai as genai
 
+from agent.fast_path import FAST_PATH_MIN_CONFIDENCE, BookingExtractor, parse_confirmation
+from agent.history import HistoryManager
+from agent.metrics import SessionMetrics
+from agent.model_factory import get_model
+from agent.response_cache import ConversationCache, catalog_lookup, record_exchange
+from agent.tool_calls import ordered_context_write, run_function_calls
+from agent.tool_responses import RESTAURANT_FIELDS, ResponseShape
+
 class HybridAgentV3:
     """Intelligent conversational agent that adapts to user input style."""
     
+    # Lookups: consecutive calls to these run concurrently, and their
+    # user_context writes go through ordered_context_write so they land in
+    # call order (see agent/tool_calls.py). Tools that change the database
+    # or replace the context are barriers.
+    PARALLEL_SAFE_FUNCTIONS = frozenset({
+        "get_current_datetime", "parse_date_time", "search_restaurants", "find_nearby_restaurants"
+    })
+    # Tools that only read the restaurant catalog; a conversation that calls
+    # nothing else can have its replies cached (see agent/response_cache.py)
+    CATALOG_TOOLS = frozenset({"search_restaurants", "find_nearby_restaurants"})
+    # Results trimmed before they go back to the model: projected columns,
+    # top-k pages with a cursor (see agent/tool_responses.py)
+    TOOL_RESPONSE_SHAPES = {
+        "search_restaurants": ResponseShape({"restaurants": RESTAURANT_FIELDS}, page="restaurants"),
+        "find_nearby_restaurants": ResponseShape(
+            {"restaurants": (*RESTAURANT_FIELDS, "distance_km")}, page="restaurants"
+        ),
+        "check_availability_and_book": ResponseShape({"restaurant": (*RESTAURANT_FIELDS, "address")})
+    }
+    
     def __init__(self, api_key: str, database):
         """Initialize the hybrid agent."""
-        genai.configure(api_key=api_key)
-        
-        self.model = genai.GenerativeModel(
-            model_name='gemini-1.5-flash',
-            tools=[self._get_function_declarations()]
-        )
+        # Shared across sessions; built on first use for this API key
+        self.model = get_model(HybridAgentV3, api_key)
         
         self.database = database
         self.chat = None
+        self.metrics = SessionMetrics()
+        self.session_id = uuid.uuid4().hex
+        self._extractor = None  # built from the restaurant catalog on first use
+        self._extractor_version = None  # catalog_version the extractor was built from
         self.user_context = {
             "authenticated": False,
             "has_phone": False,
@@ -28,7 +57,8 @@ class HybridAgentV3:
             "pending_booking": {}
         }
         
-    def _get_function_declarations(self):
+    @staticmethod
+    def _get_function_declarations():
         """Define function declarations."""
         return [
             # Information extraction functions
@@ -161,10 +191,40 @@ class HybridAgentV3:
                         "location": genai.protos.Schema(
                             type=genai.protos.Type.STRING,
                             description="Location/area"
+                        ),
+                        "cursor": genai.protos.Schema(
+                            type=genai.protos.Type.INTEGER,
+                            description="Offset of the next page of results: the next_cursor of a previous search"
                         )
                     }
                 )
             ),
+            genai.protos.FunctionDeclaration(
+                name="find_nearby_restaurants",
+                description="Find restaurants closest to a neighbourhood (e.g. 'near Koramangala'), nearest first with distance in km",
+                parameters=genai.protos.Schema(
+                    type=genai.protos.Type.OBJECT,
+                    properties={
+                        "location": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Neighbourhood to search around (e.g., Koramangala, Indiranagar, MG Road)"
+                        ),
+                        "cuisine": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Optional cuisine filter"
+                        ),
+                        "min_rating": genai.protos.Schema(
+                            type=genai.protos.Type.NUMBER,
+                            description="Optional minimum rating (0.0 to 5.0)"
+                        ),
+                        "radius_km": genai.protos.Schema(
+                            type=genai.protos.Type.NUMBER,
+                            description="Optional maximum distance in kilometres"
+                        )
+                    },
+                    required=["location"]
+                )
+            ),
             genai.protos.FunctionDeclaration(
                 name="check_availability_and_book",
                 description="Check availability for a restaurant and proceed with booking if available. Call this when you have restaurant, date, time, and party size.",
@@ -191,6 +251,36 @@ class HybridAgentV3:
                     required=["restaurant_id", "date", "time", "party_size"]
                 )
             ),
+            genai.protos.FunctionDeclaration(
+                name="join_waitlist",
+                description="Put the user on the waitlist when the restaurant is fully booked. They are booked automatically if a matching table frees up.",
+                parameters=genai.protos.Schema(
+                    type=genai.protos.Type.OBJECT,
+                    properties={
+                        "restaurant_id": genai.protos.Schema(
+                            type=genai.protos.Type.INTEGER,
+                            description="Restaurant ID"
+                        ),
+                        "date": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Date in YYYY-MM-DD format"
+                        ),
+                        "earliest_time": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Earliest acceptable time in HH:MM format"
+                        ),
+                        "latest_time": genai.protos.Schema(
+                            type=genai.protos.Type.STRING,
+                            description="Latest acceptable time in HH:MM format"
+                        ),
+                        "party_size": genai.protos.Schema(
+                            type=genai.protos.Type.INTEGER,
+                            description="Number of people"
+                        )
+                    },
+                    required=["restaurant_id", "date", "earliest_time", "latest_time", "party_size"]
+                )
+            ),
             genai.protos.FunctionDeclaration(
                 name="confirm_and_create_reservation",
                 description="Create the final reservation after user confirms. Only call after user explicitly confirms.",
@@ -287,7 +377,8 @@ class HybridAgentV3:
             
             elif function_name == "get_current_datetime":
                 current_dt = self.database.get_current_datetime()
-                self.user_context["current_datetime"] = current_dt.isoformat()
+                with ordered_context_write():
+                    self.user_context["current_datetime"] = current_dt.isoformat()
                 return {
                     "current_date": current_dt.strftime("%Y-%m-%d"),
                     "current_time": current_dt.strftime("%H:%M"),
@@ -315,19 +406,35 @@ class HybridAgentV3:
             elif function_name == "search_restaurants":
                 # Search by name first
                 if "restaurant_name" in function_args and function_args["restaurant_name"]:
-                    restaurant = self.database.get_restaurant_by_name(function_args["restaurant_name"])
+                    restaurant = catalog_lookup(
+                        self.database, self.database.get_restaurant_by_name, function_args["restaurant_name"]
+                    )
                     if restaurant:
-                        self.user_context["selected_restaurant"] = restaurant
-                        self.user_context["pending_booking"]["restaurant_id"] = restaurant["id"]
+                        with ordered_context_write():
+                            self.user_context["selected_restaurant"] = restaurant
+                            self.user_context["pending_booking"]["restaurant_id"] = restaurant["id"]
                         return {"restaurants": [restaurant], "found": True, "total": 1}
                 
                 # Search by cuisine/location
-                results = self.database.search_restaurants(
+                results = catalog_lookup(
+                    self.database, self.database.search_restaurants,
                     cuisine=function_args.get("cuisine"),
                     location=function_args.get("location")
                 )
                 return {"restaurants": results, "found": len(results) > 0, "total": len(results)}
             
+            elif function_name == "find_nearby_restaurants":
+                results, message = catalog_lookup(
+                    self.database, self.database.find_restaurants_near,
+                    function_args["location"],
+                    radius_km=function_args.get("radius_km"),
+                    cuisine=function_args.get("cuisine"),
+                    min_rating=function_args.get("min_rating")
+                )
+                if results is None:
+                    return {"error": message}
+                return {"restaurants": results, "found": len(results) > 0, "total": len(results)}
+            
             elif function_name == "check_availability_and_book":
                 restaurant_id = function_args["restaurant_id"]
                 date = function_args["date"]
@@ -339,16 +446,31 @@ class HybridAgentV3:
                 if not is_valid:
                     return {"available": False, "error": message}
                 
-                # Find available slot
-                nearest_slot = self.database.find_nearest_available_slot(
-                    restaurant_id, date, time, party_size
-                )
+                # A new availability check supersedes any earlier hold
+                self._release_pending_hold()
+                
+                # Find an available slot and hold its table while the user confirms.
+                # Another session may grab the table between the two calls, so retry.
+                nearest_slot, hold = None, None
+                for _ in range(3):
+                    nearest_slot = self.database.find_nearest_available_slot(
+                        restaurant_id, date, time, party_size, holder=self.session_id
+                    )
+                    if not nearest_slot:
+                        break
+                    hold, _ = self.database.create_hold(
+                        restaurant_id, nearest_slot["table_id"], date,
+                        nearest_slot["time"], party_size, holder=self.session_id
+                    )
+                    if hold:
+                        break
                 
-                if nearest_slot:
+                if nearest_slot and hold:
                     # Store for confirmation
                     self.user_context["pending_booking"] = {
                         "restaurant_id": restaurant_id,
                         "table_id": nearest_slot["table_id"],
+                        "hold_id": hold["hold_id"],
                         "date": date,
                         "time": nearest_slot["time"],
                         "party_size": party_size,
@@ -382,11 +504,33 @@ class HybridAgentV3:
                     return {
                         "available": False,
                         "message": "No availability for requested time",
-                        "alternate_dates": alternate_slots
+                        "alternate_dates": alternate_slots,
+                        "can_join_waitlist": True
                     }
             
+            elif function_name == "join_waitlist":
+                phone = self.user_context.get("phone_number")
+                name = self.user_context.get("name")
+                if not all([phone, name]):
+                    return {"success": False, "error": "Need phone number and name to join the waitlist"}
+                
+                entry, message = self.database.join_waitlist(
+                    restaurant_id=function_args["restaurant_id"],
+                    date=function_args["date"],
+                    earliest_slot=function_args["earliest_time"],
+                    latest_slot=function_args["latest_time"],
+                    party_size=function_args["party_size"],
+                    phone_number=phone,
+                    customer_name=name
+                )
+                if entry:
+                    self.user_context["waitlist_id"] = entry["id"]
+                    return {"success": True, "waitlist_entry": entry, "message": message}
+                return {"success": False, "message": message}
+            
             elif function_name == "confirm_and_create_reservation":
                 if not function_args.get("confirmed"):
+                    self._release_pending_hold()
                     self.user_context["pending_booking"] = {}
                     return {"success": False, "message": "Booking cancelled by user"}
                 
@@ -405,7 +549,8 @@ class HybridAgentV3:
                     customer_name=name,
                     date=booking["date"],
                     time_slot=booking["time"],
-                    party_size=booking["party_size"]
+                    party_size=booking["party_size"],
+                    hold_id=booking.get("hold_id")
                 )
                 
                 if reservation:
@@ -425,6 +570,12 @@ class HybridAgentV3:
         except Exception as e:
             return {"error": str(e)}
     
+    def _release_pending_hold(self):
+        """Release the table hold for the pending booking, if any."""
+        hold_id = self.user_context.get("pending_booking", {}).pop("hold_id", None)
+        if hold_id:
+            self.database.release_hold(hold_id)
+    
     def _parse_time(self, time_text: str, current_dt: datetime) -> Optional[str]:
         """Parse time from natural language."""
         time_text_lower = time_text.lower()
@@ -468,14 +619,14 @@ class HybridAgentV3:
         """Get alternate dates within 3-day window."""
         from datetime import timedelta
         try:
-            date_obj = datetime.strptime(original_date, "%Y-%m-%d")
+            date_obj = datetime.fromisoformat(original_date).date()
             current = datetime.now().date()
             
             alternates = []
             for days_ahead in range(4):  # 0, 1, 2, 3 days
                 check_date = current + timedelta(days=days_ahead)
-                if check_date != date_obj.date():
-                    alternates.append(check_date.strftime("%Y-%m-%d"))
+                if check_date != date_obj:
+                    alternates.append(check_date.isoformat())
             
             return alternates[:3]  # Return up to 3 alternate dates
         except:
@@ -506,6 +657,7 @@ CONVERSATION STYLE:
 ✅ Ask only for missing pieces
 ✅ Confirm before final booking
 ✅ Acknowledge what they've already told you
+✅ For "near <area>" requests, call find_nearby_restaurants and mention the distances
 
 EXAMPLES OF GOOD RESPONSES:
 
@@ -549,55 +701,240 @@ FLOW:
 Be smart: If they give you everything at once, process it all. If they give piece by piece, guide them naturally."""
         
         self.chat = self.model.start_chat(history=[])
+        self.conversation_cache = ConversationCache(
+            type(self).__name__, self.database, self.CATALOG_TOOLS, self.get_user_context
+        )
+        self.history = HistoryManager(self._summarize_context)
         
         return "Hey! This is Table Turner from GoodFoods, at your service today. 🍽️\n\nHow can I help you with your dining plans? (I'll need your mobile number to get started)"
     
+    def _try_fast_path(self, user_message: str,
+                       execute: Optional[Callable[[str, Dict], Any]] = None) -> Optional[str]:
+        """Answer without the LLM when the message is unambiguous.
+        
+        Handles a bare yes/no to a held booking, and booking requests where
+        the extractor found every field with high confidence. Tools run
+        through execute (the turn's tracked _execute_function). Returns None
+        to hand the message to the LLM.
+        """
+        execute = execute or self._execute_function
+        booking = self.user_context.get("pending_booking", {})
+        if booking.get("hold_id") and self.user_context.get("authenticated"):
+            confirmed = parse_confirmation(user_message)
+            if confirmed is not None:
+                result = execute("confirm_and_create_reservation", {"confirmed": confirmed})
+                return self._fast_path_confirmation_reply(result)
+        
+        # Rebuild when the restaurants change (e.g. the database was reset and re-seeded)
+        catalog_version = self.database.catalog_version
+        if self._extractor is None or self._extractor_version != catalog_version:
+            self._extractor = BookingExtractor(self.database.search_restaurants())
+            self._extractor_version = catalog_version
+        request = self._extractor.extract(user_message, self.database.get_current_datetime())
+        if request["confidence"] < FAST_PATH_MIN_CONFIDENCE:
+            return None
+        
+        # New users need a name before anything is written
+        phone = request["phone_number"]
+        if not self.database.check_user_exists(phone) and not request.get("name"):
+            return None
+        
+        execute("extract_and_verify_phone", {"phone_number": phone})
+        auth = execute("authenticate_user", {"phone_number": phone})
+        if not auth.get("exists"):
+            execute("register_new_user", {"phone_number": phone, "name": request["name"]})
+        
+        restaurant = request["restaurant"]
+        result = execute("check_availability_and_book", {
+            "restaurant_id": restaurant["id"],
+            "date": request["date"],
+            "time": request["time"],
+            "party_size": request["party_size"]
+        })
+        return self._fast_path_availability_reply(restaurant, request, result)
+    
+    def _fast_path_availability_reply(self, restaurant: Dict, request: Dict, result: Dict) -> str:
+        """Phrase a check_availability_and_book result."""
+        name = self.user_context.get("name") or "there"
+        when = datetime.fromisoformat(request["date"]).strftime("%A, %B %d")
+        
+        if result.get("error"):
+            error = result["error"].rstrip(".")
+            return f"Sorry {name}, {error[0].lower() + error[1:]}. Could you pick another date?"
+        
+        if result.get("available"):
+            slot_time = self._format_time(result["slot"]["time"])
+            if result["is_exact_match"]:
+                opening = f"Great news, {name}! {restaurant['name']} has a table"
+            else:
+                opening = (f"{self._format_time(request['time'])} is taken, {name}, but "
+                           f"{restaurant['name']} has a table")
+            return (f"{opening} for {request['party_size']} on {when} at {slot_time}. "
+                    f"I'm holding it for you. Shall I confirm the booking?")
+        
+        reply = f"Sorry {name}, {restaurant['name']} is fully booked on {when} from {self._format_time(request['time'])}."
+        if result.get("alternate_dates"):
+            options = ", ".join(
+                f"{datetime.fromisoformat(alt['date']).strftime('%A')} (from {self._format_time(alt['first_slot'])})"
+                for alt in result["alternate_dates"]
+            )
+            reply += f" It has openings on {options}."
+        return reply + " I can also add you to the waitlist. What would you like to do?"
+    
+    def _fast_path_confirmation_reply(self, result: Dict) -> str:
+        """Phrase a confirm_and_create_reservation result."""
+        if result.get("success"):
+            reservation = result["reservation"]
+            return (f"You're all set! Reservation {reservation['reservation_id']} is confirmed for "
+                    f"{reservation['party_size']} on {reservation['date']} at {self._format_time(reservation['time_slot'])}. "
+                    f"Would you like to make another reservation?")
+        if result.get("message") == "Booking cancelled by user":
+            return "No problem, I've released that table. Is there anything else I can help you with?"
+        return f"Sorry, I couldn't complete the booking: {result.get('message') or result.get('error')}."
+    
+    def _summarize_context(self) -> str:
+        """What the conversation has established so far, for the history summary."""
+        context = self.user_context
+        lines = []
+        if context.get("phone_number"):
+            if context.get("authenticated"):
+                status = "authenticated"
+            elif context.get("is_new_user"):
+                status = "new customer, not registered yet"
+            else:
+                status = "not authenticated yet"
+            lines.append(f"Customer: {context.get('name') or 'name not given'}, "
+                         f"phone {context['phone_number']} ({status})")
+        if context.get("selected_restaurant"):
+            restaurant = context["selected_restaurant"]
+            lines.append(f"Selected restaurant: {restaurant['name']} (id {restaurant['id']})")
+        if context.get("pending_booking"):
+            lines.append(f"Booking in progress: {json.dumps(context['pending_booking'])}")
+        if context.get("waitlist_id"):
+            lines.append(f"On the waitlist (entry {context['waitlist_id']})")
+        if context.get("last_reservation"):
+            reservation = context["last_reservation"]
+            lines.append(f"Last reservation: {reservation['reservation_id']} for {reservation['party_size']} "
+                         f"on {reservation['date']} at {reservation['time_slot']}")
+        return "\n".join(lines) or "No customer or booking details yet."
+    
+    @staticmethod
+    def _format_time(time_slot: str) -> str:
+        """'19:30' -> '7:30 PM'."""
+        return datetime.strptime(time_slot, "%H:%M").strftime("%I:%M %p").lstrip("0")
+    
     def send_message(self, user_message: str) -> str:
         """Send message with intelligent handling."""
+        return "".join(self.send_message_stream(user_message))
+    
+    def send_message_stream(self, user_message: str) -> Iterator[str]:
+        """Send message and yield the reply in text chunks as Gemini streams them.
+        
+        Function calls are run between streamed rounds and never reach the
+        caller; local replies (fast path, cache) arrive as a single chunk.
+        """
         if not self.chat:
-            return self.start_chat()
+            yield self.start_chat()
+            return
         
+        steps = self._turn_steps(user_message)
+        stream = None
+        result, error = None, None
+        while True:
+            try:
+                op, argument = steps.throw(error) if error else steps.send(result)
+            except StopIteration:
+                return
+            result, error = None, None
+            if op == "text":
+                yield argument
+                continue
+            try:
+                if op == "call":
+                    function, *args = argument
+                    result = function(*args)
+                elif op == "model":
+                    turn, message = argument
+                    stream = turn.stream_model(self.chat.send_message, message, stream=True)
+                elif op == "chunk":
+                    result = next(stream, None)
+                elif op == "tools":
+                    result = run_function_calls(*argument, self.PARALLEL_SAFE_FUNCTIONS, self.TOOL_RESPONSE_SHAPES)
+            except Exception as e:
+                error = e
+    
+    def _turn_steps(self, user_message: str) -> Generator[Tuple[str, Any], Any, None]:
+        """The logic of one turn, as I/O steps for a driver to carry out.
+        
+        Yields (op, argument) and is sent each op's result (or thrown its
+        exception):
+        - "text": a reply chunk for the caller
+        - "call": (function, *args), blocking work such as the fast path
+        - "model": (turn, message), start a streamed Gemini round
+        - "chunk": the round's next chunk, or None when it is done
+        - "tools": (parts, execute), the message answering the round's
+          function calls, or None when there are none
+        send_message_stream runs the steps blocking and AsyncHybridAgentV3
+        awaits them, so both share this turn logic.
+        """
+        turn = self.metrics.start_turn()
         try:
-            response = self.chat.send_message(user_message)
+            reply = yield "call", (self._try_fast_path, user_message,
+                                   turn.track(self._execute_function, count_time=True))
+            path = "fast_path"
+            if reply is None:
+                # Another session may already have asked the same thing
+                reply = self.conversation_cache.lookup(user_message)
+                path = "cache"
+            if reply is not None:
+                record_exchange(self.chat, user_message, reply)
+                self.metrics.finish_turn(turn, path)
+                yield "text", reply
+                return
+            
+            # Keep the prompt size flat: old turns become a summary of user_context
+            self.history.compact(self.chat)
+            
+            execute = turn.track(self.conversation_cache.track(self._execute_function))
+            reply_chunks = []
+            message = user_message
             
             # Handle function calls
             max_iterations = 10
-            iteration = 0
-            
-            while iteration < max_iterations:
-                iteration += 1
+            for _ in range(max_iterations):
+                function_call_parts = []
+                separator = "\n\n" if reply_chunks else ""
+                yield "model", (turn, message)
+                while True:
+                    chunk = yield "chunk", None
+                    if chunk is None:
+                        break
+                    if not chunk.candidates:
+                        continue
+                    for part in chunk.candidates[0].content.parts:
+                        if hasattr(part, 'function_call') and part.function_call:
+                            function_call_parts.append(part)
+                        elif part.text:
+                            # Text from an earlier round ("Let me check...") gets its own paragraph
+                            text, separator = separator + part.text, ""
+                            reply_chunks.append(text)
+                            yield "text", text
                 
-                if not response.candidates or not response.candidates[0].content.parts:
-                    break
-                
-                part = response.candidates[0].content.parts[0]
-                
-                if hasattr(part, 'function_call') and part.function_call:
-                    function_call = part.function_call
-                    function_name = function_call.name
-                    function_args = dict(function_call.args)
-                    
-                    # Execute function
-                    function_response = self._execute_function(function_name, function_args)
-                    
-                    # Send back to model
-                    response = self.chat.send_message(
-                        genai.protos.Content(
-                            parts=[genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=function_name,
-                                    response={"result": function_response}
-                                )
-                            )]
-                        )
-                    )
-                else:
+                # Run every function call in the turn and answer them in one message
+                with turn.timing_tools():
+                    message = yield "tools", (function_call_parts, execute)
+                if message is None:
+                    # Regular text response
                     break
+            else:
+                raise RuntimeError(f"still calling functions after {max_iterations} rounds")
             
-            return response.text
+            self.conversation_cache.store("".join(reply_chunks))
+            self.metrics.finish_turn(turn)
             
         except Exception as e:
-            return f"I apologize, I encountered an error: {str(e)}. Could you please try again?"
+            self.metrics.finish_turn(turn, "error")
+            yield "text", f"I apologize, I encountered an error: {str(e)}. Could you please try again?"
     
     def get_user_context(self):
         """Get current context."""
@@ -605,6 +942,7 @@ Be smart: If they give you everything at once, process it all. If they give piec
     
     def reset_conversation(self):
         """Reset for new conversation."""
+        self._release_pending_hold()
         self.chat = None
         self.user_context = {
             "authenticated": False,
@@ -0,0 +1,220 @@
+"""Per-turn accounting of model round trips, tokens, tool calls and latency."""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+
+# How many finished turns each session keeps
+SESSION_TURN_LIMIT = 200
+
+
+class TurnMetrics:
+    """Measurements for one user message, from send_message entry to reply."""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.path = "llm"  # or "fast_path", "cache", "error"
+        self.round_trips = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.model_seconds = 0.0
+        self.tool_seconds = 0.0
+        self.total_seconds = 0.0
+        self.tools = []  # {"name", "seconds"} per call, in completion order
+        self._lock = threading.Lock()
+    
+    def _add_usage(self, response):
+        """Token counts from a response's usage_metadata, when the SDK provides them."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            self.prompt_tokens += usage.prompt_token_count or 0
+            self.response_tokens += usage.candidates_token_count or 0
+    
+    def call_model(self, send: Callable, *args, **kwargs):
+        """send(*args, **kwargs), counted as one round trip and timed as model time."""
+        started = time.perf_counter()
+        try:
+            response = send(*args, **kwargs)
+        finally:
+            self.round_trips += 1
+            self.model_seconds += time.perf_counter() - started
+        self._add_usage(response)
+        return response
+    
+    def stream_model(self, send: Callable, *args, **kwargs) -> Iterator:
+        """Like call_model for stream=True: yields the chunks, timing only the waits for them.
+        
+        Streamed chunks each carry the usage so far, so the last one counts.
+        """
+        started = time.perf_counter()
+        try:
+            chunks = iter(send(*args, **kwargs))
+        finally:
+            self.round_trips += 1
+            self.model_seconds += time.perf_counter() - started
+        
+        last = None
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            self.model_seconds += time.perf_counter() - started
+            if chunk is None:
+                break
+            last = chunk
+            yield chunk
+        if last is not None:
+            self._add_usage(last)
+    
+    async def stream_model_async(self, send: Callable[..., Awaitable], *args, **kwargs) -> AsyncIterator:
+        """stream_model for an async send, such as ChatSession.send_message_async."""
+        started = time.perf_counter()
+        try:
+            chunks = (await send(*args, **kwargs)).__aiter__()
+        finally:
+            self.round_trips += 1
+            self.model_seconds += time.perf_counter() - started
+        
+        last = None
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                self.model_seconds += time.perf_counter() - started
+            last = chunk
+            yield chunk
+        if last is not None:
+            self._add_usage(last)
+    
+    def track(self, execute: Callable[[str, Dict], Any], count_time: bool = False) -> Callable[[str, Dict], Any]:
+        """Wrap an agent's _execute_function to time each tool call (calls may run in parallel).
+        
+        count_time also adds each call to tool_seconds, for calls made one
+        at a time outside timing_tools() (the fast path).
+        """
+        def timed(function_name: str, function_args: Dict) -> Any:
+            started = time.perf_counter()
+            try:
+                return execute(function_name, function_args)
+            finally:
+                seconds = time.perf_counter() - started
+                with self._lock:
+                    self.tools.append({"name": function_name, "seconds": seconds})
+                    if count_time:
+                        self.tool_seconds += seconds
+        return timed
+    
+    @contextmanager
+    def timing_tools(self):
+        """Wall-clock time of a batch of tool calls (less than their sum when they overlap)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tool_seconds += time.perf_counter() - started
+    
+    def to_dict(self) -> Dict:
+        return {
+            "path": self.path,
+            "round_trips": self.round_trips,
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "model_seconds": round(self.model_seconds, 4),
+            "tool_seconds": round(self.tool_seconds, 4),
+            "other_seconds": round(max(self.total_seconds - self.model_seconds - self.tool_seconds, 0.0), 4),
+            "total_seconds": round(self.total_seconds, 4),
+            "tools": [{"name": tool["name"], "seconds": round(tool["seconds"], 4)} for tool in self.tools]
+        }
+
+
+class MetricsTotals:
+    """Running totals over many turns, overall and per tool."""
+    
+    def __init__(self):
+        self.turns = 0
+        self.paths = {}  # path -> turns
+        self.round_trips = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.model_seconds = 0.0
+        self.tool_seconds = 0.0
+        self.total_seconds = 0.0
+        self.tools = {}  # name -> {"calls", "seconds"}
+    
+    def add(self, turn: TurnMetrics):
+        self.turns += 1
+        self.paths[turn.path] = self.paths.get(turn.path, 0) + 1
+        self.round_trips += turn.round_trips
+        self.prompt_tokens += turn.prompt_tokens
+        self.response_tokens += turn.response_tokens
+        self.model_seconds += turn.model_seconds
+        self.tool_seconds += turn.tool_seconds
+        self.total_seconds += turn.total_seconds
+        for tool in turn.tools:
+            totals = self.tools.setdefault(tool["name"], {"calls": 0, "seconds": 0.0})
+            totals["calls"] += 1
+            totals["seconds"] += tool["seconds"]
+    
+    def to_dict(self) -> Dict:
+        turns = self.turns or 1
+        return {
+            "turns": self.turns,
+            "paths": dict(self.paths),
+            "round_trips": self.round_trips,
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "model_seconds": round(self.model_seconds, 3),
+            "tool_seconds": round(self.tool_seconds, 3),
+            "total_seconds": round(self.total_seconds, 3),
+            "per_turn": {
+                "round_trips": round(self.round_trips / turns, 2),
+                "prompt_tokens": round(self.prompt_tokens / turns, 1),
+                "response_tokens": round(self.response_tokens / turns, 1),
+                "total_seconds": round(self.total_seconds / turns, 4)
+            },
+            "tools": {
+                name: {"calls": totals["calls"], "avg_seconds": round(totals["seconds"] / totals["calls"], 5)}
+                for name, totals in sorted(self.tools.items())
+            }
+        }
+
+
+_process_lock = threading.Lock()
+_process_totals = MetricsTotals()
+
+
+def process_metrics() -> Dict:
+    """Totals across every session in this process."""
+    with _process_lock:
+        return _process_totals.to_dict()
+
+
+class SessionMetrics:
+    """The turns of one agent session, plus their totals."""
+    
+    def __init__(self):
+        self.turns = []  # TurnMetrics.to_dict() per turn, oldest first
+        self.totals = MetricsTotals()
+    
+    def start_turn(self) -> TurnMetrics:
+        return TurnMetrics()
+    
+    def finish_turn(self, turn: TurnMetrics, path: Optional[str] = None):
+        """Record a finished turn here and in the process totals."""
+        if path:
+            turn.path = path
+        turn.total_seconds = time.perf_counter() - turn.started
+        self.turns.append(turn.to_dict())
+        del self.turns[:-SESSION_TURN_LIMIT]
+        self.totals.add(turn)
+        with _process_lock:
+            _process_totals.add(turn)
+    
+    @property
+    def last_turn(self) -> Dict:
+        return self.turns[-1] if self.turns else {}
+    
+    def summary(self) -> Dict:
+        return self.totals.to_dict()
@@ -0,0 +1,41 @@
+"""Shared Gemini model handles, built once per agent type and configuration."""
+import threading
+from functools import lru_cache
+from typing import List
+
+import google.generativeai as genai
+
+DEFAULT_MODEL_NAME = "gemini-1.5-flash"
+
+_configure_lock = threading.Lock()
+_configured_api_key = None
+
+
+def configure(api_key: str):
+    """Configure the (process-global) Gemini client, skipping repeat calls with the same key."""
+    global _configured_api_key
+    with _configure_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+
+
+@lru_cache(maxsize=None)
+def get_function_declarations(agent_class: type) -> List:
+    """The agent's FunctionDeclaration protos, built once per agent class."""
+    return agent_class._get_function_declarations()
+
+
+@lru_cache(maxsize=None)
+def get_model(agent_class: type, api_key: str, model_name: str = DEFAULT_MODEL_NAME) -> genai.GenerativeModel:
+    """A GenerativeModel with the agent's tools, shared by every session.
+    
+    The model holds no conversation state (each session gets its own chat
+    from start_chat), so one instance per agent class, key and model name
+    is safe to share.
+    """
+    configure(api_key)
+    return genai.GenerativeModel(
+        model_name=model_name,
+        tools=[get_function_declarations(agent_class)]
+    )
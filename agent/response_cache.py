@@ -0,0 +1,175 @@
+"""Process-wide caches for LLM replies and catalog lookups, shared by every session."""
+import copy
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+import google.generativeai as genai
+
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL_SECONDS = 15 * 60
+TOOL_CACHE_SIZE = 512
+TOOL_CACHE_TTL_SECONDS = 5 * 60
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional time-to-live and hit-rate counters."""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key, default=None):
+        """The cached value (marking it recently used), or default when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries beyond maxsize."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+    
+    def stats(self) -> Dict:
+        """Size, hit/miss/eviction/expiration counts and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+response_cache = LRUCache(RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+tool_cache = LRUCache(TOOL_CACHE_SIZE, ttl=TOOL_CACHE_TTL_SECONDS)
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Metrics for both caches, for the debug sidebar."""
+    return {"responses": response_cache.stats(), "tools": tool_cache.stats()}
+
+
+def normalize_message(text: str) -> str:
+    """Case, whitespace and trailing punctuation don't change what the user asked."""
+    return re.sub(r"\s+", " ", text.lower()).strip().rstrip("!.?")
+
+
+def catalog_key(database) -> Tuple:
+    """Identifies the restaurant catalog behind a database: its type, file and version."""
+    return type(database).__name__, getattr(database, "db_path", None), database.catalog_version
+
+
+def catalog_lookup(database, method: Callable, *args, **kwargs) -> Any:
+    """Call a catalog-only database method, through the TTL cache.
+    
+    Results are shared between sessions, so callers must not mutate them.
+    """
+    key = (method.__name__, catalog_key(database), json.dumps([args, kwargs], sort_keys=True, default=str))
+    result = tool_cache.get(key, _MISSING)
+    if result is _MISSING:
+        result = method(*args, **kwargs)
+        tool_cache.put(key, result)
+    return result
+
+
+def record_exchange(chat, user_message: str, reply: str):
+    """Append a turn answered locally to the chat history so the LLM keeps the context."""
+    chat.history = [
+        *chat.history,
+        genai.protos.Content(role="user", parts=[genai.protos.Part(text=user_message)]),
+        genai.protos.Content(role="model", parts=[genai.protos.Part(text=reply)])
+    ]
+
+
+class ConversationCache:
+    """One conversation's view of the shared reply cache.
+    
+    Replies are keyed by agent, catalog and the normalized user messages
+    of the conversation so far, so sessions that ask the same stateless
+    questions share answers. A turn that calls a tool outside
+    catalog_tools or changes the user context (phone, name, pending
+    booking) makes the rest of the conversation bypass the cache.
+    """
+    
+    def __init__(self, agent_name: str, database, catalog_tools: FrozenSet[str],
+                 user_context: Callable[[], Dict] = dict):
+        self.agent_name = agent_name
+        self.database = database
+        self.catalog_tools = catalog_tools
+        self._user_context = user_context
+        self._baseline = copy.deepcopy(user_context())
+        self._turns = ()  # normalized messages so far; None once the conversation has state
+        self._key = None  # key of the turn in progress
+        self._touched_state = False
+    
+    def lookup(self, user_message: str) -> Optional[str]:
+        """The cached reply to this message, or None; starts tracking the turn."""
+        if self._key is not None or self._user_context() != self._baseline:
+            # The last turn failed part-way, or state changed outside the tool loop
+            self._turns = None
+        self._key, self._touched_state = None, False
+        if self._turns is None:
+            return None
+        
+        turns = (*self._turns, normalize_message(user_message))
+        key = (self.agent_name, catalog_key(self.database), turns)
+        reply = response_cache.get(key)
+        if reply is None:
+            self._key = key
+        else:
+            self._turns = turns
+        return reply
+    
+    def track(self, execute: Callable[[str, Dict], Any]) -> Callable[[str, Dict], Any]:
+        """Wrap an agent's _execute_function to notice calls that may touch state."""
+        def tracked(function_name: str, function_args: Dict) -> Any:
+            if function_name not in self.catalog_tools:
+                self._touched_state = True
+            return execute(function_name, function_args)
+        return tracked
+    
+    def store(self, reply: str):
+        """Cache the reply if the turn stayed stateless; otherwise stop caching."""
+        if self._key is None:
+            return
+        if self._touched_state or not reply or self._user_context() != self._baseline:
+            self._turns = None
+        else:
+            response_cache.put(self._key, reply)
+            self._turns = self._key[2]
+        self._key = None
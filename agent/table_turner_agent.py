@@ -4,6 +4,12 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 import google.generativeai as genai
 
+from agent.metrics import SessionMetrics
+from agent.model_factory import get_model
+from agent.response_cache import ConversationCache, catalog_lookup, record_exchange
+from agent.tool_calls import ordered_context_write, run_function_calls
+from agent.tool_responses import RESTAURANT_FIELDS, ResponseShape
+
 class TableTurnerAgent:
     """Conversational AI agent for Table Turner reservation system."""
     
@@ -18,21 +24,35 @@ class TableTurnerAgent:
     STATE_SLOT_CONFIRMATION = "slot_confirmation"
     STATE_BOOKING_CONFIRMED = "booking_confirmed"
     
+    # Lookups: consecutive calls to these run concurrently, and their
+    # user_context writes go through ordered_context_write so they land in
+    # call order (see agent/tool_calls.py). Tools that change the database
+    # or replace the context are barriers.
+    PARALLEL_SAFE_FUNCTIONS = frozenset({
+        "get_current_date_time", "parse_date_from_text", "search_restaurants", "check_availability"
+    })
+    # Tools that only read the restaurant catalog; a conversation that calls
+    # nothing else can have its replies cached (see agent/response_cache.py)
+    CATALOG_TOOLS = frozenset({"search_restaurants"})
+    # Results trimmed before they go back to the model: projected columns,
+    # top-k pages with a cursor (see agent/tool_responses.py)
+    TOOL_RESPONSE_SHAPES = {
+        "search_restaurants": ResponseShape({"restaurants": RESTAURANT_FIELDS}, page="restaurants")
+    }
+    
     def __init__(self, api_key: str, database):
         """Initialize the agent."""
-        genai.configure(api_key=api_key)
-        
-        self.model = genai.GenerativeModel(
-            model_name='gemini-1.5-flash',
-            tools=[self._get_function_declarations()]
-        )
+        # Shared across sessions; built on first use for this API key
+        self.model = get_model(TableTurnerAgent, api_key)
         
         self.database = database
         self.chat = None
+        self.metrics = SessionMetrics()
         self.conversation_state = self.STATE_INIT
         self.user_context = {}
         
-    def _get_function_declarations(self):
+    @staticmethod
+    def _get_function_declarations():
         """Define function declarations for the agent."""
         return [
             genai.protos.FunctionDeclaration(
@@ -106,6 +126,10 @@ class TableTurnerAgent:
                         "location": genai.protos.Schema(
                             type=genai.protos.Type.STRING,
                             description="Location/area"
+                        ),
+                        "cursor": genai.protos.Schema(
+                            type=genai.protos.Type.INTEGER,
+                            description="Offset of the next page of results: the next_cursor of a previous search"
                         )
                     }
                 )
@@ -207,7 +231,8 @@ class TableTurnerAgent:
             
             elif function_name == "get_current_date_time":
                 current_dt = self.database.get_current_datetime()
-                self.user_context["current_datetime"] = current_dt.isoformat()
+                with ordered_context_write():
+                    self.user_context["current_datetime"] = current_dt.isoformat()
                 return {
                     "current_date": current_dt.strftime("%Y-%m-%d"),
                     "current_time": current_dt.strftime("%H:%M"),
@@ -226,15 +251,17 @@ class TableTurnerAgent:
             elif function_name == "search_restaurants":
                 # Search by name first
                 if "restaurant_name" in function_args:
-                    restaurant = self.database.get_restaurant_by_name(
-                        function_args["restaurant_name"]
+                    restaurant = catalog_lookup(
+                        self.database, self.database.get_restaurant_by_name, function_args["restaurant_name"]
                     )
                     if restaurant:
-                        self.user_context["selected_restaurant"] = restaurant
+                        with ordered_context_write():
+                            self.user_context["selected_restaurant"] = restaurant
                         return {"restaurants": [restaurant], "found_by": "name"}
                 
                 # Search by cuisine/location
-                results = self.database.search_restaurants(
+                results = catalog_lookup(
+                    self.database, self.database.search_restaurants,
                     cuisine=function_args.get("cuisine"),
                     location=function_args.get("location")
                 )
@@ -258,14 +285,15 @@ class TableTurnerAgent:
                     )
                     
                     if nearest_slot:
-                        self.user_context["available_slot"] = nearest_slot
-                        self.user_context["booking_details"] = {
-                            "restaurant_id": restaurant_id,
-                            "date": date,
-                            "time": nearest_slot["time"],
-                            "party_size": party_size,
-                            "table_size": nearest_slot["table_size"]
-                        }
+                        with ordered_context_write():
+                            self.user_context["available_slot"] = nearest_slot
+                            self.user_context["booking_details"] = {
+                                "restaurant_id": restaurant_id,
+                                "date": date,
+                                "time": nearest_slot["time"],
+                                "party_size": party_size,
+                                "table_size": nearest_slot["table_size"]
+                            }
                         return {
                             "available": True,
                             "slot": nearest_slot,
@@ -349,6 +377,9 @@ Be conversational, friendly, and follow this flow strictly."""
         self.chat = self.model.start_chat(history=[])
         self.conversation_state = self.STATE_INIT
         self.user_context = {}
+        self.conversation_cache = ConversationCache(
+            type(self).__name__, self.database, self.CATALOG_TOOLS, self.get_user_context
+        )
         
         # Initial greeting
         return "Hey! This is Table Turner from GoodFoods, at your service today. 🍽️\n\nBefore we proceed forward, can I please get your mobile number?"
@@ -358,8 +389,17 @@ Be conversational, friendly, and follow this flow strictly."""
         if not self.chat:
             return self.start_chat()
         
+        turn = self.metrics.start_turn()
         try:
-            response = self.chat.send_message(user_message)
+            # Another session may already have asked the same thing
+            cached_reply = self.conversation_cache.lookup(user_message)
+            if cached_reply is not None:
+                record_exchange(self.chat, user_message, cached_reply)
+                self.metrics.finish_turn(turn, "cache")
+                return cached_reply
+            
+            execute = turn.track(self.conversation_cache.track(self._execute_function))
+            response = turn.call_model(self.chat.send_message, user_message)
             
             # Handle function calls
             max_iterations = 5
@@ -371,37 +411,26 @@ Be conversational, friendly, and follow this flow strictly."""
                 if not response.candidates or not response.candidates[0].content.parts:
                     break
                 
-                part = response.candidates[0].content.parts[0]
-                
-                # Check if it's a function call
-                if hasattr(part, 'function_call') and part.function_call:
-                    function_call = part.function_call
-                    function_name = function_call.name
-                    function_args = dict(function_call.args)
-                    
-                    # Execute the function
-                    function_response = self._execute_function(function_name, function_args)
-                    
-                    # Send function response back to the model
-                    response = self.chat.send_message(
-                        genai.protos.Content(
-                            parts=[genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=function_name,
-                                    response={"result": function_response}
-                                )
-                            )]
-                        )
+                # Run every function call in the turn and answer them in one message
+                with turn.timing_tools():
+                    function_responses = run_function_calls(
+                        response.candidates[0].content.parts, execute, self.PARALLEL_SAFE_FUNCTIONS,
+                        self.TOOL_RESPONSE_SHAPES
                     )
-                else:
+                if function_responses is None:
                     # Regular text response
                     break
+                
+                response = turn.call_model(self.chat.send_message, function_responses)
             
             # Get the final text response
             final_response = response.text
+            self.conversation_cache.store(final_response)
+            self.metrics.finish_turn(turn)
             return final_response
             
         except Exception as e:
+            self.metrics.finish_turn(turn, "error")
             return f"I apologize, but I encountered an error: {str(e)}. Could you please try again?"
     
     def get_user_context(self):
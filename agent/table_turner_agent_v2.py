@@ -4,23 +4,43 @@ from datetime import datetime
 from typing import Any, Dict
 import google.generativeai as genai
 
+from agent.metrics import SessionMetrics
+from agent.model_factory import get_model
+from agent.response_cache import ConversationCache, catalog_lookup, record_exchange
+from agent.tool_calls import ordered_context_write, run_function_calls
+from agent.tool_responses import RESTAURANT_FIELDS, ResponseShape
+
 class TableTurnerAgentV2:
     """Enhanced AI agent using SQLite database for scalability."""
     
+    # Lookups: consecutive calls to these run concurrently, and their
+    # user_context writes go through ordered_context_write so they land in
+    # call order (see agent/tool_calls.py). Tools that change the database
+    # or replace the context are barriers.
+    PARALLEL_SAFE_FUNCTIONS = frozenset({
+        "get_current_date_time", "parse_date_from_text", "search_restaurants", "check_availability"
+    })
+    # Tools that only read the restaurant catalog; a conversation that calls
+    # nothing else can have its replies cached (see agent/response_cache.py)
+    CATALOG_TOOLS = frozenset({"search_restaurants"})
+    # Results trimmed before they go back to the model: projected columns,
+    # top-k pages with a cursor (see agent/tool_responses.py)
+    TOOL_RESPONSE_SHAPES = {
+        "search_restaurants": ResponseShape({"restaurants": RESTAURANT_FIELDS}, page="restaurants")
+    }
+    
     def __init__(self, api_key: str, database):
         """Initialize the agent with SQLite database."""
-        genai.configure(api_key=api_key)
-        
-        self.model = genai.GenerativeModel(
-            model_name='gemini-1.5-flash',
-            tools=[self._get_function_declarations()]
-        )
+        # Shared across sessions; built on first use for this API key
+        self.model = get_model(TableTurnerAgentV2, api_key)
         
         self.database = database
         self.chat = None
+        self.metrics = SessionMetrics()
         self.user_context = {}
         
-    def _get_function_declarations(self):
+    @staticmethod
+    def _get_function_declarations():
         """Define function declarations for the agent."""
         return [
             genai.protos.FunctionDeclaration(
@@ -94,6 +114,10 @@ class TableTurnerAgentV2:
                         "location": genai.protos.Schema(
                             type=genai.protos.Type.STRING,
                             description="Location/area in the city"
+                        ),
+                        "cursor": genai.protos.Schema(
+                            type=genai.protos.Type.INTEGER,
+                            description="Offset of the next page of results: the next_cursor of a previous search"
                         )
                     }
                 )
@@ -195,7 +219,8 @@ class TableTurnerAgentV2:
             
             elif function_name == "get_current_date_time":
                 current_dt = self.database.get_current_datetime()
-                self.user_context["current_datetime"] = current_dt.isoformat()
+                with ordered_context_write():
+                    self.user_context["current_datetime"] = current_dt.isoformat()
                 return {
                     "current_date": current_dt.strftime("%Y-%m-%d"),
                     "current_time": current_dt.strftime("%H:%M"),
@@ -210,21 +235,24 @@ class TableTurnerAgentV2:
                     current_dt
                 )
                 if parsed_date:
-                    self.user_context["parsed_date"] = parsed_date
+                    with ordered_context_write():
+                        self.user_context["parsed_date"] = parsed_date
                 return {"parsed_date": parsed_date, "success": parsed_date is not None}
             
             elif function_name == "search_restaurants":
                 # Search by name first
                 if "restaurant_name" in function_args and function_args["restaurant_name"]:
-                    restaurant = self.database.get_restaurant_by_name(
-                        function_args["restaurant_name"]
+                    restaurant = catalog_lookup(
+                        self.database, self.database.get_restaurant_by_name, function_args["restaurant_name"]
                     )
                     if restaurant:
-                        self.user_context["selected_restaurant"] = restaurant
+                        with ordered_context_write():
+                            self.user_context["selected_restaurant"] = restaurant
                         return {"restaurants": [restaurant], "found_by": "name", "total": 1}
                 
                 # Search by cuisine/location
-                results = self.database.search_restaurants(
+                results = catalog_lookup(
+                    self.database, self.database.search_restaurants,
                     cuisine=function_args.get("cuisine"),
                     location=function_args.get("location")
                 )
@@ -248,15 +276,16 @@ class TableTurnerAgentV2:
                     )
                     
                     if nearest_slot:
-                        self.user_context["available_slot"] = nearest_slot
-                        self.user_context["booking_details"] = {
-                            "restaurant_id": restaurant_id,
-                            "table_id": nearest_slot["table_id"],
-                            "date": date,
-                            "time_slot": nearest_slot["time"],
-                            "party_size": party_size,
-                            "table_capacity": nearest_slot["table_capacity"]
-                        }
+                        with ordered_context_write():
+                            self.user_context["available_slot"] = nearest_slot
+                            self.user_context["booking_details"] = {
+                                "restaurant_id": restaurant_id,
+                                "table_id": nearest_slot["table_id"],
+                                "date": date,
+                                "time_slot": nearest_slot["time"],
+                                "party_size": party_size,
+                                "table_capacity": nearest_slot["table_capacity"]
+                            }
                         is_exact_match = nearest_slot["time"] == requested_time
                         return {
                             "available": True,
@@ -366,6 +395,9 @@ CRITICAL RULES:
         
         self.chat = self.model.start_chat(history=[])
         self.user_context = {}
+        self.conversation_cache = ConversationCache(
+            type(self).__name__, self.database, self.CATALOG_TOOLS, self.get_user_context
+        )
         
         return "Hey! This is Table Turner from GoodFoods, at your service today. 🍽️\n\nBefore we proceed forward, can I please get your mobile number?"
     
@@ -374,8 +406,17 @@ CRITICAL RULES:
         if not self.chat:
             return self.start_chat()
         
+        turn = self.metrics.start_turn()
         try:
-            response = self.chat.send_message(user_message)
+            # Another session may already have asked the same thing
+            cached_reply = self.conversation_cache.lookup(user_message)
+            if cached_reply is not None:
+                record_exchange(self.chat, user_message, cached_reply)
+                self.metrics.finish_turn(turn, "cache")
+                return cached_reply
+            
+            execute = turn.track(self.conversation_cache.track(self._execute_function))
+            response = turn.call_model(self.chat.send_message, user_message)
             
             # Handle function calls (up to 10 iterations for complex flows)
             max_iterations = 10
@@ -387,33 +428,25 @@ CRITICAL RULES:
                 if not response.candidates or not response.candidates[0].content.parts:
                     break
                 
-                part = response.candidates[0].content.parts[0]
-                
-                if hasattr(part, 'function_call') and part.function_call:
-                    function_call = part.function_call
-                    function_name = function_call.name
-                    function_args = dict(function_call.args)
-                    
-                    # Execute function
-                    function_response = self._execute_function(function_name, function_args)
-                    
-                    # Send response back to model
-                    response = self.chat.send_message(
-                        genai.protos.Content(
-                            parts=[genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=function_name,
-                                    response={"result": function_response}
-                                )
-                            )]
-                        )
+                # Run every function call in the turn and answer them in one message
+                with turn.timing_tools():
+                    function_responses = run_function_calls(
+                        response.candidates[0].content.parts, execute, self.PARALLEL_SAFE_FUNCTIONS,
+                        self.TOOL_RESPONSE_SHAPES
                     )
-                else:
+                if function_responses is None:
+                    # Regular text response
                     break
+                
+                response = turn.call_model(self.chat.send_message, function_responses)
             
-            return response.text
+            final_response = response.text
+            self.conversation_cache.store(final_response)
+            self.metrics.finish_turn(turn)
+            return final_response
             
         except Exception as e:
+            self.metrics.finish_turn(turn, "error")
             return f"I apologize, but I encountered an error: {str(e)}. Could you please try again?"
     
     def get_user_context(self):
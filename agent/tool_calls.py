@@ -0,0 +1,182 @@
+"""Execution of every function call in a model response, concurrently where safe."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import google.generativeai as genai
+
+from agent.tool_responses import ResponseShape, shape_response
+
+# Shared by all sessions; tool calls are short database lookups
+TOOL_CALL_WORKERS = 8
+# Threads for the async agent's blocking work (fast path, every tool call).
+# This caps how many database calls all async conversations run at once;
+# more queue for a free thread. Conversations waiting on Gemini hold none.
+ASYNC_TOOL_CALL_WORKERS = 32
+
+_executor = ThreadPoolExecutor(max_workers=TOOL_CALL_WORKERS, thread_name_prefix="tool-call")
+# Separate, so async conversations neither queue behind the sync agents'
+# parallel batches nor are capped at their pool size
+_async_executor = ThreadPoolExecutor(max_workers=ASYNC_TOOL_CALL_WORKERS, thread_name_prefix="async-tool-call")
+
+# Completion events of the calls before the current one in its parallel batch
+_batch = threading.local()
+
+
+@contextmanager
+def ordered_context_write() -> Iterator[None]:
+    """Hold a tool's user_context writes until the calls before it in its batch finish.
+    
+    Parallel-safe tools wrap their writes in this: the lookups run
+    concurrently, but the writes land in the order the model emitted the
+    calls, so the last call wins as if the batch ran one call at a time.
+    Outside a parallel batch it does nothing.
+    """
+    for event in getattr(_batch, "earlier", ()):
+        event.wait()
+    yield
+
+
+def _batch_calls(execute: Callable[[str, Dict], Any], size: int) -> List[Callable[[str, Dict], Any]]:
+    """One wrapper of execute per batch position, recording which calls come before it.
+    
+    Calls are submitted in order to FIFO pools, so every earlier call has
+    started by the time a later one waits on it.
+    """
+    done = [threading.Event() for _ in range(size)]
+    
+    def at(position):
+        def run(function_name, function_args):
+            _batch.earlier = done[:position]
+            try:
+                return execute(function_name, function_args)
+            finally:
+                _batch.earlier = ()
+                done[position].set()
+        return run
+    
+    return [at(position) for position in range(size)]
+
+
+def get_function_calls(parts) -> List[Tuple[str, Dict]]:
+    """(name, args) for every function_call part, in the order the model emitted them."""
+    calls = []
+    for part in parts:
+        if hasattr(part, 'function_call') and part.function_call:
+            calls.append((part.function_call.name, dict(part.function_call.args)))
+    return calls
+
+
+def execute_function_calls(calls: List[Tuple[str, Dict]], execute: Callable[[str, Dict], Any],
+                           parallel_safe: FrozenSet[str]) -> List[Any]:
+    """Run the calls and return their results in call order.
+    
+    Consecutive calls named in parallel_safe (lookups whose user_context
+    writes, if any, go through ordered_context_write) run together on the
+    thread pool. Any other call is a barrier: it runs alone, after
+    everything before it and before everything after it, so its effects
+    land in the order the model emitted them and later calls see them.
+    """
+    results = [None] * len(calls)
+    batch = []
+    
+    def flush():
+        if len(batch) == 1:
+            index = batch[0]
+            results[index] = execute(*calls[index])
+        elif batch:
+            runners = _batch_calls(execute, len(batch))
+            futures = {index: _executor.submit(run, *calls[index]) for index, run in zip(batch, runners)}
+            for index, future in futures.items():
+                results[index] = future.result()
+        batch.clear()
+    
+    for index, (name, _) in enumerate(calls):
+        if name in parallel_safe:
+            batch.append(index)
+        else:
+            # Everything queued before the barrier must finish first
+            flush()
+            results[index] = execute(*calls[index])
+    flush()
+    
+    return results
+
+
+def run_function_calls(parts, execute: Callable[[str, Dict], Any], parallel_safe: FrozenSet[str],
+                       shapes: Optional[Dict[str, ResponseShape]] = None) -> Optional[genai.protos.Content]:
+    """Execute every function call in parts and build the reply with all their responses.
+    
+    Results of tools named in shapes are trimmed by their ResponseShape
+    before they are sent. Returns None when the parts hold no function
+    call (a plain text reply).
+    """
+    calls = get_function_calls(parts)
+    if not calls:
+        return None
+    
+    results = execute_function_calls(calls, execute, parallel_safe)
+    return _function_responses(calls, results, shapes)
+
+
+async def execute_function_calls_async(calls: List[Tuple[str, Dict]], execute: Callable[[str, Dict], Any],
+                                       parallel_safe: FrozenSet[str]) -> List[Any]:
+    """execute_function_calls for the event loop: the calls run on the async
+    thread pool and are awaited, with the same batches and barriers, so no
+    call blocks the loop.
+    """
+    loop = asyncio.get_running_loop()
+    results = [None] * len(calls)
+    batch = []
+    
+    async def flush():
+        if batch:
+            runners = _batch_calls(execute, len(batch))
+            batch_results = await asyncio.gather(*(
+                loop.run_in_executor(_async_executor, run, *calls[index]) for index, run in zip(batch, runners)
+            ))
+            for index, result in zip(batch, batch_results):
+                results[index] = result
+        batch.clear()
+    
+    for index, (name, _) in enumerate(calls):
+        if name in parallel_safe:
+            batch.append(index)
+        else:
+            await flush()
+            results[index] = await loop.run_in_executor(_async_executor, execute, *calls[index])
+    await flush()
+    
+    return results
+
+
+async def run_function_calls_async(parts, execute: Callable[[str, Dict], Any], parallel_safe: FrozenSet[str],
+                                   shapes: Optional[Dict[str, ResponseShape]] = None
+                                   ) -> Optional[genai.protos.Content]:
+    """run_function_calls without blocking the event loop."""
+    calls = get_function_calls(parts)
+    if not calls:
+        return None
+    
+    results = await execute_function_calls_async(calls, execute, parallel_safe)
+    return _function_responses(calls, results, shapes)
+
+
+async def run_blocking(function: Callable, *args) -> Any:
+    """Await function(*args) on the async thread pool (database work from async code)."""
+    return await asyncio.get_running_loop().run_in_executor(_async_executor, function, *args)
+
+
+def _function_responses(calls: List[Tuple[str, Dict]], results: List[Any],
+                        shapes: Optional[Dict[str, ResponseShape]]) -> genai.protos.Content:
+    """One message answering every call, each result trimmed by its shape."""
+    return genai.protos.Content(
+        parts=[genai.protos.Part(
+            function_response=genai.protos.FunctionResponse(
+                name=name,
+                response={"result": shape_response(shapes, name, result, args)}
+            )
+        ) for (name, args), result in zip(calls, results)]
+    )
@@ -0,0 +1,73 @@
+"""Per-tool shaping of function responses before they are sent back to the model.
+
+Everything in a function response becomes prompt tokens on the next round
+trip, so list-valued results are projected to the columns the model needs,
+cut to a page of top_k rows with a cursor for the next page, and encoded
+as one column header plus value rows instead of repeating keys per row.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+# Rows per page when a shape does not set top_k
+DEFAULT_TOP_K = 5
+
+# Columns the model needs to talk about and book a restaurant
+RESTAURANT_FIELDS = ("id", "name", "cuisine", "location", "rating", "price_range")
+
+
+def project(row: Dict, fields: Sequence[str]) -> Dict:
+    """The row with only the given fields (those it has)."""
+    return {field: row[field] for field in fields if field in row}
+
+
+def tabulate(rows: List[Dict], fields: Sequence[str]) -> Dict:
+    """{"columns": [...], "rows": [[...], ...]}: each key once instead of once per row."""
+    columns = [field for field in fields if any(field in row for row in rows)]
+    return {"columns": columns, "rows": [[row.get(field) for field in columns] for row in rows]}
+
+
+class ResponseShape:
+    """How one tool's result is trimmed for the model.
+    
+    fields maps a result key to the columns kept for it: a dict value is
+    projected, a list of rows is projected (and tabulated when tabular).
+    The list under page is cut to top_k rows from the call's "cursor"
+    argument, and the result gains total and next_cursor so the model can
+    ask for more.
+    """
+    
+    def __init__(self, fields: Dict[str, Sequence[str]], page: Optional[str] = None,
+                 top_k: int = DEFAULT_TOP_K, tabular: bool = True):
+        self.fields = fields
+        self.page = page
+        self.top_k = top_k
+        self.tabular = tabular
+    
+    def apply(self, result: Any, function_args: Dict) -> Any:
+        """The shaped copy of result (errors and other non-dict results pass through)."""
+        if not isinstance(result, dict):
+            return result
+        
+        shaped = dict(result)
+        for key, fields in self.fields.items():
+            value = result.get(key)
+            if isinstance(value, dict):
+                shaped[key] = project(value, fields)
+            elif isinstance(value, list):
+                rows = value
+                if key == self.page:
+                    cursor = max(int(function_args.get("cursor") or 0), 0)
+                    rows = value[cursor:cursor + self.top_k]
+                    shaped["total"] = len(value)
+                    shaped["next_cursor"] = cursor + self.top_k if cursor + self.top_k < len(value) else None
+                if self.tabular:
+                    shaped[key] = tabulate(rows, fields)
+                else:
+                    shaped[key] = [project(row, fields) for row in rows]
+        return shaped
+
+
+def shape_response(shapes: Optional[Dict[str, ResponseShape]], function_name: str,
+                   result: Any, function_args: Dict) -> Any:
+    """Apply the tool's shape from shapes, if it has one."""
+    shape = (shapes or {}).get(function_name)
+    return shape.apply(result, function_args) if shape else result
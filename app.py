@@ -7,7 +7,7 @@ import sys
 
 sys.path.append(os.path.dirname(__file__))
 
-from data.database import TableTurnerDB
+from app_resources import get_database
 from agent.hybrid_agent_v3 import HybridAgentV3
 
 load_dotenv()
@@ -200,14 +200,10 @@ st.markdown("""
 
 def initialize_session_state():
     """Initialize session state."""
-    if "database" not in st.session_state:
-        st.session_state.database = TableTurnerDB()
-        st.session_state.database.seed_data()
-    
     if "agent" not in st.session_state:
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            st.session_state.agent = HybridAgentV3(api_key, st.session_state.database)
+            st.session_state.agent = HybridAgentV3(api_key, get_database())
             if "messages" not in st.session_state:
                 st.session_state.messages = []
                 greeting = st.session_state.agent.start_chat()
@@ -305,7 +301,7 @@ def main():
         if st.button("Continue"):
             if api_key_input:
                 os.environ["GEMINI_API_KEY"] = api_key_input
-                st.session_state.agent = HybridAgentV3(api_key_input, st.session_state.database)
+                st.session_state.agent = HybridAgentV3(api_key_input, get_database())
                 greeting = st.session_state.agent.start_chat()
                 st.session_state.messages = [{"role": "assistant", "content": greeting}]
                 st.session_state.api_key_set = True
@@ -336,6 +332,9 @@ def main():
             </div>
             """, unsafe_allow_html=True)
     
+    # A reply being streamed is drawn here, below the conversation
+    live_reply = st.container()
+    
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Input area
@@ -376,9 +375,25 @@ def main():
     if send_button and user_input:
         st.session_state.messages.append({"role": "user", "content": user_input})
         
-        with st.spinner(""):
-            response = st.session_state.agent.send_message(user_input)
+        with live_reply:
+            st.markdown(f"""
+            <div class="chat-message user-message">
+                <div class="message-role" style="color: #1976D2;">You</div>
+                <div class="message-content">{user_input}</div>
+            </div>
+            """, unsafe_allow_html=True)
+            placeholder = st.empty()
+            response = ""
+            for chunk in st.session_state.agent.send_message_stream(user_input):
+                response += chunk
+                placeholder.markdown(f"""
+                <div class="chat-message assistant-message">
+                    <div class="message-role" style="color: #667eea;">Table Turner</div>
+                    <div class="message-content">{response}▌</div>
+                </div>
+                """, unsafe_allow_html=True)
         
+        # The rerun redraws the finished reply with its 🔊 button
         st.session_state.messages.append({"role": "assistant", "content": response})
         st.rerun()
     
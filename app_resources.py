@@ -0,0 +1,60 @@
+"""Process-wide resources shared by every Streamlit session.
+
+Streamlit reruns the app script for each browser session, so anything
+built in initialize_session_state() is rebuilt per session. The
+databases here are created once per process with st.cache_resource;
+session state should only hold conversation data (agent, messages).
+"""
+import os
+
+import streamlit as st
+
+from agent.metrics import SessionMetrics, process_metrics
+from data.database import TableTurnerDB
+from data.table_turner_db import TableTurnerDatabase
+
+DB_PATH = "table_turner.db"
+
+
+@st.cache_resource(show_spinner=False)
+def get_database(db_path: str = DB_PATH) -> TableTurnerDB:
+    """The SQLite database, initialized and seeded once; its connections are pooled."""
+    database = TableTurnerDB(db_path)
+    database.seed_data()
+    return database
+
+
+def reset_database(db_path: str = DB_PATH) -> TableTurnerDB:
+    """Delete the database file and re-seed it behind the same shared handle.
+    
+    The handle is reset in place rather than replaced, so every session's
+    agent keeps using it, and re-seeding bumps catalog_version past any
+    value a cache was keyed on before the reset. close() retires the
+    connections other sessions have borrowed, so none of them goes back
+    to the pool still pointing at the deleted file.
+    """
+    database = get_database(db_path)
+    database.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    database.init_database()
+    database.seed_data()
+    return database
+
+
+@st.cache_resource(show_spinner=False)
+def get_memory_store() -> TableTurnerDatabase:
+    """The in-memory store, shared so sessions see each other's bookings (it is thread-safe)."""
+    return TableTurnerDatabase()
+
+
+def show_turn_metrics(metrics: SessionMetrics):
+    """Debug expander with the last turn, this session's totals and the process totals."""
+    with st.expander("⏱️ Turn metrics"):
+        st.caption("Last turn")
+        st.json(metrics.last_turn)
+        st.caption("This session")
+        st.json(metrics.summary())
+        st.caption("All sessions in this process")
+        st.json(process_metrics())
@@ -8,7 +8,7 @@ from datetime import datetime
 # Add paths
 sys.path.append(os.path.dirname(__file__))
 
-from data.table_turner_db import TableTurnerDatabase
+from app_resources import get_memory_store, show_turn_metrics
 from agent.table_turner_agent import TableTurnerAgent
 
 # Load environment variables
@@ -92,13 +92,10 @@ st.markdown("""
 
 def initialize_session_state():
     """Initialize session state variables."""
-    if "database" not in st.session_state:
-        st.session_state.database = TableTurnerDatabase()
-    
     if "agent" not in st.session_state:
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            st.session_state.agent = TableTurnerAgent(api_key, st.session_state.database)
+            st.session_state.agent = TableTurnerAgent(api_key, get_memory_store())
             if "messages" not in st.session_state:
                 st.session_state.messages = []
                 # Add initial greeting
@@ -142,7 +139,7 @@ def main():
         if st.button("Set API Key"):
             if api_key_input:
                 os.environ["GEMINI_API_KEY"] = api_key_input
-                st.session_state.agent = TableTurnerAgent(api_key_input, st.session_state.database)
+                st.session_state.agent = TableTurnerAgent(api_key_input, get_memory_store())
                 greeting = st.session_state.agent.start_chat()
                 st.session_state.messages = [{"role": "assistant", "content": greeting}]
                 st.session_state.api_key_set = True
@@ -255,6 +252,7 @@ def main():
     if st.checkbox("Show Debug Info", value=False):
         user_context = st.session_state.agent.get_user_context()
         st.json(user_context)
+        show_turn_metrics(st.session_state.agent.metrics)
 
 if __name__ == "__main__":
     main()
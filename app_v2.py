@@ -6,7 +6,7 @@ import sys
 
 sys.path.append(os.path.dirname(__file__))
 
-from data.database import TableTurnerDB
+from app_resources import get_database, reset_database, show_turn_metrics
 from agent.table_turner_agent_v2 import TableTurnerAgentV2
 
 load_dotenv()
@@ -98,14 +98,10 @@ st.markdown("""
 
 def initialize_session_state():
     """Initialize session state."""
-    if "database" not in st.session_state:
-        st.session_state.database = TableTurnerDB()
-        st.session_state.database.seed_data()
-    
     if "agent" not in st.session_state:
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            st.session_state.agent = TableTurnerAgentV2(api_key, st.session_state.database)
+            st.session_state.agent = TableTurnerAgentV2(api_key, get_database())
             if "messages" not in st.session_state:
                 st.session_state.messages = []
                 greeting = st.session_state.agent.start_chat()
@@ -141,7 +137,7 @@ def main():
             if st.button("Set API Key"):
                 if api_key_input:
                     os.environ["GEMINI_API_KEY"] = api_key_input
-                    st.session_state.agent = TableTurnerAgentV2(api_key_input, st.session_state.database)
+                    st.session_state.agent = TableTurnerAgentV2(api_key_input, get_database())
                     greeting = st.session_state.agent.start_chat()
                     st.session_state.messages = [{"role": "assistant", "content": greeting}]
                     st.session_state.api_key_set = True
@@ -150,7 +146,7 @@ def main():
         return
     
     # Stats bar
-    stats = st.session_state.database.get_stats()
+    stats = get_database().get_stats()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.markdown(f"""<div class="stat-card">
@@ -260,11 +256,8 @@ def main():
             st.rerun()
         
         if st.button("🗑️ Clear All Data"):
-            # Reset database
-            if os.path.exists("table_turner.db"):
-                os.remove("table_turner.db")
-            st.session_state.database = TableTurnerDB()
-            st.session_state.database.seed_data()
+            # Reset the shared database
+            reset_database()
             st.session_state.messages = []
             greeting = st.session_state.agent.reset_conversation()
             st.session_state.messages.append({"role": "assistant", "content": greeting})
@@ -314,6 +307,7 @@ def main():
     if st.checkbox("🐛 Show Debug Info"):
         user_context = st.session_state.agent.get_user_context()
         st.json(user_context)
+        show_turn_metrics(st.session_state.agent.metrics)
 
 if __name__ == "__main__":
     main()
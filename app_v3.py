@@ -6,8 +6,9 @@ import sys
 
 sys.path.append(os.path.dirname(__file__))
 
-from data.database import TableTurnerDB
+from app_resources import get_database, reset_database, show_turn_metrics
 from agent.hybrid_agent_v3 import HybridAgentV3
+from agent.response_cache import cache_stats
 
 load_dotenv()
 
@@ -134,14 +135,10 @@ st.markdown("""
 
 def initialize_session_state():
     """Initialize session state."""
-    if "database" not in st.session_state:
-        st.session_state.database = TableTurnerDB()
-        st.session_state.database.seed_data()
-    
     if "agent" not in st.session_state:
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            st.session_state.agent = HybridAgentV3(api_key, st.session_state.database)
+            st.session_state.agent = HybridAgentV3(api_key, get_database())
             if "messages" not in st.session_state:
                 st.session_state.messages = []
                 greeting = st.session_state.agent.start_chat()
@@ -192,7 +189,7 @@ def main():
             if st.button("Set Key", use_container_width=True):
                 if api_key_input:
                     os.environ["GEMINI_API_KEY"] = api_key_input
-                    st.session_state.agent = HybridAgentV3(api_key_input, st.session_state.database)
+                    st.session_state.agent = HybridAgentV3(api_key_input, get_database())
                     greeting = st.session_state.agent.start_chat()
                     st.session_state.messages = [{"role": "assistant", "content": greeting}]
                     st.session_state.api_key_set = True
@@ -201,7 +198,7 @@ def main():
         return
     
     # Stats
-    stats = st.session_state.database.get_stats()
+    stats = get_database().get_stats()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -351,6 +348,11 @@ def main():
             with st.expander("Show details"):
                 st.json(user_ctx["pending_booking"])
         
+        show_turn_metrics(st.session_state.agent.metrics)
+        
+        with st.expander("⚡ Response cache"):
+            st.json(cache_stats())
+        
         st.divider()
         
         if st.button("🔄 New Conversation", use_container_width=True):
@@ -360,10 +362,7 @@ def main():
             st.rerun()
         
         if st.button("🗑️ Reset Database", use_container_width=True):
-            if os.path.exists("table_turner.db"):
-                os.remove("table_turner.db")
-            st.session_state.database = TableTurnerDB()
-            st.session_state.database.seed_data()
+            reset_database()
             st.success("Database reset!")
             st.rerun()
     
@@ -8,10 +8,19 @@ import sys
 sys.path.append(os.path.dirname(__file__))
 
 from data.database import TableTurnerDB
+from app_resources import get_database, show_turn_metrics
+from data.analytics import OccupancyAnalytics, np
 from agent.hybrid_agent_v3 import HybridAgentV3
+from agent.response_cache import cache_stats
 
 load_dotenv()
 
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_occupancy_summary(db_path: str, _database: TableTurnerDB):
+    """Occupancy dashboard data, recomputed at most once a minute."""
+    return OccupancyAnalytics(_database).load().dashboard_summary()
+
 st.set_page_config(
     page_title="Table Turner V3 - Voice Enabled",
     page_icon="🍽️",
@@ -144,14 +153,10 @@ st.markdown("""
 
 def initialize_session_state():
     """Initialize session state."""
-    if "database" not in st.session_state:
-        st.session_state.database = TableTurnerDB()
-        st.session_state.database.seed_data()
-    
     if "agent" not in st.session_state:
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            st.session_state.agent = HybridAgentV3(api_key, st.session_state.database)
+            st.session_state.agent = HybridAgentV3(api_key, get_database())
             if "messages" not in st.session_state:
                 st.session_state.messages = []
                 greeting = st.session_state.agent.start_chat()
@@ -320,7 +325,7 @@ def main():
             if st.button("Set Key", use_container_width=True):
                 if api_key_input:
                     os.environ["GEMINI_API_KEY"] = api_key_input
-                    st.session_state.agent = HybridAgentV3(api_key_input, st.session_state.database)
+                    st.session_state.agent = HybridAgentV3(api_key_input, get_database())
                     greeting = st.session_state.agent.start_chat()
                     st.session_state.messages = [{"role": "assistant", "content": greeting}]
                     st.session_state.api_key_set = True
@@ -329,7 +334,7 @@ def main():
         return
     
     # Stats
-    stats = st.session_state.database.get_stats()
+    stats = get_database().get_stats()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -380,6 +385,9 @@ def main():
             </div>
             """, unsafe_allow_html=True)
     
+    # A reply being streamed is drawn here, below the conversation
+    live_reply = st.container()
+    
     # Voice input container
     components.html("""
     <div id="voice-input-container" style="display: none; margin: 20px 0;">
@@ -440,9 +448,23 @@ def main():
     if send_button and user_input:
         st.session_state.messages.append({"role": "user", "content": user_input})
         
-        with st.spinner("🤔 Processing..."):
-            response = st.session_state.agent.send_message(user_input)
-        
+        with live_reply:
+            st.markdown(f"""
+            <div class="chat-message user-message">
+                <strong>👤 You:</strong> {user_input}
+            </div>
+            """, unsafe_allow_html=True)
+            placeholder = st.empty()
+            response = ""
+            for chunk in st.session_state.agent.send_message_stream(user_input):
+                response += chunk
+                placeholder.markdown(f"""
+                <div class="chat-message assistant-message">
+                    <strong>🤖 Table Turner:</strong> {response}▌
+                </div>
+                """, unsafe_allow_html=True)
+        
+        # The rerun redraws the finished reply with its 🔊 button
         st.session_state.messages.append({"role": "assistant", "content": response})
         st.rerun()
     
@@ -489,6 +511,25 @@ def main():
         st.header("📊 System Stats")
         st.json(stats)
         
+        with st.expander("⚡ Response cache"):
+            st.json(cache_stats())
+        
+        with st.expander("📈 Occupancy"):
+            if np is None:
+                st.caption("Install numpy to see occupancy analytics.")
+            else:
+                database = get_database()
+                occupancy = load_occupancy_summary(database.db_path, database)
+                if occupancy["dates"]:
+                    st.caption(f"{occupancy['dates'][0]} → {occupancy['dates'][1]}")
+                st.metric("Table utilization", f"{occupancy['overall_utilization']:.1%}")
+                st.metric("Est. turned away", occupancy["turned_away_total"])
+                st.bar_chart(occupancy["slot_utilization"])
+                st.dataframe(
+                    {cuisine: f"{row['utilization']:.1%}" for cuisine, row in occupancy["cuisines"].items()},
+                    use_container_width=True
+                )
+        
         st.divider()
         
         user_ctx = st.session_state.agent.get_user_context()
@@ -496,6 +537,8 @@ def main():
             st.success(f"✅ {user_ctx.get('name')}")
             st.info(f"📱 {user_ctx.get('phone_number')}")
         
+        show_turn_metrics(st.session_state.agent.metrics)
+        
         st.divider()
         
         if st.button("🔄 New Chat", use_container_width=True):
@@ -0,0 +1,132 @@
+"""Benchmark concurrent conversations: HybridAgentV3 on threads vs AsyncHybridAgentV3 on one event loop.
+
+Gemini is replaced by SimulatedChat, which waits MODEL_SECONDS per round
+and answers like the model would: a search_restaurants call, then text.
+Tool calls hit a real TableTurnerDB, so the database path is measured.
+"""
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.async_hybrid_agent import AsyncHybridAgentV3
+from agent.hybrid_agent_v3 import HybridAgentV3
+from agent.tool_calls import ASYNC_TOOL_CALL_WORKERS
+from data.database import TableTurnerDB
+
+# Latency of one streamed Gemini round trip
+MODEL_SECONDS = 0.5
+# Worker threads a synchronous server would give its sessions
+SERVER_THREADS = 32
+
+CUISINES = ["Italian", "Indian", "Chinese", "Japanese", "Mexican"]
+REPLY = "Here are a few places you might like."
+
+_guests = itertools.count()
+
+
+def _chunk(part) -> SimpleNamespace:
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class SimulatedChat:
+    """A ChatSession stand-in: a search call on the first round, text after its response."""
+    
+    def __init__(self):
+        self.history = []
+    
+    def _reply(self, message):
+        if isinstance(message, str):
+            call = SimpleNamespace(name="search_restaurants", args={"cuisine": message.split()[2]})
+            return _chunk(SimpleNamespace(function_call=call, text=None))
+        return _chunk(SimpleNamespace(function_call=None, text=REPLY))
+    
+    def send_message(self, message, stream=False):
+        time.sleep(MODEL_SECONDS)
+        return [self._reply(message)]
+    
+    async def send_message_async(self, message, stream=False):
+        await asyncio.sleep(MODEL_SECONDS)
+        
+        async def chunks():
+            yield self._reply(message)
+        return chunks()
+
+
+def make_agent(agent_class, database):
+    agent = agent_class("benchmark", database)
+    agent.start_chat()
+    agent.chat = SimulatedChat()
+    return agent
+
+
+def message_for(index: int) -> str:
+    # Distinct per conversation, across runs too, so the shared reply cache never answers
+    return f"Show me {CUISINES[index % len(CUISINES)]} restaurants for guest {next(_guests)}"
+
+
+def check_turn(agent, reply: str):
+    """The turn went through the model and the search tool."""
+    tools = [tool["name"] for tool in agent.metrics.last_turn.get("tools", [])]
+    if reply != REPLY or tools != ["search_restaurants"]:
+        raise RuntimeError(f"unexpected turn: {reply!r}, tools {tools}")
+
+
+def percentile(latencies: list, q: float) -> float:
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+def run_threaded(database, conversations: int) -> dict:
+    agents = [make_agent(HybridAgentV3, database) for i in range(conversations)]
+    latencies = []  # from the moment every user sent a message; includes waiting for a thread
+    
+    def turn(i):
+        check_turn(agents[i], agents[i].send_message(message_for(i)))
+        latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SERVER_THREADS) as pool:
+        list(pool.map(turn, range(conversations)))
+    return {"seconds": time.perf_counter() - started, "latencies": latencies, "threads": SERVER_THREADS}
+
+
+async def run_async(database, conversations: int) -> dict:
+    agents = [make_agent(AsyncHybridAgentV3, database) for i in range(conversations)]
+    latencies = []
+    
+    async def turn(i):
+        check_turn(agents[i], await agents[i].send_message_async(message_for(i)))
+        latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(turn(i) for i in range(conversations)))
+    # The event loop plus the async pool that runs database work
+    return {"seconds": time.perf_counter() - started, "latencies": latencies, "threads": 1 + ASYNC_TOOL_CALL_WORKERS}
+
+
+def run(conversation_counts=(10, 50, 200, 500)):
+    database = TableTurnerDB(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    database.seed_data()
+    
+    print(f"Each turn: 2 simulated model rounds of {MODEL_SECONDS * 1000:.0f} ms and one search_restaurants call\n")
+    print(f"{'conversations':>13} {'mode':>8} {'threads':>8} {'turns/s':>9} {'p50 s':>7} {'p99 s':>7}")
+    for conversations in conversation_counts:
+        results = {
+            "threads": run_threaded(database, conversations),
+            "asyncio": asyncio.run(run_async(database, conversations)),
+        }
+        for mode, result in results.items():
+            print(f"{conversations:>13} {mode:>8} {result['threads']:>8} "
+                  f"{conversations / result['seconds']:>9.1f} {percentile(result['latencies'], 0.5):>7.2f} "
+                  f"{percentile(result['latencies'], 0.99):>7.2f}")
+
+
+if __name__ == "__main__":
+    run()
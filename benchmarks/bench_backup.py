@@ -0,0 +1,93 @@
+"""Benchmark online backup duration and its impact on concurrent bookings."""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.backup import ReplicaShipper, backup_database
+from data.database import TableTurnerDB, _to_epoch_day
+
+
+def populate(db: TableTurnerDB, rows: int):
+    """Bulk-load past reservations so the file has realistic size."""
+    with db.get_connection() as conn:
+        conn.execute("INSERT OR IGNORE INTO users (phone_number, name) VALUES ('9000000000', 'Bench')")
+        start = _to_epoch_day(datetime.now().strftime("%Y-%m-%d")) - (rows // 10 + 1)
+        conn.executemany("""
+            INSERT INTO reservations
+            (reservation_id, restaurant_id, table_id, phone_number, customer_name,
+             day, start_slot, end_slot, duration_minutes, party_size, status)
+            VALUES (?, ?, ?, '9000000000', 'Bench', ?, 38, 41, 90, 2, 'confirmed')
+        """, (
+            (f"HIST{i}", i % 10 + 1, (i % 10) * 9 + 1, start + i // 10)
+            for i in range(rows)
+        ))
+
+
+def booking_latencies(db: TableTurnerDB, stop: threading.Event) -> list:
+    """Book and cancel the same table in a loop, recording each booking's latency."""
+    date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        reservation, message = db.create_reservation(1, 1, "9000000000", "Bench", date, "19:00", 2)
+        latencies.append(time.perf_counter() - started)
+        if not reservation:
+            raise RuntimeError(message)
+        db.cancel_reservation(reservation["reservation_id"])
+    return latencies
+
+
+def summarize(latencies: list) -> str:
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return f"n={len(latencies)} p50={pick(0.5):.2f}ms p99={pick(0.99):.2f}ms max={latencies[-1] * 1000:.2f}ms"
+
+
+def run(rows: int = 200_000):
+    workdir = tempfile.mkdtemp()
+    db = TableTurnerDB(os.path.join(workdir, "primary.db"))
+    db.seed_data()
+    populate(db, rows)
+    print(f"📦 Primary: {rows:,} reservations, {os.path.getsize(db.db_path) / 1e6:.1f} MB")
+    
+    # Baseline booking latency
+    stop = threading.Event()
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(base=booking_latencies(db, stop)))
+    worker.start()
+    time.sleep(2)
+    stop.set()
+    worker.join()
+    print(f"⏱️  Bookings, idle:          {summarize(result['base'])}")
+    
+    # Booking latency while a backup runs
+    stop = threading.Event()
+    worker = threading.Thread(target=lambda: result.update(during=booking_latencies(db, stop)))
+    worker.start()
+    stats = backup_database(db.db_path, os.path.join(workdir, "backup.db"))
+    stop.set()
+    worker.join()
+    print(f"⏱️  Bookings, during backup: {summarize(result['during'])}")
+    print(f"💾 Backup: {stats['duration_seconds']:.2f}s, {stats['steps']} steps, {stats['bytes'] / 1e6:.1f} MB")
+    
+    # Incremental shipping
+    shipper = ReplicaShipper(db, os.path.join(workdir, "replica.db"))
+    shipper.initialize()
+    stop = threading.Event()
+    worker = threading.Thread(target=lambda: booking_latencies(db, stop))
+    worker.start()
+    time.sleep(1)
+    stop.set()
+    worker.join()
+    shipped = shipper.ship()
+    print(f"🚚 Shipped {shipped['events_shipped']} events in {shipped['duration_seconds'] * 1000:.1f}ms "
+          f"(replica at seq {shipped['replica_seq']}, primary at seq {db.get_latest_event_seq()})")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
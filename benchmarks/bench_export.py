@@ -0,0 +1,36 @@
+"""Benchmark columnar export of a large reservations table."""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_backup import populate
+from data.database import TableTurnerDB
+from data.export import ColumnarExporter
+
+
+def run(rows: int = 1_000_000):
+    workdir = tempfile.mkdtemp()
+    db = TableTurnerDB(os.path.join(workdir, "primary.db"))
+    db.seed_data()
+    populate(db, rows)
+    print(f"📦 {rows:,} reservations")
+    
+    for file_format in ("parquet", "npz"):
+        exporter = ColumnarExporter(db, os.path.join(workdir, file_format), file_format=file_format)
+        stats = exporter.export()
+        print(f"📤 Full export ({file_format}): {stats['rows']} in {stats['duration_seconds']:.2f}s")
+    
+    # Incremental run picks up only what changed since the last export
+    date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    db.create_user("9111111111", "Incremental")
+    for table_id in range(1, 10):
+        db.create_reservation(1, table_id, "9111111111", "Incremental", date, "19:00", 2)
+    stats = exporter.export()
+    print(f"📤 Incremental export (npz): {stats['rows']} in {stats['duration_seconds'] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,52 @@
+"""Benchmark proximity queries on GeoIndex as the catalog grows."""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.geo import GeoIndex, haversine_km
+
+# Rough Bangalore bounding box
+LAT_RANGE = (12.80, 13.10)
+LNG_RANGE = (77.45, 77.80)
+
+
+def synthetic_catalog(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [{
+        "id": i,
+        "latitude": rng.uniform(*LAT_RANGE),
+        "longitude": rng.uniform(*LNG_RANGE),
+        "rating": round(rng.uniform(3.5, 5.0), 1)
+    } for i in range(size)]
+
+
+def timed(operation, points) -> float:
+    """Mean latency of operation(lat, lng) in microseconds."""
+    started = time.perf_counter()
+    for latitude, longitude in points:
+        operation(latitude, longitude)
+    return (time.perf_counter() - started) / len(points) * 1e6
+
+
+def run(sizes=(100, 1_000, 10_000, 50_000), queries: int = 500):
+    rng = random.Random(1)
+    points = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(queries)]
+    top_rated = lambda r: r["rating"] >= 4.5
+    
+    print(f"{'restaurants':>11} {'knn µs':>8} {'knn+filter µs':>14} {'1km µs':>8} {'scan µs':>9}")
+    for size in sizes:
+        catalog = synthetic_catalog(size)
+        index = GeoIndex(catalog)
+        knn = timed(lambda lat, lng: index.nearest(lat, lng, 5), points)
+        filtered = timed(lambda lat, lng: index.nearest(lat, lng, 5, top_rated), points)
+        radius = timed(lambda lat, lng: index.within(lat, lng, 1.0), points)
+        scan = timed(lambda lat, lng: sorted(
+            catalog, key=lambda r: haversine_km(lat, lng, r["latitude"], r["longitude"]))[:5], points[:20])
+        print(f"{size:>11,} {knn:>8.1f} {filtered:>14.1f} {radius:>8.1f} {scan:>9.1f}")
+
+
+if __name__ == "__main__":
+    run(tuple(int(n) for n in sys.argv[1:]) or (100, 1_000, 10_000, 50_000))
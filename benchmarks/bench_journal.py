@@ -0,0 +1,100 @@
+"""Benchmark journaled TableTurnerDatabase writes and recovery time."""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.table_turner_db import TableTurnerDatabase
+
+
+def reservation(db: TableTurnerDatabase, i: int) -> dict:
+    """A synthetic past reservation, spread over users, restaurants and slots."""
+    start = datetime(2024, 1, 1)
+    return {
+        "reservation_id": f"TT{db.reservation_ids.next()}",
+        "restaurant_id": i % 10 + 1,
+        "phone_number": f"9{i % 10_000:09d}",
+        "customer_name": "Bench",
+        "date": (start + timedelta(days=i // 300)).strftime("%Y-%m-%d"),
+        "time": db.time_slots[i % len(db.time_slots)],
+        "party_size": 2,
+        "table_size": (2, 4, 6)[(i // 25) % 3],
+        "status": "confirmed",
+        "created_at": start.isoformat()
+    }
+
+
+def write_operations(db: TableTurnerDatabase, count: int):
+    """Journal `count` operations: users first, then bookings with 1 in 10 cancelled."""
+    users = min(10_000, count // 10)
+    for i in range(users):
+        db._commit("user_created", {"phone_number": f"9{i:09d}", "name": "Bench",
+                                    "created_at": datetime(2024, 1, 1).isoformat(),
+                                    "total_reservations": 0})
+    i = 0
+    while i < count - users:
+        booked = reservation(db, i)
+        db._commit("reservation_created", booked)
+        i += 1
+        if i % 10 == 0 and i < count - users:
+            db._commit("reservation_cancelled", {"reservation_id": booked["reservation_id"]})
+            i += 1
+
+
+def write_latency(fsync, operations: int) -> float:
+    """Mean µs per journaled booking; fsync=None is the plain in-memory store."""
+    directory = tempfile.mkdtemp()
+    try:
+        db = TableTurnerDatabase(directory if fsync else None, fsync=fsync or "interval")
+        started = time.perf_counter()
+        for i in range(operations):
+            db._commit("reservation_created", reservation(db, i))
+        elapsed = time.perf_counter() - started
+        db.close()
+        return elapsed / operations * 1e6
+    finally:
+        shutil.rmtree(directory)
+
+
+def recovery_seconds(directory: str) -> float:
+    started = time.perf_counter()
+    db = TableTurnerDatabase(directory)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return elapsed
+
+
+def run(operations: int = 1_000_000):
+    print(f"{'fsync':>10} {'write µs':>10}")
+    for fsync, count in ((None, 50_000), ("never", 50_000), ("interval", 50_000), ("always", 500)):
+        print(f"{fsync or 'memory':>10} {write_latency(fsync, count):>10.1f}")
+    
+    directory = tempfile.mkdtemp()
+    try:
+        db = TableTurnerDatabase(directory, fsync="never")
+        db.journal.snapshot_every = operations + 1
+        started = time.perf_counter()
+        write_operations(db, operations)
+        db.close()
+        print(f"\nwrote {operations:,} operations in {time.perf_counter() - started:.1f}s, "
+              f"journal {os.path.getsize(db.journal.journal_path) / 1e6:.0f} MB")
+        print(f"recovery from journal only:     {recovery_seconds(directory):.2f}s")
+        
+        db = TableTurnerDatabase(directory, fsync="never")
+        started = time.perf_counter()
+        db.journal.snapshot()
+        print(f"snapshot written in {time.perf_counter() - started:.2f}s, "
+              f"{os.path.getsize(db.journal.snapshot_path) / 1e6:.0f} MB")
+        write_operations(db, operations // 10)
+        db.close()
+        print(f"recovery from snapshot + {operations // 10:,} journaled: {recovery_seconds(directory):.2f}s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,59 @@
+"""Benchmark in-memory TableTurnerDatabase operations as reservations grow."""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.table_turner_db import TableTurnerDatabase
+
+
+def populate(db: TableTurnerDatabase, rows: int):
+    """Bulk-load past reservations spread over users, restaurants and slots."""
+    start = datetime.now() - timedelta(days=rows // 300 + 1)
+    for i in range(len(db.reservations), rows):
+        db._index_reservation({
+            "reservation_id": f"HIST{i}",
+            "restaurant_id": i % 10 + 1,
+            "phone_number": f"9{i % 10_000:09d}",
+            "customer_name": "Bench",
+            "date": (start + timedelta(days=i // 300)).strftime("%Y-%m-%d"),
+            "time": db.time_slots[i % len(db.time_slots)],
+            "party_size": 2,
+            "table_size": (2, 4, 6)[(i // 25) % 3],
+            "status": "confirmed",
+            "created_at": datetime.now().isoformat()
+        })
+
+
+def timed(operation, repeat: int = 2000) -> float:
+    """Mean latency of operation() in microseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def run(sizes=(10_000, 100_000, 1_000_000)):
+    db = TableTurnerDatabase()
+    db.create_user("9000000001", "Bench")
+    date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    def book_and_cancel():
+        reservation, message = db.create_reservation(1, "9000000001", "Bench", date, "19:00", 2, 2)
+        if not reservation:
+            raise RuntimeError(message)
+        db.cancel_reservation(reservation["reservation_id"])
+    
+    print(f"{'reservations':>12} {'slots µs':>10} {'book µs':>10} {'history µs':>11}")
+    for size in sizes:
+        populate(db, size)
+        slots = timed(lambda: db.get_available_slots(1, date, 2))
+        book = timed(book_and_cancel)
+        history = timed(lambda: db.get_user_reservations("9000000042"))
+        print(f"{len(db.reservations):>12,} {slots:>10.1f} {book:>10.1f} {history:>11.1f}")
+
+
+if __name__ == "__main__":
+    run(tuple(int(n) for n in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
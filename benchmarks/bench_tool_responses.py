@@ -0,0 +1,98 @@
+"""Benchmark the prompt size of tool responses, raw vs shaped by TOOL_RESPONSE_SHAPES.
+
+Runs the tool calls of the example conversations (test_agent.py) through
+each agent's _execute_function and compares the JSON the model would
+read back, before and after shaping. Tokens are estimated at ~4 chars each.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.gemini_agent import RestaurantAgent
+from agent.hybrid_agent_v3 import HybridAgentV3
+from agent.table_turner_agent_v2 import TableTurnerAgentV2
+from agent.tool_responses import shape_response
+from data.database import TableTurnerDB
+from data.restaurants import ReservationDatabase
+
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+# (conversation, tool, args) per agent
+SCENARIOS = {
+    "gemini": [
+        ("Italian in Koramangala", "search_restaurants", {"cuisine": "Italian", "location": "Koramangala"}),
+        ("anniversary", "recommend_restaurants", {"occasion": "anniversary"}),
+        ("vegetarian", "recommend_restaurants", {"dietary_restrictions": "vegetarian"}),
+        ("highest rated", "search_restaurants", {"min_rating": 4.5}),
+        ("highest rated, page 2", "search_restaurants", {"min_rating": 4.5, "cursor": 5}),
+        ("near Koramangala", "find_nearby_restaurants", {"location": "Koramangala"}),
+    ],
+    "table_turner_v2": [
+        ("Italian", "search_restaurants", {"cuisine": "Italian"}),
+        ("any suggestions", "search_restaurants", {}),
+    ],
+    "hybrid": [
+        ("Italian", "search_restaurants", {"cuisine": "Italian"}),
+        ("any suggestions", "search_restaurants", {}),
+        ("near Indiranagar", "find_nearby_restaurants", {"location": "Indiranagar"}),
+        ("Friday 7 PM for 4", "check_availability_and_book",
+         {"restaurant_id": 1, "date": TOMORROW, "time": "19:00", "party_size": 4}),
+    ],
+}
+
+
+def measure(agent, function_name: str, function_args: dict, repeat: int = 200) -> dict:
+    """Raw and shaped response size, and the time to shape and encode the response."""
+    result = agent._execute_function(function_name, function_args)
+    raw = json.dumps(result, default=str)
+    shaped = json.dumps(shape_response(agent.TOOL_RESPONSE_SHAPES, function_name, result, function_args),
+                        default=str)
+    
+    started = time.perf_counter()
+    for _ in range(repeat):
+        json.dumps(result, default=str)
+    raw_seconds = (time.perf_counter() - started) / repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        json.dumps(shape_response(agent.TOOL_RESPONSE_SHAPES, function_name, result, function_args), default=str)
+    shaped_seconds = (time.perf_counter() - started) / repeat
+    
+    return {"raw": len(raw), "shaped": len(shaped), "raw_seconds": raw_seconds, "shaped_seconds": shaped_seconds}
+
+
+def run():
+    workdir = tempfile.mkdtemp()
+    table_turner_db = TableTurnerDB(os.path.join(workdir, "bench.db"))
+    table_turner_db.seed_data()
+    agents = {
+        "gemini": RestaurantAgent("benchmark", ReservationDatabase(data_dir=workdir)),
+        "table_turner_v2": TableTurnerAgentV2("benchmark", table_turner_db),
+        "hybrid": HybridAgentV3("benchmark", table_turner_db),
+    }
+    
+    print(f"{'agent':<16}{'conversation':<24}{'tool':<30}{'raw tok':>9}{'shaped tok':>12}"
+          f"{'saved':>8}{'raw µs':>9}{'shaped µs':>11}")
+    total_raw = total_shaped = 0
+    for agent_name, scenarios in SCENARIOS.items():
+        agent = agents[agent_name]
+        agent.start_chat()
+        for conversation, function_name, function_args in scenarios:
+            sizes = measure(agent, function_name, function_args)
+            total_raw += sizes["raw"]
+            total_shaped += sizes["shaped"]
+            saved = 1 - sizes["shaped"] / sizes["raw"] if sizes["raw"] else 0.0
+            print(f"{agent_name:<16}{conversation:<24}{function_name:<30}{sizes['raw'] // 4:>9}"
+                  f"{sizes['shaped'] // 4:>12}{saved:>8.0%}{sizes['raw_seconds'] * 1e6:>9.0f}"
+                  f"{sizes['shaped_seconds'] * 1e6:>11.0f}")
+    
+    print(f"\n🔢 All calls: {total_raw // 4} → {total_shaped // 4} estimated prompt tokens "
+          f"({1 - total_shaped / total_raw:.0%} fewer)")
+
+
+if __name__ == "__main__":
+    run()
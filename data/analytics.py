@@ -0,0 +1,163 @@
+"""Vectorized occupancy analytics over confirmed reservations."""
+from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from data.database import TableTurnerDB, _from_epoch_day, _to_epoch_day, _to_slot
+
+
+class OccupancyAnalytics:
+    """Dense occupancy tensor of restaurant × date × slot × table capacity.
+    
+    ``occupancy[r, d, s, c]`` is the number of tables of capacity
+    ``capacities[c]`` at restaurant ``restaurant_ids[r]`` that are occupied
+    during slot ``time_slots[s]`` on ``dates[d]``. A booking occupies every
+    slot its sitting overlaps. All metrics are array operations over this
+    tensor; rows are never iterated in Python.
+    """
+    
+    def __init__(self, database: TableTurnerDB):
+        if np is None:
+            raise ImportError("numpy is required for occupancy analytics")
+        self.database = database
+        self.occupancy = None
+    
+    def load(self, start_date: Optional[str] = None, days: Optional[int] = None) -> "OccupancyAnalytics":
+        """Build the tensor for [start_date, start_date + days).
+        
+        Defaults to the span of dates that have confirmed reservations.
+        """
+        with self.database.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT id, cuisine FROM restaurants WHERE is_active = 1 ORDER BY id")
+            restaurants = cursor.fetchall()
+            self.restaurant_ids = np.array([r[0] for r in restaurants], dtype=np.int64)
+            self.cuisines = np.array([r[1] for r in restaurants])
+            
+            cursor.execute("SELECT time_slot FROM time_slots ORDER BY slot_order")
+            self.time_slots = [row[0] for row in cursor.fetchall()]
+            
+            cursor.execute("""
+                SELECT restaurant_id, capacity, COUNT(*)
+                FROM tables WHERE is_active = 1
+                GROUP BY restaurant_id, capacity
+            """)
+            table_counts = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 3)
+            
+            if start_date is None:
+                cursor.execute("""
+                    SELECT MIN(day), MAX(day) FROM reservations WHERE status = 'confirmed'
+                """)
+                first, last = cursor.fetchone()
+                today = _to_epoch_day(datetime.now().strftime("%Y-%m-%d"))
+                start_day = today if first is None else first
+                if days is None:
+                    days = (today if last is None else last) - start_day + 1
+            else:
+                start_day = _to_epoch_day(start_date)
+            days = days or 1
+            
+            # Day and slot are stored as integers, so the result is a plain integer matrix
+            cursor.execute("""
+                SELECT r.restaurant_id, r.day - ?, r.start_slot, r.end_slot, t.capacity
+                FROM reservations r
+                JOIN tables t ON r.table_id = t.id
+                WHERE r.status = 'confirmed' AND r.day >= ? AND r.day < ?
+            """, (start_day, start_day, start_day + days))
+            bookings = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 5)
+        
+        self.dates = [_from_epoch_day(start_day + i) for i in range(days)]
+        self.capacities = np.unique(table_counts[:, 1]) if len(table_counts) else np.array([], dtype=np.int64)
+        
+        r_count, d_count, s_count, c_count = (len(self.restaurant_ids), days,
+                                              len(self.time_slots), len(self.capacities))
+        first_slot = _to_slot(self.time_slots[0]) if self.time_slots else 0
+        
+        # Map ids/capacities to axis positions; drop bookings for inactive restaurants
+        bookings = bookings[np.isin(bookings[:, 0], self.restaurant_ids)]
+        r_pos = np.searchsorted(self.restaurant_ids, bookings[:, 0])
+        c_pos = np.searchsorted(self.capacities, bookings[:, 4])
+        
+        # Interval fill via a difference array: +1 at start, -1 at end, cumsum over slots
+        start = np.clip(bookings[:, 2] - first_slot, 0, s_count)
+        end = np.clip(bookings[:, 3] - first_slot, 0, s_count)
+        delta = np.zeros((r_count, d_count, s_count + 1, c_count), dtype=np.int32)
+        np.add.at(delta, (r_pos, bookings[:, 1], start, c_pos), 1)
+        np.add.at(delta, (r_pos, bookings[:, 1], end, c_pos), -1)
+        self.occupancy = np.cumsum(delta, axis=2)[:, :, :s_count, :]
+        
+        # Tables per (restaurant, capacity), broadcastable against occupancy
+        self.tables = np.zeros((r_count, c_count), dtype=np.int32)
+        if len(table_counts):
+            table_counts = table_counts[np.isin(table_counts[:, 0], self.restaurant_ids)]
+            self.tables[np.searchsorted(self.restaurant_ids, table_counts[:, 0]),
+                        np.searchsorted(self.capacities, table_counts[:, 1])] = table_counts[:, 2]
+        
+        return self
+    
+    def utilization(self) -> "np.ndarray":
+        """Occupied share of tables, shape (restaurant, date, slot, capacity)."""
+        tables = self.tables[:, None, None, :]
+        return np.divide(self.occupancy, tables, out=np.zeros(self.occupancy.shape), where=tables > 0)
+    
+    def overall_utilization(self) -> float:
+        """Occupied table-slots over available table-slots across the whole tensor."""
+        available = self.tables.sum() * len(self.dates) * len(self.time_slots)
+        return float(self.occupancy.sum() / available) if available else 0.0
+    
+    def peak_slot_heatmap(self) -> "np.ndarray":
+        """Mean tables occupied per slot, shape (restaurant, slot)."""
+        return self.occupancy.sum(axis=3).mean(axis=1)
+    
+    def slot_utilization(self) -> "np.ndarray":
+        """Utilization per slot across all restaurants and dates, shape (slot,)."""
+        available = self.tables.sum() * len(self.dates)
+        return self.occupancy.sum(axis=(0, 1, 3)) / available if available else np.zeros(len(self.time_slots))
+    
+    def turned_away_estimate(self) -> "np.ndarray":
+        """Fully booked (date, slot, capacity) cells per restaurant, shape (restaurant,).
+        
+        Each such cell is a request of that table size that would have been
+        refused, so this is a lower bound on turned-away parties.
+        """
+        tables = self.tables[:, None, None, :]
+        full = (self.occupancy >= tables) & (tables > 0)
+        return full.sum(axis=(1, 2, 3))
+    
+    def cuisine_rollup(self) -> Dict[str, Dict]:
+        """Utilization, occupied table-slots and turned-away totals per cuisine."""
+        labels, inverse = np.unique(self.cuisines, return_inverse=True)
+        occupied = np.bincount(inverse, weights=self.occupancy.sum(axis=(1, 2, 3)), minlength=len(labels))
+        capacity = np.bincount(inverse, weights=self.tables.sum(axis=1), minlength=len(labels)) \
+            * len(self.dates) * len(self.time_slots)
+        turned_away = np.bincount(inverse, weights=self.turned_away_estimate(), minlength=len(labels))
+        utilization = np.divide(occupied, capacity, out=np.zeros(len(labels)), where=capacity > 0)
+        
+        return {
+            str(label): {
+                "utilization": float(utilization[i]),
+                "occupied_table_slots": int(occupied[i]),
+                "turned_away": int(turned_away[i])
+            }
+            for i, label in enumerate(labels)
+        }
+    
+    def dashboard_summary(self, top_n: int = 5) -> Dict:
+        """Plain-Python summary for the Streamlit sidebar."""
+        turned_away = self.turned_away_estimate()
+        load = self.peak_slot_heatmap().sum(axis=1)
+        busiest = np.argsort(-load, kind="stable")[:top_n]
+        busiest = busiest[load[busiest] > 0]
+        return {
+            "dates": [self.dates[0], self.dates[-1]] if self.dates else [],
+            "overall_utilization": self.overall_utilization(),
+            "slot_utilization": dict(zip(self.time_slots, self.slot_utilization().round(3).tolist())),
+            "busiest_restaurants": self.restaurant_ids[busiest].tolist(),
+            "turned_away_total": int(turned_away.sum()),
+            "cuisines": self.cuisine_rollup()
+        }
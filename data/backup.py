@@ -0,0 +1,176 @@
+"""Online backup and incremental replica shipping for Table Turner."""
+import json
+import sqlite3
+import time
+from typing import Callable, Dict, Optional
+
+from data.database import TableTurnerDB, _to_epoch_day, _to_slot
+
+# Pages copied per backup step. The source is only read-locked while a step
+# runs, so small steps keep the pause seen by concurrent bookings short.
+BACKUP_PAGES_PER_STEP = 64
+BACKUP_STEP_SLEEP_SECONDS = 0.005
+
+
+def backup_database(source_path: str, target_path: str,
+                    pages_per_step: int = BACKUP_PAGES_PER_STEP,
+                    sleep_seconds: float = BACKUP_STEP_SLEEP_SECONDS,
+                    progress: Optional[Callable[[int, int, int], None]] = None) -> Dict:
+    """Copy a live database to target_path using the sqlite3 backup API.
+    
+    The source connection holds one read transaction for the whole copy.
+    In WAL mode that pins a consistent snapshot without blocking writers,
+    and keeps concurrent commits from restarting the backup (which would
+    otherwise never finish under steady booking traffic). Returns timing
+    statistics.
+    """
+    steps = 0
+    
+    def on_step(status, remaining, total):
+        nonlocal steps
+        steps += 1
+        if progress:
+            progress(status, remaining, total)
+    
+    source = sqlite3.connect(source_path, isolation_level=None)
+    target = sqlite3.connect(target_path)
+    try:
+        started = time.perf_counter()
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(target, pages=pages_per_step, progress=on_step, sleep=sleep_seconds)
+        duration = time.perf_counter() - started
+        source.execute("COMMIT")
+        
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+        page_size = target.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        target.close()
+        source.close()
+    
+    return {
+        "target_path": target_path,
+        "duration_seconds": duration,
+        "steps": steps,
+        "pages": page_count,
+        "bytes": page_count * page_size
+    }
+
+
+class ReplicaShipper:
+    """Keeps a warm read replica in sync by shipping the reservation_events log.
+    
+    The replica starts as an online backup of the primary. Each ship() call
+    reads events newer than the replica's own latest seq and applies them in
+    one transaction, so the replica is always a consistent (if slightly
+    stale) copy that can serve availability and lookup queries.
+    """
+    
+    def __init__(self, primary: TableTurnerDB, replica_path: str):
+        self.primary = primary
+        self.replica_path = replica_path
+    
+    def initialize(self, **backup_options) -> Dict:
+        """Seed the replica with a full online backup of the primary."""
+        return backup_database(self.primary.db_path, self.replica_path, **backup_options)
+    
+    def get_replica(self) -> TableTurnerDB:
+        """Open the replica for read traffic."""
+        return TableTurnerDB(self.replica_path)
+    
+    def ship(self, batch_size: int = 1000) -> Dict:
+        """Apply all primary events the replica has not seen yet."""
+        started = time.perf_counter()
+        conn = sqlite3.connect(self.replica_path)
+        try:
+            last_seq = conn.execute(
+                "SELECT IFNULL(MAX(seq), 0) FROM reservation_events"
+            ).fetchone()[0]
+            shipped = 0
+            
+            while True:
+                events = self.primary.read_events(after_seq=last_seq, limit=batch_size)
+                if not events:
+                    break
+                
+                with conn:
+                    for event in events:
+                        self._apply_event(conn, event)
+                
+                shipped += len(events)
+                last_seq = events[-1]["seq"]
+        finally:
+            conn.close()
+        
+        return {
+            "events_shipped": shipped,
+            "replica_seq": last_seq,
+            "duration_seconds": time.perf_counter() - started
+        }
+    
+    def _apply_event(self, conn: sqlite3.Connection, event: Dict):
+        """Apply one event to the replica and append it to the replica's log."""
+        payload = event["payload"]
+        
+        if event["event_type"] == "user_created":
+            conn.execute("""
+                INSERT OR IGNORE INTO users (phone_number, name, email)
+                VALUES (?, ?, ?)
+            """, (payload["phone_number"], payload["name"], payload.get("email")))
+        
+        elif event["event_type"] == "user_updated":
+            # Reservation counts follow reservation_created; only profile fields are copied
+            conn.execute("""
+                UPDATE users SET name = ?, email = ? WHERE phone_number = ?
+            """, (payload["name"], payload.get("email"), payload["phone_number"]))
+        
+        elif event["event_type"] in ("reservation_created", "reservation_cancelled"):
+            cursor = conn.execute("""
+                INSERT INTO reservations
+                (reservation_id, restaurant_id, table_id, phone_number, customer_name,
+                 day, start_slot, end_slot, duration_minutes, party_size, status)
+                VALUES (:reservation_id, :restaurant_id, :table_id, :phone_number, :customer_name,
+                        :day, :start_slot, :end_slot, :duration_minutes, :party_size, :status)
+                ON CONFLICT(reservation_id) DO NOTHING
+            """, {
+                "duration_minutes": None,
+                **payload,
+                "day": _to_epoch_day(payload["date"]),
+                "start_slot": _to_slot(payload["time_slot"]),
+                "end_slot": _to_slot(payload["end_time"], round_up=True)
+            })
+            
+            if cursor.rowcount:
+                conn.execute("""
+                    UPDATE users
+                    SET total_reservations = total_reservations + 1,
+                        last_reservation_date = ?
+                    WHERE phone_number = ?
+                """, (payload["date"], payload["phone_number"]))
+            else:
+                conn.execute("""
+                    UPDATE reservations
+                    SET status = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE reservation_id = ?
+                """, (payload["status"], payload["reservation_id"]))
+        
+        elif event["entity_type"] == "waitlist":
+            # Waitlist events carry the entry's whole row
+            conn.execute("""
+                INSERT INTO waitlist
+                (id, restaurant_id, date, earliest_slot, latest_slot, party_size, phone_number,
+                 customer_name, auto_promote, status, reservation_id, hold_id, created_at, updated_at)
+                VALUES (:id, :restaurant_id, :date, :earliest_slot, :latest_slot, :party_size,
+                        :phone_number, :customer_name, :auto_promote, :status, :reservation_id,
+                        :hold_id, :created_at, :updated_at)
+                ON CONFLICT(id) DO UPDATE SET
+                    status = excluded.status, reservation_id = excluded.reservation_id,
+                    hold_id = excluded.hold_id, updated_at = excluded.updated_at
+            """, payload)
+        
+        conn.execute("""
+            INSERT INTO reservation_events
+            (seq, event_type, entity_type, entity_id, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (event["seq"], event["event_type"], event["entity_type"],
+              event["entity_id"], json.dumps(payload), event["created_at"]))
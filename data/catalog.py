@@ -0,0 +1,122 @@
+"""Precomputed inverted indexes over a static restaurant catalog."""
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+# Filterable fields and whether matching ignores case
+INDEXED_FIELDS = {"cuisine": True, "location": True, "price_range": False}
+
+
+class CatalogIndex:
+    """Answers catalog filters with posting lists instead of list scans.
+    
+    Restaurants are ranked once by rating (highest first, then id). Each
+    indexed field maps a value to the ascending list of ranks that have it,
+    plus a set of the same ranks for membership tests. A query walks the
+    shortest posting list and keeps ranks present in the others, so results
+    are already in rating order. min_rating is a bisect over the ranked
+    ratings, which bounds every posting list walk.
+    """
+    
+    def __init__(self, restaurants: List[Dict]):
+        self.ranked = sorted(restaurants, key=lambda r: (-r.get("rating", 0), r["id"]))
+        # Negated so the array is ascending for bisect
+        self._neg_ratings = [-r.get("rating", 0) for r in self.ranked]
+        self._postings = {field: {} for field in INDEXED_FIELDS}
+        
+        for rank, restaurant in enumerate(self.ranked):
+            for field, fold_case in INDEXED_FIELDS.items():
+                value = restaurant.get(field)
+                if value is None:
+                    continue
+                key = value.lower() if fold_case else value
+                self._postings[field].setdefault(key, []).append(rank)
+        
+        self._posting_sets = {
+            field: {key: set(ranks) for key, ranks in postings.items()}
+            for field, postings in self._postings.items()
+        }
+    
+    def filter(self, cuisine: Optional[str] = None, location: Optional[str] = None,
+               price_range: Optional[str] = None, min_rating: Optional[float] = None) -> List[Dict]:
+        """Restaurants matching every given filter, highest rated first."""
+        cutoff = len(self.ranked) if min_rating is None else bisect_right(self._neg_ratings, -min_rating)
+        
+        terms = []
+        for field, value in (("cuisine", cuisine), ("location", location), ("price_range", price_range)):
+            if value:
+                key = value.lower() if INDEXED_FIELDS[field] else value
+                if key not in self._postings[field]:
+                    return []
+                terms.append((self._postings[field][key], self._posting_sets[field][key]))
+        
+        if not terms:
+            return self.ranked[:cutoff]
+        
+        terms.sort(key=lambda term: len(term[0]))
+        shortest, others = terms[0][0], [ranks for _, ranks in terms[1:]]
+        results = []
+        for rank in shortest:
+            if rank >= cutoff:
+                break
+            if all(rank in ranks for ranks in others):
+                results.append(self.ranked[rank])
+        return results
+
+
+RECOMMENDATION_TOP_K = 5
+
+# Buckets: name -> (keywords that select it in a request, membership rule).
+# Occasions are checked in order, so the first matching keyword wins.
+OCCASION_BUCKETS = {
+    "romantic": (("romantic", "date"),
+                 lambda r: r["price_range"] in ("$$$", "$$$$") and r["cuisine"] in ("Italian", "French", "Continental")),
+    "business": (("business", "meeting"),
+                 lambda r: r["price_range"] in ("$$", "$$$") and r["rating"] >= 4.3),
+    "family": (("family",),
+               lambda r: r["capacity"] >= 50),
+}
+DIETARY_BUCKETS = {
+    "vegetarian": (("vegetarian", "vegan"),
+                   lambda r: r["cuisine"] in ("Vegetarian", "Vegan", "Indian", "Mediterranean")),
+}
+DEFAULT_RECOMMENDATION = lambda r: r["rating"] >= 4.4
+
+
+class RecommendationEngine:
+    """Top-k recommendations per occasion and dietary bucket, ranked up front.
+    
+    Every (occasion, dietary) combination, including "none" for either, is
+    materialized when the engine is built, so recommend() is a keyword match
+    and a dict lookup. Combined buckets merge the two rating-ranked lists,
+    keeping the occasion's order; if nothing satisfies both, the occasion
+    list is used on its own. Rebuild the engine when the catalog changes.
+    """
+    
+    def __init__(self, catalog: CatalogIndex, top_k: int = RECOMMENDATION_TOP_K):
+        ranked = catalog.ranked
+        occasions = {name: [r for r in ranked if rule(r)] for name, (_, rule) in OCCASION_BUCKETS.items()}
+        dietary = {name: [r for r in ranked if rule(r)] for name, (_, rule) in DIETARY_BUCKETS.items()}
+        
+        self._buckets = {(None, None): [r for r in ranked if DEFAULT_RECOMMENDATION(r)][:top_k]}
+        for occasion, matches in occasions.items():
+            self._buckets[(occasion, None)] = matches[:top_k]
+        for diet, matches in dietary.items():
+            self._buckets[(None, diet)] = matches[:top_k]
+            for occasion, occasion_matches in occasions.items():
+                allowed = {r["id"] for r in matches}
+                merged = [r for r in occasion_matches if r["id"] in allowed]
+                self._buckets[(occasion, diet)] = (merged or occasion_matches)[:top_k]
+    
+    @staticmethod
+    def _classify(text: str, buckets: Dict) -> Optional[str]:
+        text = (text or "").lower()
+        for name, (keywords, _) in buckets.items():
+            if any(keyword in text for keyword in keywords):
+                return name
+        return None
+    
+    def recommend(self, occasion: str = "", dietary_restrictions: str = "") -> List[Dict]:
+        """Highest rated restaurants for a free-text occasion and dietary request."""
+        key = (self._classify(occasion, OCCASION_BUCKETS),
+               self._classify(dietary_restrictions, DIETARY_BUCKETS))
+        return list(self._buckets[key])
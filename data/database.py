@@ -3,21 +3,140 @@ import sqlite3
 from datetime import datetime, time, timedelta
 from typing import List, Dict, Optional, Tuple
 import json
+import math
+import queue
+import uuid
 from contextlib import contextmanager
 
+from data.geo import KM_PER_DEGREE, NEIGHBOURHOOD_COORDINATES, haversine_km, resolve_location
+from data.locking import AtomicCounter
+
+# Reservations are made on a 30-minute grid; a booking holds its table for
+# the restaurant's dining duration, rounded up to whole slots.
+SLOT_MINUTES = 30
+DEFAULT_DINING_MINUTES = 90
+
+# How long a table stays held while the user confirms a booking
+HOLD_TTL_SECONDS = 300
+
+# Restaurants are bucketed into square grid cells this many degrees on a side
+# (~1 km); proximity search looks up the cells its box covers on idx_restaurants_grid
+GRID_CELL_DEGREES = 1.0 / KM_PER_DEGREE
+
+# Idle connections kept open per TableTurnerDB; extra ones are closed on release
+CONNECTION_POOL_SIZE = 8
+
+# PRAGMA user_version. 2: reservations store integer day/slot columns.
+SCHEMA_VERSION = 2
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+# Reservations store the date as days since 1970-01-01 and times as slot
+# indexes (minutes since midnight // SLOT_MINUTES, the same numbering as
+# time_slots.slot_order). The string forms are virtual generated columns:
+# they cost no storage and keep `SELECT *` callers working, but queries
+# should filter on the integer columns so the indexes are used.
+RESERVATIONS_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {{name}} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reservation_id TEXT UNIQUE NOT NULL,
+        restaurant_id INTEGER NOT NULL,
+        table_id INTEGER NOT NULL,
+        phone_number TEXT NOT NULL,
+        customer_name TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        start_slot INTEGER NOT NULL,
+        end_slot INTEGER NOT NULL,
+        duration_minutes INTEGER,
+        party_size INTEGER NOT NULL,
+        status TEXT DEFAULT 'confirmed',
+        special_requests TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        date TEXT GENERATED ALWAYS AS (date(day * 86400, 'unixepoch')) VIRTUAL,
+        time_slot TEXT GENERATED ALWAYS AS (printf('%02d:%02d',
+            start_slot * {SLOT_MINUTES} / 60, start_slot * {SLOT_MINUTES} % 60)) VIRTUAL,
+        end_time TEXT GENERATED ALWAYS AS (printf('%02d:%02d',
+            end_slot * {SLOT_MINUTES} / 60, end_slot * {SLOT_MINUTES} % 60)) VIRTUAL,
+        FOREIGN KEY (restaurant_id) REFERENCES restaurants(id),
+        FOREIGN KEY (table_id) REFERENCES tables(id),
+        FOREIGN KEY (phone_number) REFERENCES users(phone_number)
+    ) STRICT
+"""
+
+
+def _to_minutes(time_slot: str) -> int:
+    """Convert 'HH:MM' to minutes since midnight."""
+    hours, minutes = time_slot.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _to_time_slot(minutes: int) -> str:
+    """Convert minutes since midnight to 'HH:MM'.
+
+    Hours are not wrapped at midnight, so late sittings end at e.g. '24:30'
+    and still compare correctly as strings.
+    """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _to_slot(time_slot: str, round_up: bool = False) -> int:
+    """Convert 'HH:MM' to a slot index (minutes since midnight // SLOT_MINUTES)."""
+    minutes = _to_minutes(time_slot)
+    return -(-minutes // SLOT_MINUTES) if round_up else minutes // SLOT_MINUTES
+
+
+def _to_grid_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    """(grid_row, grid_col) of the cell containing a point."""
+    return math.floor(latitude / GRID_CELL_DEGREES), math.floor(longitude / GRID_CELL_DEGREES)
+
+
+def _to_epoch_day(date: str) -> int:
+    """Convert 'YYYY-MM-DD' to days since 1970-01-01. Raises ValueError if invalid."""
+    return datetime.fromisoformat(date).toordinal() - _EPOCH_ORDINAL
+
+
+def _from_epoch_day(day: int) -> str:
+    """Convert days since 1970-01-01 to 'YYYY-MM-DD'."""
+    return datetime.fromordinal(day + _EPOCH_ORDINAL).strftime("%Y-%m-%d")
+
+
 class TableTurnerDB:
     """Scalable SQLite database for Table Turner reservation system."""
     
     def __init__(self, db_path: str = "table_turner.db"):
         """Initialize database connection."""
         self.db_path = db_path
+        self._pool = queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE)  # (generation, connection)
+        self._pool_generation = AtomicCounter(0)  # bumped by close(); older connections are retired
+        self._catalog_changes = AtomicCounter(1)
         self.init_database()
     
+    @property
+    def catalog_version(self) -> int:
+        """Bumped whenever this handle changes the restaurants; caches key on it."""
+        return self._catalog_changes.value
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, but only one uses each at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Get database connection with automatic cleanup."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """Borrow a pooled connection; commit on success, roll back on error."""
+        generation = self._pool_generation.value
+        while True:
+            try:
+                pooled_generation, conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                break
+            if pooled_generation == generation:
+                break
+            conn.close()  # pooled just before a close() retired it
+        
         try:
             yield conn
             conn.commit()
@@ -25,13 +144,40 @@ class TableTurnerDB:
             conn.rollback()
             raise e
         finally:
+            self._release(conn, generation)
+    
+    def _release(self, conn: sqlite3.Connection, generation: int):
+        """Return a connection to the pool, or close it if the pool is full or it was retired."""
+        if conn.in_transaction or generation != self._pool_generation.value:
+            conn.close()
+            return
+        try:
+            self._pool.put_nowait((generation, conn))
+        except queue.Full:
             conn.close()
     
+    def close(self):
+        """Close idle pooled connections and retire the ones in use.
+        
+        Connections borrowed before the call are closed when they are
+        released instead of going back to the pool, so after the database
+        file is removed no later caller can reach the deleted file.
+        """
+        self._pool_generation.next()
+        while True:
+            try:
+                self._pool.get_nowait()[1].close()
+            except queue.Empty:
+                return
+    
     def init_database(self):
         """Initialize database tables with indexes."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL lets readers (including online backups) run alongside writers
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Users table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -62,10 +208,24 @@ class TableTurnerDB:
                     rating REAL DEFAULT 4.0,
                     price_range TEXT,
                     description TEXT,
+                    dining_duration_minutes INTEGER DEFAULT 90,
+                    latitude REAL,
+                    longitude REAL,
+                    grid_row INTEGER,
+                    grid_col INTEGER,
                     is_active BOOLEAN DEFAULT 1,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._add_column_if_missing(
+                cursor, "restaurants", "dining_duration_minutes", "INTEGER DEFAULT 90"
+            )
+            if self._add_column_if_missing(cursor, "restaurants", "latitude", "REAL"):
+                self._add_column_if_missing(cursor, "restaurants", "longitude", "REAL")
+                self._backfill_restaurant_coordinates(cursor)
+            if self._add_column_if_missing(cursor, "restaurants", "grid_row", "INTEGER"):
+                self._add_column_if_missing(cursor, "restaurants", "grid_col", "INTEGER")
+                self._backfill_restaurant_grid_cells(cursor)
             
             # Create indexes for efficient searching
             cursor.execute("""
@@ -77,6 +237,14 @@ class TableTurnerDB:
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_restaurants_name ON restaurants(name)
             """)
+            # Proximity search: one index range per grid row its box covers, with
+            # the exact box checked on the index entries. Replaces a (latitude,
+            # longitude) index, which could only range on latitude.
+            cursor.execute("DROP INDEX IF EXISTS idx_restaurants_lat_lng")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_restaurants_grid
+                ON restaurants(grid_row, grid_col, latitude, longitude)
+            """)
             
             # Tables table (physical tables in each restaurant)
             cursor.execute("""
@@ -107,36 +275,112 @@ class TableTurnerDB:
                 )
             """)
             
+            # Dining durations by party size (overrides the restaurant default)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dining_durations (
+                    restaurant_id INTEGER NOT NULL,
+                    min_party_size INTEGER NOT NULL,
+                    duration_minutes INTEGER NOT NULL,
+                    PRIMARY KEY (restaurant_id, min_party_size),
+                    FOREIGN KEY (restaurant_id) REFERENCES restaurants(id)
+                )
+            """)
+            
             # Reservations table
+            cursor.execute(RESERVATIONS_DDL.format(name="reservations"))
+            
+            # Table holds: short-lived claims on a table while a booking is confirmed.
+            # Stored in the database so every process sharing the file honors them.
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS reservations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    reservation_id TEXT UNIQUE NOT NULL,
+                CREATE TABLE IF NOT EXISTS table_holds (
+                    hold_id TEXT PRIMARY KEY,
                     restaurant_id INTEGER NOT NULL,
                     table_id INTEGER NOT NULL,
-                    phone_number TEXT NOT NULL,
-                    customer_name TEXT NOT NULL,
                     date TEXT NOT NULL,
                     time_slot TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    party_size INTEGER NOT NULL,
+                    holder TEXT,
+                    expires_at REAL NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (restaurant_id) REFERENCES restaurants(id),
+                    FOREIGN KEY (table_id) REFERENCES tables(id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_table_holds_table
+                ON table_holds(table_id, date, time_slot, end_time, expires_at)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_table_holds_restaurant_date
+                ON table_holds(restaurant_id, date)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_table_holds_expires
+                ON table_holds(expires_at)
+            """)
+            
+            # Waitlist for fully booked restaurants
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waitlist (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    restaurant_id INTEGER NOT NULL,
+                    date TEXT NOT NULL,
+                    earliest_slot TEXT NOT NULL,
+                    latest_slot TEXT NOT NULL,
                     party_size INTEGER NOT NULL,
-                    status TEXT DEFAULT 'confirmed',
-                    special_requests TEXT,
+                    phone_number TEXT NOT NULL,
+                    customer_name TEXT NOT NULL,
+                    auto_promote BOOLEAN DEFAULT 1,
+                    status TEXT DEFAULT 'waiting',
+                    reservation_id TEXT,
+                    hold_id TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (restaurant_id) REFERENCES restaurants(id),
-                    FOREIGN KEY (table_id) REFERENCES tables(id),
                     FOREIGN KEY (phone_number) REFERENCES users(phone_number)
                 )
             """)
+            # Only waiting entries are ever matched, so index just those
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_waitlist_match
+                ON waitlist(restaurant_id, date, party_size, earliest_slot)
+                WHERE status = 'waiting'
+            """)
+            
+            # Append-only change log, written in the same transaction as each change
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS reservation_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_type TEXT NOT NULL,
+                    entity_type TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reservation_events_entity
+                ON reservation_events(entity_type, entity_id, seq)
+            """)
+            
+            # Databases created before SCHEMA_VERSION 2 store TEXT dates and times
+            cursor.execute("PRAGMA table_info(reservations)")
+            if "day" not in {row[1] for row in cursor.fetchall()}:
+                if self._add_column_if_missing(cursor, "reservations", "end_time", "TEXT"):
+                    self._add_column_if_missing(cursor, "reservations", "duration_minutes", "INTEGER")
+                    self._backfill_reservation_intervals(cursor)
+                self._migrate_reservations_to_integer(cursor)
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             
             # Create composite indexes for efficient querying
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_reservations_date_time 
-                ON reservations(date, time_slot)
+                ON reservations(day, start_slot)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_reservations_restaurant_date 
-                ON reservations(restaurant_id, date)
+                ON reservations(restaurant_id, day)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_reservations_phone 
@@ -146,6 +390,12 @@ class TableTurnerDB:
                 CREATE INDEX IF NOT EXISTS idx_reservations_status 
                 ON reservations(status)
             """)
+            # Range index for interval overlap checks on a single table
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reservations_table_interval
+                ON reservations(table_id, day, start_slot, end_slot)
+                WHERE status = 'confirmed'
+            """)
             
             # Reservation counter for unique IDs
             cursor.execute("""
@@ -161,6 +411,70 @@ class TableTurnerDB:
             
             conn.commit()
     
+    def _add_column_if_missing(self, cursor, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table (schema migration). Returns True if added."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column in {row[1] for row in cursor.fetchall()}:
+            return False
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+    
+    def _backfill_reservation_intervals(self, cursor):
+        """Give reservations created before durations existed a default interval."""
+        cursor.execute("SELECT id, time_slot FROM reservations WHERE end_time IS NULL")
+        cursor.executemany("""
+            UPDATE reservations SET end_time = ?, duration_minutes = ? WHERE id = ?
+        """, [
+            (_to_time_slot(_to_minutes(row[1]) + DEFAULT_DINING_MINUTES), DEFAULT_DINING_MINUTES, row[0])
+            for row in cursor.fetchall()
+        ])
+    
+    def _backfill_restaurant_coordinates(self, cursor):
+        """Place restaurants without coordinates at their neighbourhood's centroid."""
+        cursor.executemany("""
+            UPDATE restaurants SET latitude = ?, longitude = ?
+            WHERE location = ? AND latitude IS NULL
+        """, [(lat, lng, location) for location, (lat, lng) in NEIGHBOURHOOD_COORDINATES.items()])
+        self._backfill_restaurant_grid_cells(cursor)
+    
+    def _backfill_restaurant_grid_cells(self, cursor):
+        """Set grid_row and grid_col for restaurants with coordinates but no cell."""
+        cursor.execute("""
+            SELECT id, latitude, longitude FROM restaurants
+            WHERE latitude IS NOT NULL AND grid_row IS NULL
+        """)
+        cursor.executemany("""
+            UPDATE restaurants SET grid_row = ?, grid_col = ? WHERE id = ?
+        """, [(*_to_grid_cell(row[1], row[2]), row[0]) for row in cursor.fetchall()])
+    
+    def _migrate_reservations_to_integer(self, cursor):
+        """Rebuild a TEXT-date reservations table as the STRICT integer schema.
+        
+        Also renumbers time_slots.slot_order to the matching slot index.
+        Old indexes are dropped with the old table and recreated by the caller.
+        """
+        minutes = "(CAST(substr({0}, 1, 2) AS INTEGER) * 60 + CAST(substr({0}, 4, 2) AS INTEGER))"
+        cursor.execute(RESERVATIONS_DDL.format(name="reservations_v2"))
+        cursor.execute(f"""
+            INSERT INTO reservations_v2
+            (id, reservation_id, restaurant_id, table_id, phone_number, customer_name,
+             day, start_slot, end_slot, duration_minutes, party_size, status,
+             special_requests, created_at, updated_at)
+            SELECT id, reservation_id, restaurant_id, table_id, phone_number, customer_name,
+                   CAST(julianday(date) - julianday('1970-01-01') AS INTEGER),
+                   {minutes.format("time_slot")} / {SLOT_MINUTES},
+                   COALESCE(({minutes.format("end_time")} + {SLOT_MINUTES - 1}) / {SLOT_MINUTES},
+                            ({minutes.format("time_slot")} + {DEFAULT_DINING_MINUTES}) / {SLOT_MINUTES}),
+                   duration_minutes, party_size, status,
+                   special_requests, created_at, updated_at
+            FROM reservations
+        """)
+        cursor.execute("DROP TABLE reservations")
+        cursor.execute("ALTER TABLE reservations_v2 RENAME TO reservations")
+        cursor.execute(f"""
+            UPDATE time_slots SET slot_order = {minutes.format("time_slot")} / {SLOT_MINUTES}
+        """)
+    
     def seed_data(self):
         """Populate initial data."""
         with self.get_connection() as conn:
@@ -189,6 +503,7 @@ class TableTurnerDB:
                 INSERT INTO restaurants (id, name, cuisine, location, city, address, phone, rating, price_range, description)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, restaurants_data)
+            self._backfill_restaurant_coordinates(cursor)
             
             # Insert tables for each restaurant
             # Each restaurant gets 3 tables of each size (2, 4, 6)
@@ -217,24 +532,31 @@ class TableTurnerDB:
                 VALUES (?, ?, ?, ?)
             """, tables_data)
             
-            # Insert time slots (30-minute intervals from 11:00 to 23:00)
+            # Insert time slots (30-minute intervals from 11:00 to 23:00);
+            # slot_order is the slot index used by reservations.start_slot
             time_slots_data = []
             start_time = time(11, 0)
             current = datetime.combine(datetime.today(), start_time)
             end = datetime.combine(datetime.today(), time(23, 0))
-            slot_order = 0
             
             while current <= end:
-                time_slots_data.append((current.strftime("%H:%M"), slot_order))
+                time_slot = current.strftime("%H:%M")
+                time_slots_data.append((time_slot, _to_slot(time_slot)))
                 current += timedelta(minutes=30)
-                slot_order += 1
             
             cursor.executemany("""
                 INSERT INTO time_slots (time_slot, slot_order)
                 VALUES (?, ?)
             """, time_slots_data)
             
+            # Larger parties stay longer
+            cursor.executemany("""
+                INSERT INTO dining_durations (restaurant_id, min_party_size, duration_minutes)
+                VALUES (?, ?, ?)
+            """, [(restaurant_id, 5, 120) for restaurant_id in range(1, 11)])
+            
             conn.commit()
+        self._catalog_changes.next()
     
     # User operations
     def check_user_exists(self, phone_number: str) -> bool:
@@ -265,12 +587,14 @@ class TableTurnerDB:
                 VALUES (?, ?, ?)
             """, (phone_number, name, email))
             
-            return {
+            user = {
                 "phone_number": phone_number,
                 "name": name,
                 "email": email,
                 "created_at": datetime.now().isoformat()
             }
+            self._append_event(cursor, "user_created", "user", phone_number, user)
+            return user
     
     def get_user_reservations(self, phone_number: str, limit: int = 5) -> List[Dict]:
         """Get recent reservations for a user."""
@@ -332,11 +656,139 @@ class TableTurnerDB:
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    def find_restaurants_near(self, location: str = None, latitude: float = None,
+                              longitude: float = None, radius_km: Optional[float] = None,
+                              limit: int = 5, cuisine: str = None,
+                              min_rating: float = None) -> Tuple[Optional[List[Dict]], str]:
+        """Find restaurants nearest a neighbourhood or point, each with distance_km.
+        
+        Candidates are the restaurants in the grid cells covering the search
+        box, read from idx_restaurants_grid with one grid_col range per
+        grid_row, and are ranked by great-circle distance. Without radius_km
+        the box doubles from 2 km until `limit` are found.
+        """
+        if latitude is None or longitude is None:
+            coordinates = resolve_location(location)
+            if not coordinates:
+                return None, f"Unknown location: {location}"
+            latitude, longitude = coordinates
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            radius = radius_km or 2.0
+            while True:
+                dlat = radius / KM_PER_DEGREE
+                dlng = radius / (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+                min_row, min_col = _to_grid_cell(latitude - dlat, longitude - dlng)
+                max_row, max_col = _to_grid_cell(latitude + dlat, longitude + dlng)
+                grid_rows = list(range(min_row, max_row + 1))
+                query = f"""
+                    SELECT * FROM restaurants
+                    WHERE grid_row IN ({','.join('?' * len(grid_rows))})
+                    AND grid_col BETWEEN ? AND ?
+                    AND latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?
+                    AND is_active = 1
+                """
+                params = [*grid_rows, min_col, max_col,
+                          latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng]
+                if cuisine:
+                    query += " AND cuisine LIKE ?"
+                    params.append(f"%{cuisine}%")
+                if min_rating is not None:
+                    query += " AND rating >= ?"
+                    params.append(min_rating)
+                cursor.execute(query, params)
+                
+                matches = []
+                for row in cursor.fetchall():
+                    distance = haversine_km(latitude, longitude, row["latitude"], row["longitude"])
+                    if distance <= radius:
+                        matches.append({**dict(row), "distance_km": round(distance, 2)})
+                
+                if radius_km is not None or len(matches) >= limit or radius >= 64:
+                    break
+                radius *= 2
+            
+            matches.sort(key=lambda r: r["distance_km"])
+            return matches[:limit], "OK"
+    
+    # Dining duration operations
+    def _get_dining_duration(self, cursor, restaurant_id: int, party_size: int) -> int:
+        """Dining duration in minutes, rounded up to whole slots."""
+        cursor.execute("""
+            SELECT duration_minutes FROM dining_durations
+            WHERE restaurant_id = ? AND min_party_size <= ?
+            ORDER BY min_party_size DESC
+            LIMIT 1
+        """, (restaurant_id, party_size))
+        row = cursor.fetchone()
+        if not row:
+            cursor.execute("""
+                SELECT dining_duration_minutes FROM restaurants WHERE id = ?
+            """, (restaurant_id,))
+            row = cursor.fetchone()
+        duration = (row[0] if row else None) or DEFAULT_DINING_MINUTES
+        return -(-duration // SLOT_MINUTES) * SLOT_MINUTES
+    
+    def get_dining_duration(self, restaurant_id: int, party_size: int) -> int:
+        """Get how long (in minutes) a party of this size holds a table."""
+        with self.get_connection() as conn:
+            return self._get_dining_duration(conn.cursor(), restaurant_id, party_size)
+    
+    def set_dining_duration(self, restaurant_id: int, duration_minutes: int,
+                            min_party_size: Optional[int] = None):
+        """Set the restaurant default duration, or an override for parties of min_party_size+."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if min_party_size is None:
+                cursor.execute("""
+                    UPDATE restaurants SET dining_duration_minutes = ? WHERE id = ?
+                """, (duration_minutes, restaurant_id))
+            else:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO dining_durations
+                    (restaurant_id, min_party_size, duration_minutes)
+                    VALUES (?, ?, ?)
+                """, (restaurant_id, min_party_size, duration_minutes))
+        self._catalog_changes.next()
+    
+    def _get_busy_masks(self, cursor, restaurant_id: int, date: str,
+                        holder: Optional[str] = None) -> Dict[int, int]:
+        """Bitmask of occupied slots per table (bit i = slot starting at i * SLOT_MINUTES).
+        
+        Confirmed bookings and other holders' unexpired holds count as occupied.
+        """
+        cursor.execute("""
+            SELECT table_id, start_slot, end_slot
+            FROM reservations
+            WHERE restaurant_id = ? AND day = ? AND status = 'confirmed'
+        """, (restaurant_id, _to_epoch_day(date)))
+        intervals = cursor.fetchall()
+        
+        cursor.execute("""
+            SELECT table_id, time_slot, end_time
+            FROM table_holds
+            WHERE restaurant_id = ? AND date = ? AND expires_at > ?
+            AND (holder IS NULL OR holder IS NOT ?)
+        """, (restaurant_id, date, datetime.now().timestamp(), holder))
+        intervals += [(table_id, _to_slot(start), _to_slot(end, round_up=True))
+                      for table_id, start, end in cursor.fetchall()]
+        
+        busy = {}
+        for table_id, first, last in intervals:
+            busy[table_id] = busy.get(table_id, 0) | (((1 << (last - first)) - 1) << first)
+        return busy
+    
     # Time slot and availability operations
-    def get_available_slots(self, restaurant_id: int, date: str, party_size: int) -> List[Dict]:
+    def get_available_slots(self, restaurant_id: int, date: str, party_size: int,
+                            holder: Optional[str] = None) -> List[Dict]:
         """Get available time slots for a restaurant on a specific date.
         
-        This is optimized with SQL joins and indexes for scalability.
+        A slot is available when some suitable table is free for the whole
+        dining duration. All confirmed bookings and active holds for the day
+        are read in one indexed query and folded into per-table bitmasks, so
+        each slot check is a single AND regardless of how many bookings
+        overlap it. Holds owned by ``holder`` do not block.
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -360,31 +812,25 @@ class TableTurnerDB:
                 FROM time_slots
                 ORDER BY slot_order
             """)
-            all_time_slots = [dict(row) for row in cursor.fetchall()]
+            all_time_slots = [row['time_slot'] for row in cursor.fetchall()]
+            
+            duration = self._get_dining_duration(cursor, restaurant_id, party_size)
+            window = (1 << (duration // SLOT_MINUTES)) - 1
+            busy = self._get_busy_masks(cursor, restaurant_id, date, holder)
             
-            # For each time slot, check if any suitable table is available
             available_slots = []
             
-            for time_slot_data in all_time_slots:
-                time_slot = time_slot_data['time_slot']
-                
-                # Check which tables are booked at this time
-                cursor.execute("""
-                    SELECT table_id
-                    FROM reservations
-                    WHERE restaurant_id = ? 
-                    AND date = ? 
-                    AND time_slot = ?
-                    AND status = 'confirmed'
-                """, (restaurant_id, date, time_slot))
-                
-                booked_table_ids = {row[0] for row in cursor.fetchall()}
+            for time_slot in all_time_slots:
+                start = _to_minutes(time_slot)
+                slot_window = window << (start // SLOT_MINUTES)
                 
-                # Find first available table
+                # Find first (smallest) table free for the whole sitting
                 for table in suitable_tables:
-                    if table['id'] not in booked_table_ids:
+                    if not busy.get(table['id'], 0) & slot_window:
                         available_slots.append({
                             "time": time_slot,
+                            "end_time": _to_time_slot(start + duration),
+                            "duration_minutes": duration,
                             "table_id": table['id'],
                             "table_number": table['table_number'],
                             "table_capacity": table['capacity'],
@@ -395,29 +841,128 @@ class TableTurnerDB:
             return available_slots
     
     def find_nearest_available_slot(self, restaurant_id: int, date: str, 
-                                    requested_time: str, party_size: int) -> Optional[Dict]:
+                                    requested_time: str, party_size: int,
+                                    holder: Optional[str] = None) -> Optional[Dict]:
         """Find nearest available slot after requested time."""
-        available_slots = self.get_available_slots(restaurant_id, date, party_size)
+        available_slots = self.get_available_slots(restaurant_id, date, party_size, holder)
         
         # Filter slots >= requested time
-        requested_time_obj = datetime.strptime(requested_time, "%H:%M").time()
+        requested_minutes = _to_minutes(requested_time)
         future_slots = [
             slot for slot in available_slots
-            if datetime.strptime(slot["time"], "%H:%M").time() >= requested_time_obj
+            if _to_minutes(slot["time"]) >= requested_minutes
         ]
         
         return future_slots[0] if future_slots else None
     
+    def _has_conflict(self, cursor, table_id: int, date: str, time_slot: str,
+                      end_time: str, hold_id: Optional[str] = None) -> bool:
+        """Check whether a booking or another active hold overlaps [time_slot, end_time).
+        
+        Overlap: existing.start < new.end AND existing.end > new.start, answered
+        from the covering interval indexes for this table and day.
+        """
+        cursor.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM reservations
+                WHERE table_id = ? AND day = ? AND status = 'confirmed'
+                AND start_slot < ? AND end_slot > ?
+            ) OR EXISTS (
+                SELECT 1 FROM table_holds
+                WHERE table_id = ? AND date = ? AND time_slot < ? AND end_time > ?
+                AND expires_at > ? AND hold_id IS NOT ?
+            )
+        """, (table_id, _to_epoch_day(date), _to_slot(end_time, round_up=True), _to_slot(time_slot),
+              table_id, date, end_time, time_slot,
+              datetime.now().timestamp(), hold_id))
+        return bool(cursor.fetchone()[0])
+    
+    # Table hold operations
+    def create_hold(self, restaurant_id: int, table_id: int, date: str, time_slot: str,
+                    party_size: int, holder: Optional[str] = None,
+                    ttl_seconds: int = HOLD_TTL_SECONDS) -> Tuple[Optional[Dict], str]:
+        """Hold a table for ttl_seconds while the user confirms.
+        
+        Runs under BEGIN IMMEDIATE so the check-and-insert is atomic across
+        every process sharing the database file.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            now = datetime.now().timestamp()
+            cursor.execute("DELETE FROM table_holds WHERE expires_at <= ?", (now,))
+            
+            duration = self._get_dining_duration(cursor, restaurant_id, party_size)
+            end_time = _to_time_slot(_to_minutes(time_slot) + duration)
+            
+            if self._has_conflict(cursor, table_id, date, time_slot, end_time):
+                return None, "This table is no longer available. Please choose another slot."
+            
+            hold = self._insert_hold(cursor, restaurant_id, table_id, date, time_slot,
+                                     end_time, party_size, holder, now + ttl_seconds)
+            return hold, "Table held"
+    
+    def _insert_hold(self, cursor, restaurant_id: int, table_id: int, date: str,
+                     time_slot: str, end_time: str, party_size: int,
+                     holder: Optional[str], expires_at: float) -> Dict:
+        """Insert a hold inside the caller's transaction."""
+        hold = {
+            "hold_id": f"H{uuid.uuid4().hex[:12]}",
+            "restaurant_id": restaurant_id,
+            "table_id": table_id,
+            "date": date,
+            "time_slot": time_slot,
+            "end_time": end_time,
+            "party_size": party_size,
+            "holder": holder,
+            "expires_at": expires_at
+        }
+        cursor.execute("""
+            INSERT INTO table_holds
+            (hold_id, restaurant_id, table_id, date, time_slot, end_time,
+             party_size, holder, expires_at)
+            VALUES (:hold_id, :restaurant_id, :table_id, :date, :time_slot, :end_time,
+                    :party_size, :holder, :expires_at)
+        """, hold)
+        return hold
+    
+    def get_hold(self, hold_id: str) -> Optional[Dict]:
+        """Get an unexpired hold."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM table_holds WHERE hold_id = ? AND expires_at > ?
+            """, (hold_id, datetime.now().timestamp()))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def release_hold(self, hold_id: str) -> bool:
+        """Release a hold before it expires."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM table_holds WHERE hold_id = ?", (hold_id,))
+            return cursor.rowcount > 0
+    
+    def sweep_expired_holds(self) -> int:
+        """Delete expired holds. Returns the number removed."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM table_holds WHERE expires_at <= ?
+            """, (datetime.now().timestamp(),))
+            return cursor.rowcount
+    
     def validate_booking_advance(self, booking_date: str) -> Tuple[bool, str]:
         """Validate booking is within 3 days from today."""
-        current_date = datetime.now().date()
+        current_day = datetime.now().toordinal() - _EPOCH_ORDINAL
         try:
-            target_date = datetime.strptime(booking_date, "%Y-%m-%d").date()
+            target_day = _to_epoch_day(booking_date)
             
-            if target_date < current_date:
+            if target_day < current_day:
                 return False, "Cannot book for past dates"
             
-            days_diff = (target_date - current_date).days
+            days_diff = target_day - current_day
             if days_diff > 3:
                 return False, f"Bookings can only be made up to 3 days in advance. You're trying to book {days_diff} days ahead."
             
@@ -425,10 +970,66 @@ class TableTurnerDB:
         except ValueError:
             return False, "Invalid date format. Please use YYYY-MM-DD"
     
+    def _insert_reservation(self, cursor, restaurant_id: int, table_id: int, phone_number: str,
+                            customer_name: str, date: str, time_slot: str, end_time: str,
+                            duration: int, party_size: int) -> str:
+        """Insert a confirmed reservation inside the caller's transaction. Returns its ID."""
+        # Generate unique reservation ID
+        cursor.execute("""
+            UPDATE reservation_counter SET next_id = next_id + 1 WHERE id = 1
+            RETURNING next_id - 1
+        """)
+        reservation_number = cursor.fetchone()[0]
+        reservation_id = f"TT{reservation_number}"
+        
+        # Create reservation
+        cursor.execute("""
+            INSERT INTO reservations 
+            (reservation_id, restaurant_id, table_id, phone_number, customer_name, 
+             day, start_slot, end_slot, duration_minutes, party_size, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'confirmed')
+        """, (reservation_id, restaurant_id, table_id, phone_number, customer_name,
+              _to_epoch_day(date), _to_slot(time_slot), _to_slot(end_time, round_up=True),
+              duration, party_size))
+        
+        # Update user's reservation count
+        cursor.execute("""
+            UPDATE users 
+            SET total_reservations = total_reservations + 1,
+                last_reservation_date = ?
+            WHERE phone_number = ?
+        """, (date, phone_number))
+        
+        self._append_event(cursor, "reservation_created", "reservation", reservation_id, {
+            "reservation_id": reservation_id,
+            "restaurant_id": restaurant_id,
+            "table_id": table_id,
+            "phone_number": phone_number,
+            "customer_name": customer_name,
+            "date": date,
+            "time_slot": time_slot,
+            "end_time": end_time,
+            "duration_minutes": duration,
+            "party_size": party_size,
+            "status": "confirmed"
+        })
+        
+        # The user row changed too; incremental exports find users by their events
+        cursor.execute("SELECT * FROM users WHERE phone_number = ?", (phone_number,))
+        user = cursor.fetchone()
+        if user:
+            self._append_event(cursor, "user_updated", "user", phone_number, dict(user))
+        
+        return reservation_id
+    
     def create_reservation(self, restaurant_id: int, table_id: int, phone_number: str,
                           customer_name: str, date: str, time_slot: str, 
-                          party_size: int) -> Tuple[Optional[Dict], str]:
-        """Create a new reservation with transaction safety."""
+                          party_size: int, hold_id: Optional[str] = None) -> Tuple[Optional[Dict], str]:
+        """Create a new reservation with transaction safety.
+        
+        If hold_id is given, the hold is converted into the booking: it does
+        not count as a conflict and is deleted in the same transaction.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
@@ -438,39 +1039,23 @@ class TableTurnerDB:
                 if not is_valid:
                     return None, message
                 
-                # Check if table is still available (race condition protection)
-                cursor.execute("""
-                    SELECT COUNT(*) FROM reservations
-                    WHERE table_id = ? AND date = ? AND time_slot = ? AND status = 'confirmed'
-                """, (table_id, date, time_slot))
+                # Serialize check-and-insert across processes
+                cursor.execute("BEGIN IMMEDIATE")
                 
-                if cursor.fetchone()[0] > 0:
-                    return None, "This table has just been booked. Please choose another slot."
+                # Check the table is free for the whole sitting (race condition protection)
+                duration = self._get_dining_duration(cursor, restaurant_id, party_size)
+                end_time = _to_time_slot(_to_minutes(time_slot) + duration)
                 
-                # Generate unique reservation ID
-                cursor.execute("""
-                    UPDATE reservation_counter SET next_id = next_id + 1 WHERE id = 1
-                    RETURNING next_id - 1
-                """)
-                reservation_number = cursor.fetchone()[0]
-                reservation_id = f"TT{reservation_number}"
+                if self._has_conflict(cursor, table_id, date, time_slot, end_time, hold_id):
+                    return None, "This table has just been booked. Please choose another slot."
                 
-                # Create reservation
-                cursor.execute("""
-                    INSERT INTO reservations 
-                    (reservation_id, restaurant_id, table_id, phone_number, customer_name, 
-                     date, time_slot, party_size, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'confirmed')
-                """, (reservation_id, restaurant_id, table_id, phone_number, customer_name,
-                      date, time_slot, party_size))
+                if hold_id:
+                    cursor.execute("DELETE FROM table_holds WHERE hold_id = ?", (hold_id,))
                 
-                # Update user's reservation count
-                cursor.execute("""
-                    UPDATE users 
-                    SET total_reservations = total_reservations + 1,
-                        last_reservation_date = ?
-                    WHERE phone_number = ?
-                """, (date, phone_number))
+                reservation_id = self._insert_reservation(
+                    cursor, restaurant_id, table_id, phone_number, customer_name,
+                    date, time_slot, end_time, duration, party_size
+                )
                 
                 # Get the created reservation with restaurant details
                 cursor.execute("""
@@ -488,8 +1073,10 @@ class TableTurnerDB:
                 return reservation, "Reservation created successfully"
                 
             except sqlite3.IntegrityError as e:
+                conn.rollback()
                 return None, f"Database error: {str(e)}"
             except Exception as e:
+                conn.rollback()
                 return None, f"Error creating reservation: {str(e)}"
     
     def get_reservation_by_id(self, reservation_id: str) -> Optional[Dict]:
@@ -509,18 +1096,242 @@ class TableTurnerDB:
             return dict(row) if row else None
     
     def cancel_reservation(self, reservation_id: str) -> Tuple[bool, str]:
-        """Cancel a reservation."""
+        """Cancel a reservation and offer the freed table to the waitlist.
+        
+        The cancellation and any waitlist promotions commit together.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             cursor.execute("""
                 UPDATE reservations
                 SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP
                 WHERE reservation_id = ? AND status = 'confirmed'
+                RETURNING restaurant_id, table_id, phone_number, customer_name,
+                          date, time_slot, end_time, duration_minutes, party_size
             """, (reservation_id,))
+            freed = cursor.fetchone()
+            
+            if not freed:
+                return False, "Reservation not found or already cancelled"
             
-            if cursor.rowcount > 0:
-                return True, "Reservation cancelled successfully"
-            return False, "Reservation not found or already cancelled"
+            self._append_event(cursor, "reservation_cancelled", "reservation", reservation_id, {
+                "reservation_id": reservation_id,
+                **dict(freed),
+                "status": "cancelled"
+            })
+            self._promote_from_waitlist(cursor, freed["restaurant_id"], freed["table_id"],
+                                        freed["date"], freed["time_slot"], freed["end_time"])
+            return True, "Reservation cancelled successfully"
+    
+    # Waitlist operations
+    def join_waitlist(self, restaurant_id: int, date: str, earliest_slot: str,
+                      latest_slot: str, party_size: int, phone_number: str,
+                      customer_name: str, auto_promote: bool = True) -> Tuple[Optional[Dict], str]:
+        """Wait for a table at any start time between earliest_slot and latest_slot.
+        
+        With auto_promote, a matching cancellation books the table directly;
+        otherwise the table is held for HOLD_TTL_SECONDS and the entry is
+        marked 'notified'.
+        """
+        is_valid, message = self.validate_booking_advance(date)
+        if not is_valid:
+            return None, message
+        if earliest_slot > latest_slot:
+            return None, "Earliest time must not be after latest time"
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO waitlist
+                (restaurant_id, date, earliest_slot, latest_slot, party_size,
+                 phone_number, customer_name, auto_promote)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING *
+            """, (restaurant_id, date, earliest_slot, latest_slot, party_size,
+                  phone_number, customer_name, int(auto_promote)))
+            entry = dict(cursor.fetchone())
+            self._append_event(cursor, "waitlist_joined", "waitlist", str(entry["id"]), entry)
+            return entry, "Added to waitlist"
+    
+    def leave_waitlist(self, waitlist_id: int) -> Tuple[bool, str]:
+        """Remove a waiting entry."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE waitlist SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'waiting'
+                RETURNING *
+            """, (waitlist_id,))
+            entry = cursor.fetchone()
+            if entry:
+                self._append_event(cursor, "waitlist_left", "waitlist", str(waitlist_id), dict(entry))
+                return True, "Removed from waitlist"
+            return False, "Waitlist entry not found or no longer waiting"
+    
+    def get_waitlist_entry(self, waitlist_id: int) -> Optional[Dict]:
+        """Get a waitlist entry, including its promotion outcome."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM waitlist WHERE id = ?", (waitlist_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def _promote_from_waitlist(self, cursor, restaurant_id: int, table_id: int,
+                               date: str, freed_start: str, freed_end: str) -> List[Dict]:
+        """Offer a freed table to waiting entries, inside the caller's transaction.
+        
+        Candidates come from idx_waitlist_match (restaurant, date, party size
+        that fits the table, window starting before the freed interval ends).
+        Larger parties are matched first to make the best use of the table,
+        then first come, first served.
+        """
+        cursor.execute("SELECT capacity FROM tables WHERE id = ?", (table_id,))
+        capacity = cursor.fetchone()[0]
+        
+        cursor.execute("""
+            SELECT * FROM waitlist
+            WHERE restaurant_id = ? AND date = ? AND status = 'waiting'
+            AND party_size <= ? AND earliest_slot < ?
+            ORDER BY party_size DESC, created_at ASC, id ASC
+        """, (restaurant_id, date, capacity, freed_end))
+        candidates = [dict(row) for row in cursor.fetchall()]
+        if not candidates:
+            return []
+        
+        table_busy = self._get_busy_masks(cursor, restaurant_id, date).get(table_id, 0)
+        promoted = []
+        
+        for entry in candidates:
+            duration = self._get_dining_duration(cursor, restaurant_id, entry["party_size"])
+            window = (1 << (duration // SLOT_MINUTES)) - 1
+            
+            # Earliest start in the entry's window where the table is free
+            start = None
+            for minutes in range(_to_minutes(entry["earliest_slot"]),
+                                 _to_minutes(entry["latest_slot"]) + 1, SLOT_MINUTES):
+                if not table_busy & (window << (minutes // SLOT_MINUTES)):
+                    start = minutes
+                    break
+            if start is None:
+                continue
+            
+            time_slot = _to_time_slot(start)
+            end_time = _to_time_slot(start + duration)
+            
+            if entry["auto_promote"]:
+                reservation_id = self._insert_reservation(
+                    cursor, restaurant_id, table_id, entry["phone_number"],
+                    entry["customer_name"], date, time_slot, end_time,
+                    duration, entry["party_size"]
+                )
+                cursor.execute("""
+                    UPDATE waitlist
+                    SET status = 'promoted', reservation_id = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    RETURNING *
+                """, (reservation_id, entry["id"]))
+                self._append_event(cursor, "waitlist_promoted", "waitlist", str(entry["id"]), {
+                    **dict(cursor.fetchone()),
+                    "waitlist_id": entry["id"]
+                })
+            else:
+                hold = self._insert_hold(
+                    cursor, restaurant_id, table_id, date, time_slot, end_time,
+                    entry["party_size"], entry["phone_number"],
+                    datetime.now().timestamp() + HOLD_TTL_SECONDS
+                )
+                cursor.execute("""
+                    UPDATE waitlist
+                    SET status = 'notified', hold_id = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    RETURNING *
+                """, (hold["hold_id"], entry["id"]))
+                self._append_event(cursor, "waitlist_notified", "waitlist", str(entry["id"]), {
+                    **dict(cursor.fetchone()),
+                    "waitlist_id": entry["id"],
+                    "table_id": table_id,
+                    "time_slot": time_slot,
+                    "expires_at": hold["expires_at"]
+                })
+            
+            table_busy |= window << (start // SLOT_MINUTES)
+            promoted.append(entry)
+        
+        return promoted
+    
+    # Change-data-capture event log
+    def _append_event(self, cursor, event_type: str, entity_type: str,
+                      entity_id: str, payload: Dict):
+        """Append to reservation_events inside the caller's transaction.
+        
+        Every write to users, reservations or waitlist must append an event
+        carrying the row it changed: replicas and incremental exports only
+        see changes through this log, and compaction keeps just the latest
+        event per row.
+        """
+        cursor.execute("""
+            INSERT INTO reservation_events (event_type, entity_type, entity_id, payload)
+            VALUES (?, ?, ?, ?)
+        """, (event_type, entity_type, entity_id, json.dumps(payload)))
+    
+    def read_events(self, after_seq: int = 0, limit: int = 500,
+                    event_types: Optional[List[str]] = None) -> List[Dict]:
+        """Read events with seq > after_seq, oldest first.
+        
+        Consumers store the last seq they processed and pass it back to
+        resume; this is a range scan on the primary key.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = "SELECT * FROM reservation_events WHERE seq > ?"
+            params = [after_seq]
+            
+            if event_types:
+                query += f" AND event_type IN ({','.join('?' * len(event_types))})"
+                params.extend(event_types)
+            
+            query += " ORDER BY seq LIMIT ?"
+            params.append(limit)
+            
+            cursor.execute(query, params)
+            events = []
+            for row in cursor.fetchall():
+                event = dict(row)
+                event["payload"] = json.loads(event["payload"])
+                events.append(event)
+            return events
+    
+    def get_latest_event_seq(self) -> int:
+        """Get the seq of the newest event (0 if the log is empty)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(seq) FROM reservation_events")
+            return cursor.fetchone()[0] or 0
+    
+    def compact_events(self, before_seq: Optional[int] = None) -> int:
+        """Drop events superseded by a later event for the same entity.
+        
+        Only events with seq < before_seq (default: the whole log) are
+        considered, so recent history stays intact for slow consumers. The
+        latest event for every entity is always kept, and seq numbers are
+        never reused. Returns the number of events removed.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if before_seq is None:
+                cursor.execute("SELECT IFNULL(MAX(seq), 0) + 1 FROM reservation_events")
+                before_seq = cursor.fetchone()[0]
+            
+            cursor.execute("""
+                DELETE FROM reservation_events
+                WHERE seq < ? AND seq < (
+                    SELECT MAX(e.seq) FROM reservation_events e
+                    WHERE e.entity_type = reservation_events.entity_type
+                    AND e.entity_id = reservation_events.entity_id
+                )
+            """, (before_seq,))
+            return cursor.rowcount
     
     # Helper functions
     def get_current_datetime(self) -> datetime:
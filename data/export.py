@@ -0,0 +1,177 @@
+"""Streaming columnar export of Table Turner data for offline analytics."""
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from data.database import TableTurnerDB
+
+# Rows per fetchmany() batch; also the Parquet row group / .npz chunk size
+EXPORT_CHUNK_ROWS = 50_000
+
+EXPORT_TABLES = ("restaurants", "users", "reservations")
+
+STATE_FILE = "_export_state.json"
+
+
+def _iter_batches(cursor: sqlite3.Cursor, size: int) -> Iterator[List[Tuple]]:
+    """Yield fetchmany() batches until the cursor is exhausted."""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+class ColumnarExporter:
+    """Exports restaurants, users and reservations to Parquet (or .npz).
+    
+    Rows are streamed in fixed-size batches, so memory stays bounded by
+    chunk_rows regardless of table size. The export runs on a read-only
+    connection inside one read transaction: in WAL mode that is a
+    consistent snapshot which never holds the write lock.
+    
+    Incremental runs use the reservation_events log: only users and
+    reservations touched by events after the previous run's seq are
+    exported, so an updated row (a new reservation count, a changed name)
+    is written again and readers keep the latest row per key. Rows
+    changed without an event, e.g. by hand in sqlite3, need a full
+    export (incremental=False). Restaurants are small and always exported
+    in full.
+    """
+    
+    def __init__(self, database: TableTurnerDB, out_dir: str,
+                 chunk_rows: int = EXPORT_CHUNK_ROWS, file_format: Optional[str] = None):
+        if file_format is None:
+            file_format = "parquet" if pa is not None else "npz"
+        if file_format == "parquet" and pa is None:
+            raise ImportError("pyarrow is required for Parquet export")
+        if file_format == "npz" and np is None:
+            raise ImportError("numpy is required for .npz export")
+        
+        self.database = database
+        self.out_dir = out_dir
+        self.chunk_rows = chunk_rows
+        self.file_format = file_format
+        os.makedirs(out_dir, exist_ok=True)
+    
+    def _load_state(self) -> Dict:
+        path = os.path.join(self.out_dir, STATE_FILE)
+        if not os.path.exists(path):
+            return {"last_seq": None, "runs": 0}
+        with open(path) as f:
+            return json.load(f)
+    
+    def _save_state(self, state: Dict):
+        path = os.path.join(self.out_dir, STATE_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+    
+    def export(self, incremental: bool = True) -> Dict:
+        """Export all tables. Returns per-table row counts and timing."""
+        started = time.perf_counter()
+        state = self._load_state()
+        since_seq = state["last_seq"] if incremental else None
+        run = state["runs"] + 1
+        
+        conn = sqlite3.connect(f"file:{self.database.db_path}?mode=ro", uri=True,
+                               isolation_level=None)
+        try:
+            conn.execute("BEGIN")
+            high_seq = conn.execute(
+                "SELECT IFNULL(MAX(seq), 0) FROM reservation_events"
+            ).fetchone()[0]
+            
+            counts = {}
+            for table in EXPORT_TABLES:
+                query, params = self._build_query(table, since_seq, high_seq)
+                counts[table] = self._export_query(conn, table, query, params, run)
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        
+        self._save_state({"last_seq": high_seq, "runs": run})
+        return {
+            "run": run,
+            "format": self.file_format,
+            "incremental": since_seq is not None,
+            "rows": counts,
+            "duration_seconds": time.perf_counter() - started
+        }
+    
+    def _build_query(self, table: str, since_seq: Optional[int],
+                     high_seq: int) -> Tuple[str, List]:
+        """Full-table query, or only rows with events in (since_seq, high_seq]."""
+        if since_seq is None or table == "restaurants":
+            return f"SELECT * FROM {table}", []
+        
+        key = {"users": ("user", "phone_number"),
+               "reservations": ("reservation", "reservation_id")}[table]
+        return f"""
+            SELECT * FROM {table} WHERE {key[1]} IN (
+                SELECT entity_id FROM reservation_events
+                WHERE entity_type = ? AND seq > ? AND seq <= ?
+            )
+        """, [key[0], since_seq, high_seq]
+    
+    def _export_query(self, conn: sqlite3.Connection, table: str, query: str,
+                      params: List, run: int) -> int:
+        """Stream one query to disk. Returns the number of rows written."""
+        declared = {row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+        cursor = conn.execute(query, params)
+        columns = [d[0] for d in cursor.description]
+        batches = _iter_batches(cursor, self.chunk_rows)
+        
+        if self.file_format == "parquet":
+            return self._write_parquet(table, run, columns, declared, batches)
+        return self._write_npz(table, run, columns, declared, batches)
+    
+    def _write_parquet(self, table: str, run: int, columns: List[str],
+                       declared: Dict[str, str], batches: Iterator[List[Tuple]]) -> int:
+        """One Parquet file per table per run; one row group per batch."""
+        arrow_types = {"INTEGER": pa.int64(), "BOOLEAN": pa.int64(), "REAL": pa.float64()}
+        schema = pa.schema([(c, arrow_types.get(declared.get(c, ""), pa.string())) for c in columns])
+        path = os.path.join(self.out_dir, f"{table}-{run:05d}.parquet")
+        
+        rows_written = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in batches:
+                arrays = [pa.array(values, type=field.type)
+                          for values, field in zip(zip(*rows), schema)]
+                writer.write_batch(pa.record_batch(arrays, schema=schema))
+                rows_written += len(rows)
+        return rows_written
+    
+    def _write_npz(self, table: str, run: int, columns: List[str],
+                   declared: Dict[str, str], batches: Iterator[List[Tuple]]) -> int:
+        """One .npz file per batch (npz files cannot be appended to)."""
+        rows_written = 0
+        for chunk, rows in enumerate(batches):
+            arrays = {}
+            for name, values in zip(columns, zip(*rows)):
+                kind = declared.get(name, "")
+                if kind in ("INTEGER", "BOOLEAN") and None not in values:
+                    arrays[name] = np.array(values, dtype=np.int64)
+                elif kind in ("INTEGER", "BOOLEAN", "REAL"):
+                    arrays[name] = np.array([np.nan if v is None else v for v in values],
+                                            dtype=np.float64)
+                else:
+                    arrays[name] = np.array(["" if v is None else str(v) for v in values])
+            path = os.path.join(self.out_dir, f"{table}-{run:05d}-{chunk:05d}.npz")
+            np.savez(path, **arrays)
+            rows_written += len(rows)
+        return rows_written
@@ -0,0 +1,146 @@
+"""Grid-bucketed spatial index for proximity search over restaurants."""
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Cells are sized so each holds about this many restaurants on average,
+# which keeps k-nearest work constant as the catalog grows
+TARGET_PER_CELL = 4
+MIN_CELL_KM = 0.05
+
+# Neighbourhood centroids, used to resolve "near <area>" requests
+NEIGHBOURHOOD_COORDINATES = {
+    "Koramangala": (12.9352, 77.6245),
+    "Indiranagar": (12.9784, 77.6408),
+    "Whitefield": (12.9698, 77.7500),
+    "HSR Layout": (12.9116, 77.6389),
+    "MG Road": (12.9756, 77.6066),
+    "Brigade Road": (12.9719, 77.6070),
+    "Commercial Street": (12.9822, 77.6083),
+    "UB City": (12.9716, 77.5960),
+    "Lavelle Road": (12.9700, 77.5980),
+    "Residency Road": (12.9667, 77.6030),
+    "Jayanagar": (12.9250, 77.5938),
+    "Marathahalli": (12.9569, 77.7011),
+    "Electronic City": (12.8399, 77.6770),
+}
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def resolve_location(name: str) -> Optional[Tuple[float, float]]:
+    """Coordinates of a known neighbourhood (case-insensitive), or None."""
+    name = (name or "").strip().lower()
+    for neighbourhood, coordinates in NEIGHBOURHOOD_COORDINATES.items():
+        if neighbourhood.lower() == name:
+            return coordinates
+    return None
+
+
+class GeoIndex:
+    """Uniform latitude/longitude grid over restaurants with coordinates.
+    
+    Each cell holds the restaurants inside it. Radius queries scan the
+    cells covering the circle's bounding box; k-nearest queries scan rings
+    of cells outward from the query point and stop once the k-th best
+    distance is closer than any unscanned ring. Unless cell_km is given,
+    the cell edge shrinks with catalog density (TARGET_PER_CELL per cell).
+    Restaurants without coordinates are skipped.
+    """
+    
+    def __init__(self, restaurants: List[Dict], cell_km: Optional[float] = None):
+        located = [r for r in restaurants if r.get("latitude") is not None and r.get("longitude") is not None]
+        mean_latitude = sum(r["latitude"] for r in located) / len(located) if located else 0.0
+        
+        if cell_km is None:
+            cell_km = MIN_CELL_KM
+            if located:
+                lat_span = (max(r["latitude"] for r in located) - min(r["latitude"] for r in located)) * KM_PER_DEGREE
+                lng_span = (max(r["longitude"] for r in located) - min(r["longitude"] for r in located)) \
+                    * KM_PER_DEGREE * math.cos(math.radians(mean_latitude))
+                cell_km = max(MIN_CELL_KM, math.sqrt(lat_span * lng_span * TARGET_PER_CELL / len(located)))
+        
+        self.cell_km = cell_km
+        self.cell_lat = cell_km / KM_PER_DEGREE
+        self.cell_lng = cell_km / (KM_PER_DEGREE * math.cos(math.radians(mean_latitude)))
+        self.cells = {}
+        for restaurant in located:
+            self.cells.setdefault(self._cell(restaurant["latitude"], restaurant["longitude"]), []).append(restaurant)
+        
+        rows = [row for row, _ in self.cells] or [0]
+        cols = [col for _, col in self.cells] or [0]
+        self._bounds = (min(rows), max(rows), min(cols), max(cols))
+    
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.cell_lat), math.floor(longitude / self.cell_lng)
+    
+    def _ring_floor_km(self, latitude: float) -> float:
+        """Lower bound on the distance covered by each ring of cells at this latitude."""
+        return min(self.cell_lat, self.cell_lng * math.cos(math.radians(latitude))) * KM_PER_DEGREE
+    
+    def within(self, latitude: float, longitude: float, radius_km: float,
+               predicate: Optional[Callable[[Dict], bool]] = None) -> List[Tuple[float, Dict]]:
+        """(distance_km, restaurant) pairs within radius_km, nearest first."""
+        reach = math.ceil(radius_km / self._ring_floor_km(latitude))
+        row, col = self._cell(latitude, longitude)
+        
+        results = []
+        for r in range(row - reach, row + reach + 1):
+            for c in range(col - reach, col + reach + 1):
+                for restaurant in self.cells.get((r, c), ()):
+                    if predicate and not predicate(restaurant):
+                        continue
+                    distance = haversine_km(latitude, longitude, restaurant["latitude"], restaurant["longitude"])
+                    if distance <= radius_km:
+                        results.append((distance, restaurant))
+        
+        results.sort(key=lambda pair: pair[0])
+        return results
+    
+    def nearest(self, latitude: float, longitude: float, k: int = 5,
+                predicate: Optional[Callable[[Dict], bool]] = None,
+                max_km: Optional[float] = None) -> List[Tuple[float, Dict]]:
+        """Up to k (distance_km, restaurant) pairs closest to the point, nearest first."""
+        if not self.cells or k <= 0:
+            return []
+        
+        row, col = self._cell(latitude, longitude)
+        ring_km = self._ring_floor_km(latitude)
+        min_row, max_row, min_col, max_col = self._bounds
+        last_ring = max(row - min_row, max_row - row, col - min_col, max_col - col)
+        
+        best = []  # max-heap of (-distance, id, restaurant)
+        for ring in range(last_ring + 1):
+            # Cells in this ring and beyond are at least (ring - 1) cells away
+            floor_km = (ring - 1) * ring_km
+            if len(best) == k and -best[0][0] <= floor_km:
+                break
+            if max_km is not None and floor_km > max_km:
+                break
+            
+            for r in range(row - ring, row + ring + 1):
+                step = 1 if abs(r - row) == ring else 2 * ring
+                for c in range(col - ring, col + ring + 1, step or 1):
+                    for restaurant in self.cells.get((r, c), ()):
+                        if predicate and not predicate(restaurant):
+                            continue
+                        distance = haversine_km(latitude, longitude, restaurant["latitude"], restaurant["longitude"])
+                        if max_km is not None and distance > max_km:
+                            continue
+                        entry = (-distance, restaurant["id"], restaurant)
+                        if len(best) < k:
+                            heapq.heappush(best, entry)
+                        elif entry > best[0]:
+                            heapq.heapreplace(best, entry)
+        
+        return [(-negative, restaurant) for negative, _, restaurant in sorted(best, reverse=True)]
@@ -0,0 +1,189 @@
+"""Append-only operation journal with periodic snapshots for the in-memory stores."""
+import gc
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.log"
+
+# always:   flush + fsync every operation (survives power loss)
+# interval: flush every operation, fsync at most every FSYNC_INTERVAL_SECONDS
+#           (survives a process crash; an OS crash can lose the last interval)
+# never:    buffered writes, flushed on snapshot and close (fastest)
+FSYNC_POLICIES = ("always", "interval", "never")
+FSYNC_INTERVAL_SECONDS = 1.0
+
+# Operations between automatic snapshots
+SNAPSHOT_EVERY = 100_000
+
+# Journal bytes parsed per json.loads call during recovery
+REPLAY_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def to_rows(records: List[Dict]) -> Dict:
+    """Columnar form of uniform dicts for snapshots: field names once, then value rows."""
+    fields = list(records[0]) if records else []
+    return {"fields": fields, "rows": [[record[field] for field in fields] for record in records]}
+
+
+def from_rows(table: Dict) -> List[Dict]:
+    """Inverse of to_rows."""
+    fields = table["fields"]
+    return [dict(zip(fields, row)) for row in table["rows"]]
+
+
+class Journal:
+    """Write-ahead journal of store operations plus compact snapshots.
+    
+    Each operation is one JSON line `[seq, op, payload]`. A snapshot stores
+    the full state with the seq it covers and then starts a fresh journal;
+    recovery loads the snapshot and replays journal lines with a higher seq,
+    so a crash between the two steps is harmless. Automatic snapshots are
+    taken at the start of an append, once the caller has applied every
+    operation journaled so far.
+    """
+    
+    def __init__(self, directory: str, snapshot_state: Callable[[], Dict],
+                 fsync: str = "interval", fsync_interval: float = FSYNC_INTERVAL_SECONDS,
+                 snapshot_every: int = SNAPSHOT_EVERY):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        
+        self.directory = directory
+        self.snapshot_state = snapshot_state
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.ops_since_snapshot = 0
+        self._last_fsync = time.monotonic()
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+    
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_FILE)
+    
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.directory, JOURNAL_FILE)
+    
+    def recover(self, restore: Callable[[Dict], None], apply: Callable[[str, Dict], None]) -> int:
+        """Rebuild state: restore(snapshot_state), then apply(op, payload) per newer entry.
+        
+        A torn tail (crash mid-write) is truncated away. The garbage
+        collector is paused while millions of small objects are created.
+        Opens the journal for appending and returns the operations replayed.
+        """
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                self.seq = snapshot["seq"]
+                restore(snapshot["state"])
+            
+            replayed = 0
+            for seq, op, payload in self._read_journal():
+                if seq > self.seq:
+                    apply(op, payload)
+                    self.seq = seq
+                    replayed += 1
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        
+        self.ops_since_snapshot = replayed
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        return replayed
+    
+    def _read_journal(self) -> Iterator[List]:
+        """Yield journal entries, truncating the file after the last intact line.
+        
+        Lines are parsed a chunk at a time as one JSON array, falling back
+        to line by line only for the chunk that holds a torn write.
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb+") as f:
+            valid_bytes = 0
+            pending = b""
+            while True:
+                chunk = f.read(REPLAY_CHUNK_BYTES)
+                data = pending + chunk
+                end = data.rfind(b"\n") + 1
+                pending = data[end:]
+                lines = data[:end]
+                
+                try:
+                    entries = json.loads(b"[" + lines[:-1].replace(b"\n", b",") + b"]") if lines else []
+                except ValueError:
+                    entries = None
+                
+                if entries is not None:
+                    yield from entries
+                    valid_bytes += len(lines)
+                else:
+                    for line in lines[:-1].split(b"\n"):
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            f.truncate(valid_bytes)
+                            return
+                        valid_bytes += len(line) + 1
+                        yield entry
+                
+                if not chunk:
+                    break
+            
+            if pending:
+                f.truncate(valid_bytes)
+    
+    def append(self, op: str, payload: Dict):
+        """Journal one operation, honoring the fsync policy."""
+        if self.ops_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        
+        self.seq += 1
+        self._file.write(json.dumps([self.seq, op, payload], separators=(",", ":")) + "\n")
+        
+        if self.fsync != "never":
+            self._file.flush()
+            now = time.monotonic()
+            if self.fsync == "always" or now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+        
+        self.ops_since_snapshot += 1
+    
+    def snapshot(self):
+        """Write the full state atomically, then start an empty journal."""
+        tmp_path = self.snapshot_path + ".tmp"
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # dumps runs entirely in the C encoder; dump would stream through Python
+            encoded = json.dumps({"seq": self.seq, "state": self.snapshot_state()}, separators=(",", ":"))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        
+        self._file.close()
+        self._file = open(self.journal_path, "w", encoding="utf-8")
+        self.ops_since_snapshot = 0
+    
+    def close(self):
+        """Flush and fsync pending writes."""
+        if self._file and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
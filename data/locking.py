@@ -0,0 +1,49 @@
+"""Lock striping and atomic counters for the thread-safe in-memory stores."""
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Hashable, Iterator
+
+# Locks per store; (restaurant, date) keys hash onto these
+DEFAULT_STRIPES = 64
+
+
+class LockStripes:
+    """Fixed pool of locks selected by key hash.
+    
+    Work on keys that land on different stripes runs concurrently; work on
+    the same key is serialized. Memory stays constant however many keys
+    exist, at the cost of occasional false sharing between keys.
+    """
+    
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+    
+    def _index(self, key: Hashable) -> int:
+        return hash(key) % len(self._locks)
+    
+    def lock(self, key: Hashable) -> threading.Lock:
+        """The lock guarding key."""
+        return self._locks[self._index(key)]
+    
+    @contextmanager
+    def holding(self, *keys: Hashable) -> Iterator[None]:
+        """Hold the stripes for all keys, acquired in a fixed order to avoid deadlock."""
+        with ExitStack() as stack:
+            for index in sorted({self._index(key) for key in keys}):
+                stack.enter_context(self._locks[index])
+            yield
+
+
+class AtomicCounter:
+    """Thread-safe monotonically increasing id generator."""
+    
+    def __init__(self, start: int = 0):
+        self.value = start
+        self._lock = threading.Lock()
+    
+    def next(self) -> int:
+        """Return the current value and advance past it."""
+        with self._lock:
+            value = self.value
+            self.value += 1
+            return value
@@ -1,178 +1,315 @@
 """Restaurant database with diverse locations and cuisines."""
 import json
 import random
+import threading
 from datetime import datetime, timedelta
 
+from data.catalog import CatalogIndex, RecommendationEngine
+from data.geo import GeoIndex, resolve_location
+from data.journal import Journal, from_rows, to_rows
+from data.locking import AtomicCounter, LockStripes
+
 # Restaurant data
 RESTAURANTS = [
     # Indian Cuisine
-    {"id": 1, "name": "Spice Garden", "cuisine": "Indian", "location": "Koramangala", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.5, "specialties": ["Biryani", "Tandoori", "North Indian"]},
-    {"id": 2, "name": "Curry House", "cuisine": "Indian", "location": "Indiranagar", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.3, "specialties": ["South Indian", "Dosa", "Idli"]},
-    {"id": 3, "name": "Maharaja Palace", "cuisine": "Indian", "location": "MG Road", "city": "Bangalore", "capacity": 80, "price_range": "$$$", "rating": 4.7, "specialties": ["Royal Thali", "Mughlai", "Fine Dining"]},
-    {"id": 4, "name": "Namaste Cafe", "cuisine": "Indian", "location": "Whitefield", "city": "Bangalore", "capacity": 35, "price_range": "$", "rating": 4.1, "specialties": ["Street Food", "Chaat", "Snacks"]},
-    {"id": 5, "name": "The Tandoor", "cuisine": "Indian", "location": "HSR Layout", "city": "Bangalore", "capacity": 60, "price_range": "$$", "rating": 4.4, "specialties": ["Kebabs", "Tikka", "Naan"]},
+    {"id": 1, "name": "Spice Garden", "cuisine": "Indian", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9388, "longitude": 77.6251, "capacity": 50, "price_range": "$$", "rating": 4.5, "specialties": ["Biryani", "Tandoori", "North Indian"]},
+    {"id": 2, "name": "Curry House", "cuisine": "Indian", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.979, "longitude": 77.6354, "capacity": 40, "price_range": "$$", "rating": 4.3, "specialties": ["South Indian", "Dosa", "Idli"]},
+    {"id": 3, "name": "Maharaja Palace", "cuisine": "Indian", "location": "MG Road", "city": "Bangalore", "latitude": 12.9732, "longitude": 77.6078, "capacity": 80, "price_range": "$$$", "rating": 4.7, "specialties": ["Royal Thali", "Mughlai", "Fine Dining"]},
+    {"id": 4, "name": "Namaste Cafe", "cuisine": "Indian", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9644, "longitude": 77.7452, "capacity": 35, "price_range": "$", "rating": 4.1, "specialties": ["Street Food", "Chaat", "Snacks"]},
+    {"id": 5, "name": "The Tandoor", "cuisine": "Indian", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9158, "longitude": 77.6407, "capacity": 60, "price_range": "$$", "rating": 4.4, "specialties": ["Kebabs", "Tikka", "Naan"]},
     
     # Italian Cuisine
-    {"id": 6, "name": "Bella Italia", "cuisine": "Italian", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$$", "rating": 4.6, "specialties": ["Pizza", "Pasta", "Risotto"]},
-    {"id": 7, "name": "Luigi's Kitchen", "cuisine": "Italian", "location": "Brigade Road", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.2, "specialties": ["Lasagna", "Carbonara", "Tiramisu"]},
-    {"id": 8, "name": "Roma Trattoria", "cuisine": "Italian", "location": "UB City", "city": "Bangalore", "capacity": 70, "price_range": "$$$$", "rating": 4.8, "specialties": ["Fine Dining", "Wine Selection", "Authentic Italian"]},
-    {"id": 9, "name": "Pasta Paradise", "cuisine": "Italian", "location": "Jayanagar", "city": "Bangalore", "capacity": 30, "price_range": "$$", "rating": 4.0, "specialties": ["Fresh Pasta", "Handmade", "Family Style"]},
-    {"id": 10, "name": "Venice Bistro", "cuisine": "Italian", "location": "Marathahalli", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.3, "specialties": ["Seafood Pasta", "Gelato", "Italian Desserts"]},
+    {"id": 6, "name": "Bella Italia", "cuisine": "Italian", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9364, "longitude": 77.6203, "capacity": 45, "price_range": "$$$", "rating": 4.6, "specialties": ["Pizza", "Pasta", "Risotto"]},
+    {"id": 7, "name": "Luigi's Kitchen", "cuisine": "Italian", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9701, "longitude": 77.6094, "capacity": 55, "price_range": "$$", "rating": 4.2, "specialties": ["Lasagna", "Carbonara", "Tiramisu"]},
+    {"id": 8, "name": "Roma Trattoria", "cuisine": "Italian", "location": "UB City", "city": "Bangalore", "latitude": 12.9668, "longitude": 77.5924, "capacity": 70, "price_range": "$$$$", "rating": 4.8, "specialties": ["Fine Dining", "Wine Selection", "Authentic Italian"]},
+    {"id": 9, "name": "Pasta Paradise", "cuisine": "Italian", "location": "Jayanagar", "city": "Bangalore", "latitude": 12.9298, "longitude": 77.5968, "capacity": 30, "price_range": "$$", "rating": 4.0, "specialties": ["Fresh Pasta", "Handmade", "Family Style"]},
+    {"id": 10, "name": "Venice Bistro", "cuisine": "Italian", "location": "Marathahalli", "city": "Bangalore", "latitude": 12.9587, "longitude": 77.6981, "capacity": 40, "price_range": "$$", "rating": 4.3, "specialties": ["Seafood Pasta", "Gelato", "Italian Desserts"]},
     
     # Chinese Cuisine
-    {"id": 11, "name": "Dragon Wok", "cuisine": "Chinese", "location": "Koramangala", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.4, "specialties": ["Dim Sum", "Szechuan", "Noodles"]},
-    {"id": 12, "name": "Golden Chopsticks", "cuisine": "Chinese", "location": "Commercial Street", "city": "Bangalore", "capacity": 45, "price_range": "$", "rating": 4.1, "specialties": ["Fried Rice", "Manchurian", "Hakka"]},
-    {"id": 13, "name": "Beijing Dynasty", "cuisine": "Chinese", "location": "Residency Road", "city": "Bangalore", "capacity": 65, "price_range": "$$$", "rating": 4.5, "specialties": ["Peking Duck", "Hotpot", "Authentic Chinese"]},
-    {"id": 14, "name": "Wok Express", "cuisine": "Chinese", "location": "Electronic City", "city": "Bangalore", "capacity": 35, "price_range": "$", "rating": 3.9, "specialties": ["Quick Service", "Combo Meals", "Takeaway"]},
-    {"id": 15, "name": "Shanghai Nights", "cuisine": "Chinese", "location": "Lavelle Road", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.3, "specialties": ["Soup Dumplings", "Stir Fry", "Bubble Tea"]},
+    {"id": 11, "name": "Dragon Wok", "cuisine": "Chinese", "location": "Koramangala", "city": "Bangalore", "latitude": 12.934, "longitude": 77.6281, "capacity": 50, "price_range": "$$", "rating": 4.4, "specialties": ["Dim Sum", "Szechuan", "Noodles"]},
+    {"id": 12, "name": "Golden Chopsticks", "cuisine": "Chinese", "location": "Commercial Street", "city": "Bangalore", "latitude": 12.978, "longitude": 77.6059, "capacity": 45, "price_range": "$", "rating": 4.1, "specialties": ["Fried Rice", "Manchurian", "Hakka"]},
+    {"id": 13, "name": "Beijing Dynasty", "cuisine": "Chinese", "location": "Residency Road", "city": "Bangalore", "latitude": 12.9721, "longitude": 77.6072, "capacity": 65, "price_range": "$$$", "rating": 4.5, "specialties": ["Peking Duck", "Hotpot", "Authentic Chinese"]},
+    {"id": 14, "name": "Wok Express", "cuisine": "Chinese", "location": "Electronic City", "city": "Bangalore", "latitude": 12.8423, "longitude": 77.6752, "capacity": 35, "price_range": "$", "rating": 3.9, "specialties": ["Quick Service", "Combo Meals", "Takeaway"]},
+    {"id": 15, "name": "Shanghai Nights", "cuisine": "Chinese", "location": "Lavelle Road", "city": "Bangalore", "latitude": 12.9694, "longitude": 77.6028, "capacity": 55, "price_range": "$$", "rating": 4.3, "specialties": ["Soup Dumplings", "Stir Fry", "Bubble Tea"]},
     
     # Continental
-    {"id": 16, "name": "The Continental", "cuisine": "Continental", "location": "Indiranagar", "city": "Bangalore", "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Steaks", "Grills", "Fine Dining"]},
-    {"id": 17, "name": "Olive Garden", "cuisine": "Continental", "location": "Koramangala", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Salads", "Soups", "Mediterranean"]},
-    {"id": 18, "name": "Bistro 42", "cuisine": "Continental", "location": "MG Road", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.4, "specialties": ["French Toast", "Omelettes", "Brunch"]},
-    {"id": 19, "name": "The Grill House", "cuisine": "Continental", "location": "Whitefield", "city": "Bangalore", "capacity": 70, "price_range": "$$$", "rating": 4.5, "specialties": ["BBQ", "Ribs", "Burgers"]},
-    {"id": 20, "name": "European Delights", "cuisine": "Continental", "location": "HSR Layout", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.1, "specialties": ["European Mix", "Wine", "Cheese Platters"]},
+    {"id": 16, "name": "The Continental", "cuisine": "Continental", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9748, "longitude": 77.6396, "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Steaks", "Grills", "Fine Dining"]},
+    {"id": 17, "name": "Olive Garden", "cuisine": "Continental", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9412, "longitude": 77.6299, "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Salads", "Soups", "Mediterranean"]},
+    {"id": 18, "name": "Bistro 42", "cuisine": "Continental", "location": "MG Road", "city": "Bangalore", "latitude": 12.9786, "longitude": 77.606, "capacity": 40, "price_range": "$$", "rating": 4.4, "specialties": ["French Toast", "Omelettes", "Brunch"]},
+    {"id": 19, "name": "The Grill House", "cuisine": "Continental", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9698, "longitude": 77.756, "capacity": 70, "price_range": "$$$", "rating": 4.5, "specialties": ["BBQ", "Ribs", "Burgers"]},
+    {"id": 20, "name": "European Delights", "cuisine": "Continental", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9086, "longitude": 77.6389, "capacity": 45, "price_range": "$$", "rating": 4.1, "specialties": ["European Mix", "Wine", "Cheese Platters"]},
     
     # Mexican
-    {"id": 21, "name": "Taco Fiesta", "cuisine": "Mexican", "location": "Koramangala", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.3, "specialties": ["Tacos", "Burritos", "Nachos"]},
-    {"id": 22, "name": "Chili's Cantina", "cuisine": "Mexican", "location": "Brigade Road", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.4, "specialties": ["Fajitas", "Quesadillas", "Margaritas"]},
-    {"id": 23, "name": "Casa Mexicana", "cuisine": "Mexican", "location": "Indiranagar", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Enchiladas", "Chimichangas", "Guacamole"]},
-    {"id": 24, "name": "Burrito Bowl", "cuisine": "Mexican", "location": "Electronic City", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.0, "specialties": ["Build Your Bowl", "Quick Service", "Fresh Ingredients"]},
-    {"id": 25, "name": "Aztec Kitchen", "cuisine": "Mexican", "location": "Whitefield", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Authentic Mexican", "Mole", "Churros"]},
+    {"id": 21, "name": "Taco Fiesta", "cuisine": "Mexican", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9292, "longitude": 77.6185, "capacity": 40, "price_range": "$$", "rating": 4.3, "specialties": ["Tacos", "Burritos", "Nachos"]},
+    {"id": 22, "name": "Chili's Cantina", "cuisine": "Mexican", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9755, "longitude": 77.6076, "capacity": 55, "price_range": "$$", "rating": 4.4, "specialties": ["Fajitas", "Quesadillas", "Margaritas"]},
+    {"id": 23, "name": "Casa Mexicana", "cuisine": "Mexican", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.979, "longitude": 77.6354, "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Enchiladas", "Chimichangas", "Guacamole"]},
+    {"id": 24, "name": "Burrito Bowl", "cuisine": "Mexican", "location": "Electronic City", "city": "Bangalore", "latitude": 12.8375, "longitude": 77.6782, "capacity": 30, "price_range": "$", "rating": 4.0, "specialties": ["Build Your Bowl", "Quick Service", "Fresh Ingredients"]},
+    {"id": 25, "name": "Aztec Kitchen", "cuisine": "Mexican", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9644, "longitude": 77.7452, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Authentic Mexican", "Mole", "Churros"]},
     
     # Japanese
-    {"id": 26, "name": "Sakura Sushi", "cuisine": "Japanese", "location": "UB City", "city": "Bangalore", "capacity": 35, "price_range": "$$$", "rating": 4.7, "specialties": ["Sushi", "Sashimi", "Rolls"]},
-    {"id": 27, "name": "Tokyo Kitchen", "cuisine": "Japanese", "location": "Koramangala", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.4, "specialties": ["Ramen", "Udon", "Tempura"]},
-    {"id": 28, "name": "Wasabi House", "cuisine": "Japanese", "location": "MG Road", "city": "Bangalore", "capacity": 45, "price_range": "$$$", "rating": 4.5, "specialties": ["Teppanyaki", "Bento Box", "Sake"]},
-    {"id": 29, "name": "Zen Garden", "cuisine": "Japanese", "location": "Indiranagar", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Donburi", "Gyoza", "Japanese Curry"]},
-    {"id": 30, "name": "Miso Bowl", "cuisine": "Japanese", "location": "HSR Layout", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.1, "specialties": ["Quick Bowls", "Healthy Options", "Miso Soup"]},
+    {"id": 26, "name": "Sakura Sushi", "cuisine": "Japanese", "location": "UB City", "city": "Bangalore", "latitude": 12.9758, "longitude": 77.5978, "capacity": 35, "price_range": "$$$", "rating": 4.7, "specialties": ["Sushi", "Sashimi", "Rolls"]},
+    {"id": 27, "name": "Tokyo Kitchen", "cuisine": "Japanese", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9364, "longitude": 77.6203, "capacity": 40, "price_range": "$$", "rating": 4.4, "specialties": ["Ramen", "Udon", "Tempura"]},
+    {"id": 28, "name": "Wasabi House", "cuisine": "Japanese", "location": "MG Road", "city": "Bangalore", "latitude": 12.9738, "longitude": 77.609, "capacity": 45, "price_range": "$$$", "rating": 4.5, "specialties": ["Teppanyaki", "Bento Box", "Sake"]},
+    {"id": 29, "name": "Zen Garden", "cuisine": "Japanese", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9736, "longitude": 77.6372, "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Donburi", "Gyoza", "Japanese Curry"]},
+    {"id": 30, "name": "Miso Bowl", "cuisine": "Japanese", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9164, "longitude": 77.6419, "capacity": 30, "price_range": "$", "rating": 4.1, "specialties": ["Quick Bowls", "Healthy Options", "Miso Soup"]},
     
     # Thai
-    {"id": 31, "name": "Thai Orchid", "cuisine": "Thai", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.4, "specialties": ["Pad Thai", "Green Curry", "Tom Yum"]},
-    {"id": 32, "name": "Bangkok Street", "cuisine": "Thai", "location": "Commercial Street", "city": "Bangalore", "capacity": 40, "price_range": "$", "rating": 4.2, "specialties": ["Street Food", "Spring Rolls", "Thai Tea"]},
-    {"id": 33, "name": "Siam Spice", "cuisine": "Thai", "location": "Whitefield", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.3, "specialties": ["Red Curry", "Massaman", "Papaya Salad"]},
-    {"id": 34, "name": "Lotus Thai", "cuisine": "Thai", "location": "Brigade Road", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.5, "specialties": ["Royal Thai", "Coconut Soup", "Thai BBQ"]},
-    {"id": 35, "name": "Chiang Mai Kitchen", "cuisine": "Thai", "location": "Indiranagar", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.1, "specialties": ["Northern Thai", "Sticky Rice", "Mango Sticky Rice"]},
+    {"id": 31, "name": "Thai Orchid", "cuisine": "Thai", "location": "Koramangala", "city": "Bangalore", "latitude": 12.937, "longitude": 77.6215, "capacity": 45, "price_range": "$$", "rating": 4.4, "specialties": ["Pad Thai", "Green Curry", "Tom Yum"]},
+    {"id": 32, "name": "Bangkok Street", "cuisine": "Thai", "location": "Commercial Street", "city": "Bangalore", "latitude": 12.981, "longitude": 77.6119, "capacity": 40, "price_range": "$", "rating": 4.2, "specialties": ["Street Food", "Spring Rolls", "Thai Tea"]},
+    {"id": 33, "name": "Siam Spice", "cuisine": "Thai", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9656, "longitude": 77.7476, "capacity": 50, "price_range": "$$", "rating": 4.3, "specialties": ["Red Curry", "Massaman", "Papaya Salad"]},
+    {"id": 34, "name": "Lotus Thai", "cuisine": "Thai", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9773, "longitude": 77.6112, "capacity": 55, "price_range": "$$", "rating": 4.5, "specialties": ["Royal Thai", "Coconut Soup", "Thai BBQ"]},
+    {"id": 35, "name": "Chiang Mai Kitchen", "cuisine": "Thai", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9808, "longitude": 77.639, "capacity": 35, "price_range": "$$", "rating": 4.1, "specialties": ["Northern Thai", "Sticky Rice", "Mango Sticky Rice"]},
     
     # Mediterranean
-    {"id": 36, "name": "Olive & Thyme", "cuisine": "Mediterranean", "location": "UB City", "city": "Bangalore", "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Greek", "Hummus", "Falafel"]},
-    {"id": 37, "name": "Santorini Grill", "cuisine": "Mediterranean", "location": "Koramangala", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.4, "specialties": ["Gyros", "Souvlaki", "Baklava"]},
-    {"id": 38, "name": "Lebanon Express", "cuisine": "Mediterranean", "location": "MG Road", "city": "Bangalore", "capacity": 40, "price_range": "$", "rating": 4.2, "specialties": ["Shawarma", "Tabbouleh", "Pita Bread"]},
-    {"id": 39, "name": "Mediterranean Breeze", "cuisine": "Mediterranean", "location": "Whitefield", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Seafood", "Mezze", "Fresh Herbs"]},
-    {"id": 40, "name": "Cyprus Kitchen", "cuisine": "Mediterranean", "location": "HSR Layout", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.0, "specialties": ["Halloumi", "Dolma", "Turkish Coffee"]},
+    {"id": 36, "name": "Olive & Thyme", "cuisine": "Mediterranean", "location": "UB City", "city": "Bangalore", "latitude": 12.971, "longitude": 77.6008, "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Greek", "Hummus", "Falafel"]},
+    {"id": 37, "name": "Santorini Grill", "cuisine": "Mediterranean", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9316, "longitude": 77.6233, "capacity": 50, "price_range": "$$", "rating": 4.4, "specialties": ["Gyros", "Souvlaki", "Baklava"]},
+    {"id": 38, "name": "Lebanon Express", "cuisine": "Mediterranean", "location": "MG Road", "city": "Bangalore", "latitude": 12.9816, "longitude": 77.612, "capacity": 40, "price_range": "$", "rating": 4.2, "specialties": ["Shawarma", "Tabbouleh", "Pita Bread"]},
+    {"id": 39, "name": "Mediterranean Breeze", "cuisine": "Mediterranean", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9728, "longitude": 77.7494, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Seafood", "Mezze", "Fresh Herbs"]},
+    {"id": 40, "name": "Cyprus Kitchen", "cuisine": "Mediterranean", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9116, "longitude": 77.6449, "capacity": 35, "price_range": "$$", "rating": 4.0, "specialties": ["Halloumi", "Dolma", "Turkish Coffee"]},
     
     # American
-    {"id": 41, "name": "All American Diner", "cuisine": "American", "location": "Brigade Road", "city": "Bangalore", "capacity": 60, "price_range": "$$", "rating": 4.3, "specialties": ["Burgers", "Fries", "Milkshakes"]},
-    {"id": 42, "name": "Brooklyn Burger", "cuisine": "American", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.4, "specialties": ["Gourmet Burgers", "Wings", "Craft Beer"]},
-    {"id": 43, "name": "Texas BBQ Pit", "cuisine": "American", "location": "Whitefield", "city": "Bangalore", "capacity": 70, "price_range": "$$$", "rating": 4.5, "specialties": ["Smoked Meats", "Brisket", "Pulled Pork"]},
-    {"id": 44, "name": "Manhattan Steakhouse", "cuisine": "American", "location": "UB City", "city": "Bangalore", "capacity": 80, "price_range": "$$$$", "rating": 4.7, "specialties": ["Premium Steaks", "Wine List", "Fine Dining"]},
-    {"id": 45, "name": "West Coast Grill", "cuisine": "American", "location": "Indiranagar", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.2, "specialties": ["Sandwiches", "Salads", "American Comfort Food"]},
+    {"id": 41, "name": "All American Diner", "cuisine": "American", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9689, "longitude": 77.607, "capacity": 60, "price_range": "$$", "rating": 4.3, "specialties": ["Burgers", "Fries", "Milkshakes"]},
+    {"id": 42, "name": "Brooklyn Burger", "cuisine": "American", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9292, "longitude": 77.6185, "capacity": 45, "price_range": "$$", "rating": 4.4, "specialties": ["Gourmet Burgers", "Wings", "Craft Beer"]},
+    {"id": 43, "name": "Texas BBQ Pit", "cuisine": "American", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9734, "longitude": 77.7506, "capacity": 70, "price_range": "$$$", "rating": 4.5, "specialties": ["Smoked Meats", "Brisket", "Pulled Pork"]},
+    {"id": 44, "name": "Manhattan Steakhouse", "cuisine": "American", "location": "UB City", "city": "Bangalore", "latitude": 12.9722, "longitude": 77.5906, "capacity": 80, "price_range": "$$$$", "rating": 4.7, "specialties": ["Premium Steaks", "Wine List", "Fine Dining"]},
+    {"id": 45, "name": "West Coast Grill", "cuisine": "American", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.976, "longitude": 77.642, "capacity": 55, "price_range": "$$", "rating": 4.2, "specialties": ["Sandwiches", "Salads", "American Comfort Food"]},
     
     # Korean
-    {"id": 46, "name": "Seoul Kitchen", "cuisine": "Korean", "location": "Koramangala", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.5, "specialties": ["BBQ", "Kimchi", "Bibimbap"]},
-    {"id": 47, "name": "K-Pop Kitchen", "cuisine": "Korean", "location": "Indiranagar", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.3, "specialties": ["Korean Fried Chicken", "Tteokbokki", "Bubble Tea"]},
-    {"id": 48, "name": "Gangnam Grill", "cuisine": "Korean", "location": "Whitefield", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.4, "specialties": ["Table BBQ", "Banchan", "Soju"]},
-    {"id": 49, "name": "Hanok House", "cuisine": "Korean", "location": "Brigade Road", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.2, "specialties": ["Hot Pot", "Japchae", "Korean Stew"]},
-    {"id": 50, "name": "Kimchi Corner", "cuisine": "Korean", "location": "HSR Layout", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.0, "specialties": ["Quick Bites", "Korean Street Food", "Kimbap"]},
+    {"id": 46, "name": "Seoul Kitchen", "cuisine": "Korean", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9298, "longitude": 77.6197, "capacity": 40, "price_range": "$$", "rating": 4.5, "specialties": ["BBQ", "Kimchi", "Bibimbap"]},
+    {"id": 47, "name": "K-Pop Kitchen", "cuisine": "Korean", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9826, "longitude": 77.6426, "capacity": 35, "price_range": "$$", "rating": 4.3, "specialties": ["Korean Fried Chicken", "Tteokbokki", "Bubble Tea"]},
+    {"id": 48, "name": "Gangnam Grill", "cuisine": "Korean", "location": "Whitefield", "city": "Bangalore", "latitude": 12.971, "longitude": 77.7458, "capacity": 50, "price_range": "$$", "rating": 4.4, "specialties": ["Table BBQ", "Banchan", "Soju"]},
+    {"id": 49, "name": "Hanok House", "cuisine": "Korean", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9701, "longitude": 77.6094, "capacity": 45, "price_range": "$$", "rating": 4.2, "specialties": ["Hot Pot", "Japchae", "Korean Stew"]},
+    {"id": 50, "name": "Kimchi Corner", "cuisine": "Korean", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9068, "longitude": 77.6353, "capacity": 30, "price_range": "$", "rating": 4.0, "specialties": ["Quick Bites", "Korean Street Food", "Kimbap"]},
     
     # French
-    {"id": 51, "name": "La Petite Paris", "cuisine": "French", "location": "UB City", "city": "Bangalore", "capacity": 50, "price_range": "$$$$", "rating": 4.8, "specialties": ["Fine French", "Foie Gras", "Wine Pairing"]},
-    {"id": 52, "name": "Bistro du Soleil", "cuisine": "French", "location": "MG Road", "city": "Bangalore", "capacity": 40, "price_range": "$$$", "rating": 4.5, "specialties": ["Croissants", "Quiche", "French Pastries"]},
-    {"id": 53, "name": "Provence Kitchen", "cuisine": "French", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Ratatouille", "Bouillabaisse", "Crêpes"]},
-    {"id": 54, "name": "Le Cafe", "cuisine": "French", "location": "Indiranagar", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.2, "specialties": ["Coffee", "Macarons", "French Toast"]},
-    {"id": 55, "name": "Paris Bistro", "cuisine": "French", "location": "Brigade Road", "city": "Bangalore", "capacity": 40, "price_range": "$$$", "rating": 4.4, "specialties": ["Escargot", "Coq au Vin", "Crème Brûlée"]},
+    {"id": 51, "name": "La Petite Paris", "cuisine": "French", "location": "UB City", "city": "Bangalore", "latitude": 12.9764, "longitude": 77.599, "capacity": 50, "price_range": "$$$$", "rating": 4.8, "specialties": ["Fine French", "Foie Gras", "Wine Pairing"]},
+    {"id": 52, "name": "Bistro du Soleil", "cuisine": "French", "location": "MG Road", "city": "Bangalore", "latitude": 12.9774, "longitude": 77.6036, "capacity": 40, "price_range": "$$$", "rating": 4.5, "specialties": ["Croissants", "Quiche", "French Pastries"]},
+    {"id": 53, "name": "Provence Kitchen", "cuisine": "French", "location": "Koramangala", "city": "Bangalore", "latitude": 12.934, "longitude": 77.6281, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Ratatouille", "Bouillabaisse", "Crêpes"]},
+    {"id": 54, "name": "Le Cafe", "cuisine": "French", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9742, "longitude": 77.6384, "capacity": 35, "price_range": "$$", "rating": 4.2, "specialties": ["Coffee", "Macarons", "French Toast"]},
+    {"id": 55, "name": "Paris Bistro", "cuisine": "French", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9773, "longitude": 77.6112, "capacity": 40, "price_range": "$$$", "rating": 4.4, "specialties": ["Escargot", "Coq au Vin", "Crème Brûlée"]},
     
     # Vietnamese
-    {"id": 56, "name": "Pho Street", "cuisine": "Vietnamese", "location": "Koramangala", "city": "Bangalore", "capacity": 35, "price_range": "$", "rating": 4.3, "specialties": ["Pho", "Banh Mi", "Fresh Herbs"]},
-    {"id": 57, "name": "Saigon Cafe", "cuisine": "Vietnamese", "location": "Whitefield", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.2, "specialties": ["Spring Rolls", "Vietnamese Coffee", "Vermicelli"]},
-    {"id": 58, "name": "Hanoi Kitchen", "cuisine": "Vietnamese", "location": "HSR Layout", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.1, "specialties": ["Noodle Soups", "Street Food", "Fresh Ingredients"]},
-    {"id": 59, "name": "Lotus Bowl", "cuisine": "Vietnamese", "location": "Indiranagar", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.0, "specialties": ["Rice Bowls", "Healthy Options", "Vegetarian Friendly"]},
-    {"id": 60, "name": "Viet Fusion", "cuisine": "Vietnamese", "location": "Brigade Road", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Fusion Vietnamese", "Modern Twist", "Craft Cocktails"]},
+    {"id": 56, "name": "Pho Street", "cuisine": "Vietnamese", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9376, "longitude": 77.6227, "capacity": 35, "price_range": "$", "rating": 4.3, "specialties": ["Pho", "Banh Mi", "Fresh Herbs"]},
+    {"id": 57, "name": "Saigon Cafe", "cuisine": "Vietnamese", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9692, "longitude": 77.7548, "capacity": 40, "price_range": "$$", "rating": 4.2, "specialties": ["Spring Rolls", "Vietnamese Coffee", "Vermicelli"]},
+    {"id": 58, "name": "Hanoi Kitchen", "cuisine": "Vietnamese", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.908, "longitude": 77.6377, "capacity": 30, "price_range": "$", "rating": 4.1, "specialties": ["Noodle Soups", "Street Food", "Fresh Ingredients"]},
+    {"id": 59, "name": "Lotus Bowl", "cuisine": "Vietnamese", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9844, "longitude": 77.6462, "capacity": 35, "price_range": "$$", "rating": 4.0, "specialties": ["Rice Bowls", "Healthy Options", "Vegetarian Friendly"]},
+    {"id": 60, "name": "Viet Fusion", "cuisine": "Vietnamese", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9749, "longitude": 77.6064, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Fusion Vietnamese", "Modern Twist", "Craft Cocktails"]},
     
     # Spanish
-    {"id": 61, "name": "Tapas Bar", "cuisine": "Spanish", "location": "UB City", "city": "Bangalore", "capacity": 50, "price_range": "$$$", "rating": 4.5, "specialties": ["Tapas", "Paella", "Sangria"]},
-    {"id": 62, "name": "Barcelona Bites", "cuisine": "Spanish", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Pintxos", "Churros", "Spanish Wine"]},
-    {"id": 63, "name": "Madrid Grill", "cuisine": "Spanish", "location": "MG Road", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.4, "specialties": ["Grilled Seafood", "Jamón", "Spanish Omelette"]},
-    {"id": 64, "name": "Seville Kitchen", "cuisine": "Spanish", "location": "Whitefield", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.2, "specialties": ["Gazpacho", "Seafood Paella", "Flan"]},
-    {"id": 65, "name": "Ibiza Lounge", "cuisine": "Spanish", "location": "Indiranagar", "city": "Bangalore", "capacity": 60, "price_range": "$$$", "rating": 4.4, "specialties": ["Cocktails", "Live Music", "Spanish Fusion"]},
+    {"id": 61, "name": "Tapas Bar", "cuisine": "Spanish", "location": "UB City", "city": "Bangalore", "latitude": 12.9716, "longitude": 77.602, "capacity": 50, "price_range": "$$$", "rating": 4.5, "specialties": ["Tapas", "Paella", "Sangria"]},
+    {"id": 62, "name": "Barcelona Bites", "cuisine": "Spanish", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9322, "longitude": 77.6245, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Pintxos", "Churros", "Spanish Wine"]},
+    {"id": 63, "name": "Madrid Grill", "cuisine": "Spanish", "location": "MG Road", "city": "Bangalore", "latitude": 12.9696, "longitude": 77.6006, "capacity": 55, "price_range": "$$", "rating": 4.4, "specialties": ["Grilled Seafood", "Jamón", "Spanish Omelette"]},
+    {"id": 64, "name": "Seville Kitchen", "cuisine": "Spanish", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9734, "longitude": 77.7506, "capacity": 40, "price_range": "$$", "rating": 4.2, "specialties": ["Gazpacho", "Seafood Paella", "Flan"]},
+    {"id": 65, "name": "Ibiza Lounge", "cuisine": "Spanish", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.979, "longitude": 77.6354, "capacity": 60, "price_range": "$$$", "rating": 4.4, "specialties": ["Cocktails", "Live Music", "Spanish Fusion"]},
     
     # Middle Eastern
-    {"id": 66, "name": "Arabian Nights", "cuisine": "Middle Eastern", "location": "Brigade Road", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.3, "specialties": ["Kebabs", "Mezze", "Arabic Coffee"]},
-    {"id": 67, "name": "Damascus Kitchen", "cuisine": "Middle Eastern", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.2, "specialties": ["Syrian Food", "Falafel", "Hummus"]},
-    {"id": 68, "name": "Persian Palace", "cuisine": "Middle Eastern", "location": "UB City", "city": "Bangalore", "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Persian Kebabs", "Saffron Rice", "Baklava"]},
-    {"id": 69, "name": "Istanbul Cafe", "cuisine": "Middle Eastern", "location": "Whitefield", "city": "Bangalore", "capacity": 40, "price_range": "$", "rating": 4.1, "specialties": ["Turkish Kebab", "Pide", "Turkish Delight"]},
-    {"id": 70, "name": "Beirut Grill", "cuisine": "Middle Eastern", "location": "Indiranagar", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Lebanese Food", "Grilled Meats", "Fresh Salads"]},
+    {"id": 66, "name": "Arabian Nights", "cuisine": "Middle Eastern", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9695, "longitude": 77.6082, "capacity": 50, "price_range": "$$", "rating": 4.3, "specialties": ["Kebabs", "Mezze", "Arabic Coffee"]},
+    {"id": 67, "name": "Damascus Kitchen", "cuisine": "Middle Eastern", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9298, "longitude": 77.6197, "capacity": 45, "price_range": "$$", "rating": 4.2, "specialties": ["Syrian Food", "Falafel", "Hummus"]},
+    {"id": 68, "name": "Persian Palace", "cuisine": "Middle Eastern", "location": "UB City", "city": "Bangalore", "latitude": 12.9758, "longitude": 77.5978, "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Persian Kebabs", "Saffron Rice", "Baklava"]},
+    {"id": 69, "name": "Istanbul Cafe", "cuisine": "Middle Eastern", "location": "Whitefield", "city": "Bangalore", "latitude": 12.971, "longitude": 77.7458, "capacity": 40, "price_range": "$", "rating": 4.1, "specialties": ["Turkish Kebab", "Pide", "Turkish Delight"]},
+    {"id": 70, "name": "Beirut Grill", "cuisine": "Middle Eastern", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9766, "longitude": 77.6432, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Lebanese Food", "Grilled Meats", "Fresh Salads"]},
     
     # Pan Asian
-    {"id": 71, "name": "Asia Fusion", "cuisine": "Pan Asian", "location": "Koramangala", "city": "Bangalore", "capacity": 60, "price_range": "$$", "rating": 4.4, "specialties": ["Mixed Asian", "Fusion Cuisine", "Variety"]},
-    {"id": 72, "name": "Oriental Kitchen", "cuisine": "Pan Asian", "location": "Brigade Road", "city": "Bangalore", "capacity": 55, "price_range": "$$", "rating": 4.3, "specialties": ["Noodles", "Rice Dishes", "Asian Soups"]},
-    {"id": 73, "name": "East Meets West", "cuisine": "Pan Asian", "location": "UB City", "city": "Bangalore", "capacity": 70, "price_range": "$$$", "rating": 4.5, "specialties": ["Fusion", "Creative Dishes", "Modern Asian"]},
-    {"id": 74, "name": "Bamboo House", "cuisine": "Pan Asian", "location": "Whitefield", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Thai & Chinese Mix", "Family Style", "Dim Sum"]},
-    {"id": 75, "name": "Silk Route", "cuisine": "Pan Asian", "location": "HSR Layout", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.1, "specialties": ["Asian Street Food", "Spicy Options", "Bubble Tea"]},
+    {"id": 71, "name": "Asia Fusion", "cuisine": "Pan Asian", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9304, "longitude": 77.6209, "capacity": 60, "price_range": "$$", "rating": 4.4, "specialties": ["Mixed Asian", "Fusion Cuisine", "Variety"]},
+    {"id": 72, "name": "Oriental Kitchen", "cuisine": "Pan Asian", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9767, "longitude": 77.61, "capacity": 55, "price_range": "$$", "rating": 4.3, "specialties": ["Noodles", "Rice Dishes", "Asian Soups"]},
+    {"id": 73, "name": "East Meets West", "cuisine": "Pan Asian", "location": "UB City", "city": "Bangalore", "latitude": 12.9734, "longitude": 77.593, "capacity": 70, "price_range": "$$$", "rating": 4.5, "specialties": ["Fusion", "Creative Dishes", "Modern Asian"]},
+    {"id": 74, "name": "Bamboo House", "cuisine": "Pan Asian", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9686, "longitude": 77.7536, "capacity": 50, "price_range": "$$", "rating": 4.2, "specialties": ["Thai & Chinese Mix", "Family Style", "Dim Sum"]},
+    {"id": 75, "name": "Silk Route", "cuisine": "Pan Asian", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9074, "longitude": 77.6365, "capacity": 45, "price_range": "$$", "rating": 4.1, "specialties": ["Asian Street Food", "Spicy Options", "Bubble Tea"]},
     
     # Cafe/Bakery
-    {"id": 76, "name": "The Coffee Bean", "cuisine": "Cafe", "location": "Koramangala", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.4, "specialties": ["Coffee", "Pastries", "Sandwiches"]},
-    {"id": 77, "name": "Sweet Treats Bakery", "cuisine": "Bakery", "location": "Indiranagar", "city": "Bangalore", "capacity": 25, "price_range": "$", "rating": 4.5, "specialties": ["Cakes", "Cookies", "Breads"]},
-    {"id": 78, "name": "Brew & Bake", "cuisine": "Cafe", "location": "MG Road", "city": "Bangalore", "capacity": 35, "price_range": "$", "rating": 4.3, "specialties": ["Fresh Brew", "Breakfast", "Wi-Fi Friendly"]},
-    {"id": 79, "name": "The Patisserie", "cuisine": "Bakery", "location": "UB City", "city": "Bangalore", "capacity": 30, "price_range": "$$", "rating": 4.6, "specialties": ["French Pastries", "Croissants", "Artisan Bread"]},
-    {"id": 80, "name": "Corner Cafe", "cuisine": "Cafe", "location": "Whitefield", "city": "Bangalore", "capacity": 40, "price_range": "$", "rating": 4.2, "specialties": ["Quick Bites", "Smoothies", "Workspace"]},
+    {"id": 76, "name": "The Coffee Bean", "cuisine": "Cafe", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9406, "longitude": 77.6287, "capacity": 30, "price_range": "$", "rating": 4.4, "specialties": ["Coffee", "Pastries", "Sandwiches"]},
+    {"id": 77, "name": "Sweet Treats Bakery", "cuisine": "Bakery", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9808, "longitude": 77.639, "capacity": 25, "price_range": "$", "rating": 4.5, "specialties": ["Cakes", "Cookies", "Breads"]},
+    {"id": 78, "name": "Brew & Bake", "cuisine": "Cafe", "location": "MG Road", "city": "Bangalore", "latitude": 12.975, "longitude": 77.6114, "capacity": 35, "price_range": "$", "rating": 4.3, "specialties": ["Fresh Brew", "Breakfast", "Wi-Fi Friendly"]},
+    {"id": 79, "name": "The Patisserie", "cuisine": "Bakery", "location": "UB City", "city": "Bangalore", "latitude": 12.968, "longitude": 77.5948, "capacity": 30, "price_range": "$$", "rating": 4.6, "specialties": ["French Pastries", "Croissants", "Artisan Bread"]},
+    {"id": 80, "name": "Corner Cafe", "cuisine": "Cafe", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9758, "longitude": 77.7554, "capacity": 40, "price_range": "$", "rating": 4.2, "specialties": ["Quick Bites", "Smoothies", "Workspace"]},
     
     # Seafood
-    {"id": 81, "name": "Coastal Catch", "cuisine": "Seafood", "location": "Brigade Road", "city": "Bangalore", "capacity": 50, "price_range": "$$$", "rating": 4.5, "specialties": ["Fresh Fish", "Lobster", "Prawns"]},
-    {"id": 82, "name": "The Fisherman's Wharf", "cuisine": "Seafood", "location": "UB City", "city": "Bangalore", "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Goan Seafood", "Fish Curry", "Beach Vibes"]},
-    {"id": 83, "name": "Ocean Breeze", "cuisine": "Seafood", "location": "Koramangala", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Fish Fry", "Seafood Platter", "Coastal Cuisine"]},
-    {"id": 84, "name": "Crab Shack", "cuisine": "Seafood", "location": "Whitefield", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.2, "specialties": ["Crab", "Oysters", "Clams"]},
-    {"id": 85, "name": "Tuna Bay", "cuisine": "Seafood", "location": "HSR Layout", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.1, "specialties": ["Sushi Grade Fish", "Poke Bowls", "Grilled Fish"]},
+    {"id": 81, "name": "Coastal Catch", "cuisine": "Seafood", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9749, "longitude": 77.6064, "capacity": 50, "price_range": "$$$", "rating": 4.5, "specialties": ["Fresh Fish", "Lobster", "Prawns"]},
+    {"id": 82, "name": "The Fisherman's Wharf", "cuisine": "Seafood", "location": "UB City", "city": "Bangalore", "latitude": 12.9716, "longitude": 77.602, "capacity": 60, "price_range": "$$$", "rating": 4.6, "specialties": ["Goan Seafood", "Fish Curry", "Beach Vibes"]},
+    {"id": 83, "name": "Ocean Breeze", "cuisine": "Seafood", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9322, "longitude": 77.6245, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Fish Fry", "Seafood Platter", "Coastal Cuisine"]},
+    {"id": 84, "name": "Crab Shack", "cuisine": "Seafood", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9638, "longitude": 77.744, "capacity": 40, "price_range": "$$", "rating": 4.2, "specialties": ["Crab", "Oysters", "Clams"]},
+    {"id": 85, "name": "Tuna Bay", "cuisine": "Seafood", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9152, "longitude": 77.6395, "capacity": 35, "price_range": "$$", "rating": 4.1, "specialties": ["Sushi Grade Fish", "Poke Bowls", "Grilled Fish"]},
     
     # Vegetarian/Vegan
-    {"id": 86, "name": "Green Leaf", "cuisine": "Vegetarian", "location": "Koramangala", "city": "Bangalore", "capacity": 40, "price_range": "$", "rating": 4.4, "specialties": ["Pure Veg", "Organic", "Healthy"]},
-    {"id": 87, "name": "The Vegan Kitchen", "cuisine": "Vegan", "location": "Indiranagar", "city": "Bangalore", "capacity": 35, "price_range": "$$", "rating": 4.3, "specialties": ["Plant Based", "Vegan Burgers", "Smoothie Bowls"]},
-    {"id": 88, "name": "Sprouts & Roots", "cuisine": "Vegetarian", "location": "Whitefield", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.2, "specialties": ["Farm Fresh", "Salads", "Fresh Juices"]},
-    {"id": 89, "name": "Earthen Pot", "cuisine": "Vegetarian", "location": "HSR Layout", "city": "Bangalore", "capacity": 45, "price_range": "$", "rating": 4.1, "specialties": ["North Indian Veg", "Thali", "Traditional"]},
-    {"id": 90, "name": "Nature's Plate", "cuisine": "Vegan", "location": "MG Road", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.4, "specialties": ["Innovative Vegan", "Desserts", "Superfoods"]},
+    {"id": 86, "name": "Green Leaf", "cuisine": "Vegetarian", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9358, "longitude": 77.6191, "capacity": 40, "price_range": "$", "rating": 4.4, "specialties": ["Pure Veg", "Organic", "Healthy"]},
+    {"id": 87, "name": "The Vegan Kitchen", "cuisine": "Vegan", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.976, "longitude": 77.642, "capacity": 35, "price_range": "$$", "rating": 4.3, "specialties": ["Plant Based", "Vegan Burgers", "Smoothie Bowls"]},
+    {"id": 88, "name": "Sprouts & Roots", "cuisine": "Vegetarian", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9644, "longitude": 77.7452, "capacity": 30, "price_range": "$", "rating": 4.2, "specialties": ["Farm Fresh", "Salads", "Fresh Juices"]},
+    {"id": 89, "name": "Earthen Pot", "cuisine": "Vegetarian", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.9158, "longitude": 77.6407, "capacity": 45, "price_range": "$", "rating": 4.1, "specialties": ["North Indian Veg", "Thali", "Traditional"]},
+    {"id": 90, "name": "Nature's Plate", "cuisine": "Vegan", "location": "MG Road", "city": "Bangalore", "latitude": 12.9768, "longitude": 77.6024, "capacity": 40, "price_range": "$$", "rating": 4.4, "specialties": ["Innovative Vegan", "Desserts", "Superfoods"]},
     
     # Additional Varied Cuisines
-    {"id": 91, "name": "Havana Nights", "cuisine": "Cuban", "location": "Brigade Road", "city": "Bangalore", "capacity": 50, "price_range": "$$", "rating": 4.3, "specialties": ["Cuban Sandwiches", "Mojitos", "Live Music"]},
-    {"id": 92, "name": "Aloha Poke", "cuisine": "Hawaiian", "location": "Koramangala", "city": "Bangalore", "capacity": 30, "price_range": "$", "rating": 4.2, "specialties": ["Poke Bowls", "Fresh Fish", "Island Vibes"]},
-    {"id": 93, "name": "Buenos Aires Steakhouse", "cuisine": "Argentinian", "location": "UB City", "city": "Bangalore", "capacity": 70, "price_range": "$$$$", "rating": 4.7, "specialties": ["Argentine Beef", "Chimichurri", "Wine Selection"]},
-    {"id": 94, "name": "Ethiopian Spice", "cuisine": "Ethiopian", "location": "Whitefield", "city": "Bangalore", "capacity": 35, "price_range": "$", "rating": 4.0, "specialties": ["Injera", "Wat", "Traditional Ethiopian"]},
-    {"id": 95, "name": "Moroccan Nights", "cuisine": "Moroccan", "location": "Indiranagar", "city": "Bangalore", "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Tagine", "Couscous", "Mint Tea"]},
-    {"id": 96, "name": "Swiss Chalet", "cuisine": "Swiss", "location": "MG Road", "city": "Bangalore", "capacity": 40, "price_range": "$$$", "rating": 4.4, "specialties": ["Fondue", "Raclette", "Swiss Chocolate"]},
-    {"id": 97, "name": "Bavarian Beer House", "cuisine": "German", "location": "Koramangala", "city": "Bangalore", "capacity": 80, "price_range": "$$", "rating": 4.4, "specialties": ["Sausages", "Pretzels", "German Beer"]},
-    {"id": 98, "name": "The Outback", "cuisine": "Australian", "location": "Whitefield", "city": "Bangalore", "capacity": 60, "price_range": "$$$", "rating": 4.5, "specialties": ["Kangaroo Steak", "Barramundi", "Australian Wine"]},
-    {"id": 99, "name": "Caribbean Kitchen", "cuisine": "Caribbean", "location": "HSR Layout", "city": "Bangalore", "capacity": 40, "price_range": "$$", "rating": 4.1, "specialties": ["Jerk Chicken", "Rice & Peas", "Rum Cocktails"]},
-    {"id": 100, "name": "Nordic Table", "cuisine": "Scandinavian", "location": "UB City", "city": "Bangalore", "capacity": 45, "price_range": "$$$", "rating": 4.5, "specialties": ["Nordic Cuisine", "Smoked Salmon", "Minimalist"]},
+    {"id": 91, "name": "Havana Nights", "cuisine": "Cuban", "location": "Brigade Road", "city": "Bangalore", "latitude": 12.9701, "longitude": 77.6094, "capacity": 50, "price_range": "$$", "rating": 4.3, "specialties": ["Cuban Sandwiches", "Mojitos", "Live Music"]},
+    {"id": 92, "name": "Aloha Poke", "cuisine": "Hawaiian", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9304, "longitude": 77.6209, "capacity": 30, "price_range": "$", "rating": 4.2, "specialties": ["Poke Bowls", "Fresh Fish", "Island Vibes"]},
+    {"id": 93, "name": "Buenos Aires Steakhouse", "cuisine": "Argentinian", "location": "UB City", "city": "Bangalore", "latitude": 12.9764, "longitude": 77.599, "capacity": 70, "price_range": "$$$$", "rating": 4.7, "specialties": ["Argentine Beef", "Chimichurri", "Wine Selection"]},
+    {"id": 94, "name": "Ethiopian Spice", "cuisine": "Ethiopian", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9716, "longitude": 77.747, "capacity": 35, "price_range": "$", "rating": 4.0, "specialties": ["Injera", "Wat", "Traditional Ethiopian"]},
+    {"id": 95, "name": "Moroccan Nights", "cuisine": "Moroccan", "location": "Indiranagar", "city": "Bangalore", "latitude": 12.9772, "longitude": 77.6444, "capacity": 45, "price_range": "$$", "rating": 4.3, "specialties": ["Tagine", "Couscous", "Mint Tea"]},
+    {"id": 96, "name": "Swiss Chalet", "cuisine": "Swiss", "location": "MG Road", "city": "Bangalore", "latitude": 12.9714, "longitude": 77.6042, "capacity": 40, "price_range": "$$$", "rating": 4.4, "specialties": ["Fondue", "Raclette", "Swiss Chocolate"]},
+    {"id": 97, "name": "Bavarian Beer House", "cuisine": "German", "location": "Koramangala", "city": "Bangalore", "latitude": 12.9406, "longitude": 77.6287, "capacity": 80, "price_range": "$$", "rating": 4.4, "specialties": ["Sausages", "Pretzels", "German Beer"]},
+    {"id": 98, "name": "The Outback", "cuisine": "Australian", "location": "Whitefield", "city": "Bangalore", "latitude": 12.9722, "longitude": 77.7482, "capacity": 60, "price_range": "$$$", "rating": 4.5, "specialties": ["Kangaroo Steak", "Barramundi", "Australian Wine"]},
+    {"id": 99, "name": "Caribbean Kitchen", "cuisine": "Caribbean", "location": "HSR Layout", "city": "Bangalore", "latitude": 12.911, "longitude": 77.6437, "capacity": 40, "price_range": "$$", "rating": 4.1, "specialties": ["Jerk Chicken", "Rice & Peas", "Rum Cocktails"]},
+    {"id": 100, "name": "Nordic Table", "cuisine": "Scandinavian", "location": "UB City", "city": "Bangalore", "latitude": 12.968, "longitude": 77.5948, "capacity": 45, "price_range": "$$$", "rating": 4.5, "specialties": ["Nordic Cuisine", "Smoked Salmon", "Minimalist"]},
 ]
 
+RESTAURANTS_BY_ID = {restaurant["id"]: restaurant for restaurant in RESTAURANTS}
+CATALOG = CatalogIndex(RESTAURANTS)
+RECOMMENDER = RecommendationEngine(CATALOG)
+GEO = GeoIndex(RESTAURANTS)
+# Bumped by rebuild_catalog so caches of catalog lookups can tell stale entries
+CATALOG_VERSION = 1
+
+
+def rebuild_catalog():
+    """Rebuild the lookup indexes after RESTAURANTS is edited."""
+    global RESTAURANTS_BY_ID, CATALOG, RECOMMENDER, GEO, CATALOG_VERSION
+    RESTAURANTS_BY_ID = {restaurant["id"]: restaurant for restaurant in RESTAURANTS}
+    CATALOG = CatalogIndex(RESTAURANTS)
+    RECOMMENDER = RecommendationEngine(CATALOG)
+    GEO = GeoIndex(RESTAURANTS)
+    CATALOG_VERSION += 1
+
+
+# Availability assumes an average party of 4 per booking
+SEATS_PER_BOOKING = 4
+
 class ReservationDatabase:
-    """Manages restaurant reservations."""
+    """Manages restaurant reservations.
+    
+    Pass data_dir to journal every write there and recover the
+    reservations from it on startup. Capacity checks and the booking that
+    follows hold the lock stripe for the (restaurant, date).
+    """
     
-    def __init__(self):
+    def __init__(self, data_dir=None, fsync="interval"):
         self.reservations = []
-        self.next_id = 1
+        self.reservation_ids = AtomicCounter(1)
+        self._booking_locks = LockStripes()  # (restaurant_id, date) -> stripe
+        self._commit_lock = threading.Lock()
+        self.reservations_by_id = {}  # id -> reservation
+        self.booked_seats = {}  # (restaurant_id, date, time) -> seats held by confirmed bookings
+        
+        self.journal = None
+        if data_dir:
+            self.journal = Journal(data_dir, self._snapshot_state, fsync=fsync)
+            self._recover()
+    
+    @property
+    def next_id(self):
+        """ID the next reservation will get."""
+        return self.reservation_ids.value
+    
+    @property
+    def catalog_version(self):
+        """Version of the shared restaurant catalog."""
+        return CATALOG_VERSION
+    
+    def _snapshot_state(self):
+        """Reservations and the id counter; indexes are rebuilt on load."""
+        return {"reservations": to_rows(self.reservations), "next_id": self.next_id}
+    
+    def _restore(self, state):
+        """Load a snapshot taken by _snapshot_state."""
+        self.reservation_ids.value = state["next_id"]
+        for reservation in from_rows(state["reservations"]):
+            self.reservations.append(reservation)
+            self.reservations_by_id[reservation["id"]] = reservation
+            self._adjust_seats(reservation, 1)
+    
+    def _recover(self):
+        """Load the latest snapshot and replay the journal written after it."""
+        self.journal.recover(self._restore, self._replay)
+    
+    def _replay(self, op, payload):
+        """Apply a recovered operation, moving the ID counter past created reservations.
+        
+        IDs are allocated under a stripe lock but journaled under the commit
+        lock, so the journal can hold them out of order.
+        """
+        if op == "reservation_created":
+            self.reservation_ids.value = max(self.reservation_ids.value, payload["id"] + 1)
+        self._apply(op, payload)
+    
+    def _commit(self, op, payload):
+        """Journal an operation (when persistent), then apply it in memory."""
+        with self._commit_lock:
+            if self.journal:
+                self.journal.append(op, payload)
+            self._apply(op, payload)
+    
+    def _apply(self, op, payload):
+        """Apply one journaled operation to the in-memory state."""
+        if op == "reservation_created":
+            self.reservations.append(payload)
+            self.reservations_by_id[payload["id"]] = payload
+            self._adjust_seats(payload, 1)
+            return
+        
+        reservation = self.reservations_by_id[payload["id"]]
+        self._adjust_seats(reservation, -1)
+        if op == "reservation_cancelled":
+            reservation["status"] = "cancelled"
+        elif op == "reservation_modified":
+            reservation.update(payload["changes"])
+        self._adjust_seats(reservation, 1)
+    
+    def close(self):
+        """Flush the journal to disk."""
+        if self.journal:
+            self.journal.close()
         
     def get_restaurants(self, filters=None):
-        """Get restaurants with optional filters."""
-        results = RESTAURANTS.copy()
+        """Get restaurants with optional filters, highest rated first."""
+        filters = filters or {}
+        return CATALOG.filter(
+            cuisine=filters.get("cuisine"),
+            location=filters.get("location"),
+            price_range=filters.get("price_range"),
+            min_rating=filters.get("min_rating")
+        )
+    
+    def find_restaurants_near(self, location=None, latitude=None, longitude=None,
+                              limit=5, radius_km=None, filters=None):
+        """Find restaurants closest to a neighbourhood or a point.
+        
+        Returns up to `limit` restaurants (nearest first, each with
+        distance_km), optionally within radius_km and matching the same
+        filters as get_restaurants.
+        """
+        if latitude is None or longitude is None:
+            coordinates = resolve_location(location)
+            if not coordinates:
+                return None, f"Unknown location: {location}"
+            latitude, longitude = coordinates
         
+        predicate = None
         if filters:
-            if "cuisine" in filters:
-                results = [r for r in results if r["cuisine"].lower() == filters["cuisine"].lower()]
-            if "location" in filters:
-                results = [r for r in results if r["location"].lower() == filters["location"].lower()]
-            if "min_rating" in filters:
-                results = [r for r in results if r["rating"] >= filters["min_rating"]]
-            if "price_range" in filters:
-                results = [r for r in results if r["price_range"] == filters["price_range"]]
-                
-        return results
+            allowed = {r["id"] for r in self.get_restaurants(filters)}
+            predicate = lambda r: r["id"] in allowed
+        
+        if radius_km is None:
+            matches = GEO.nearest(latitude, longitude, limit, predicate)
+        else:
+            matches = GEO.within(latitude, longitude, radius_km, predicate)[:limit]
+        
+        return [{**r, "distance_km": round(distance, 2)} for distance, r in matches], "OK"
+    
+    def recommend_restaurants(self, occasion="", dietary_restrictions=""):
+        """Get the top recommendations for an occasion and dietary preference."""
+        return RECOMMENDER.recommend(occasion, dietary_restrictions)
     
     def get_restaurant_by_id(self, restaurant_id):
         """Get a specific restaurant by ID."""
-        for restaurant in RESTAURANTS:
-            if restaurant["id"] == restaurant_id:
-                return restaurant
-        return None
+        return RESTAURANTS_BY_ID.get(restaurant_id)
+    
+    def _adjust_seats(self, reservation, sign):
+        """Add (sign=1) or remove (sign=-1) a confirmed booking from the seat counter."""
+        if reservation["status"] != "confirmed":
+            return
+        key = (reservation["restaurant_id"], reservation["date"], reservation["time"])
+        seats = self.booked_seats.get(key, 0) + sign * SEATS_PER_BOOKING
+        if seats:
+            self.booked_seats[key] = seats
+        else:
+            self.booked_seats.pop(key, None)
     
     def check_availability(self, restaurant_id, date, time, party_size):
         """Check if a restaurant has availability."""
@@ -180,16 +317,9 @@ class ReservationDatabase:
         if not restaurant:
             return False, "Restaurant not found"
         
-        # Count existing reservations for this time slot
-        existing = sum(1 for r in self.reservations 
-                      if r["restaurant_id"] == restaurant_id 
-                      and r["date"] == date 
-                      and r["time"] == time 
-                      and r["status"] == "confirmed")
-        
         # Simple availability logic (could be more sophisticated)
         total_capacity = restaurant["capacity"]
-        used_capacity = existing * 4  # Assume average party of 4
+        used_capacity = self.booked_seats.get((restaurant_id, date, time), 0)
         
         if used_capacity + party_size <= total_capacity:
             return True, "Available"
@@ -199,43 +329,51 @@ class ReservationDatabase:
     def create_reservation(self, restaurant_id, customer_name, customer_phone, 
                           date, time, party_size, special_requests=""):
         """Create a new reservation."""
-        available, message = self.check_availability(restaurant_id, date, time, party_size)
-        
-        if not available:
-            return None, message
-        
-        reservation = {
-            "id": self.next_id,
-            "restaurant_id": restaurant_id,
-            "customer_name": customer_name,
-            "customer_phone": customer_phone,
-            "date": date,
-            "time": time,
-            "party_size": party_size,
-            "special_requests": special_requests,
-            "status": "confirmed",
-            "created_at": datetime.now().isoformat()
-        }
-        
-        self.reservations.append(reservation)
-        self.next_id += 1
+        with self._booking_locks.lock((restaurant_id, date)):
+            available, message = self.check_availability(restaurant_id, date, time, party_size)
+            
+            if not available:
+                return None, message
+            
+            reservation = {
+                "id": self.reservation_ids.next(),
+                "restaurant_id": restaurant_id,
+                "customer_name": customer_name,
+                "customer_phone": customer_phone,
+                "date": date,
+                "time": time,
+                "party_size": party_size,
+                "special_requests": special_requests,
+                "status": "confirmed",
+                "created_at": datetime.now().isoformat()
+            }
+            
+            self._commit("reservation_created", reservation)
         
         return reservation, "Reservation created successfully"
     
     def get_reservation(self, reservation_id):
         """Get a reservation by ID."""
-        for reservation in self.reservations:
-            if reservation["id"] == reservation_id:
-                return reservation
-        return None
+        return self.reservations_by_id.get(reservation_id)
+    
+    @staticmethod
+    def _booking_key(reservation):
+        """The (restaurant_id, date) whose lock stripe guards the reservation's seats."""
+        return reservation["restaurant_id"], reservation["date"]
     
     def cancel_reservation(self, reservation_id):
         """Cancel a reservation."""
         reservation = self.get_reservation(reservation_id)
-        if reservation:
-            reservation["status"] = "cancelled"
-            return True, "Reservation cancelled successfully"
-        return False, "Reservation not found"
+        if not reservation:
+            return False, "Reservation not found"
+        
+        while True:
+            key = self._booking_key(reservation)
+            with self._booking_locks.lock(key):
+                # A concurrent modify may have moved it before the lock was taken
+                if self._booking_key(reservation) == key:
+                    self._commit("reservation_cancelled", {"id": reservation_id})
+                    return True, "Reservation cancelled successfully"
     
     def modify_reservation(self, reservation_id, **kwargs):
         """Modify an existing reservation."""
@@ -243,9 +381,17 @@ class ReservationDatabase:
         if not reservation:
             return None, "Reservation not found"
         
-        # Update fields
-        for key, value in kwargs.items():
-            if key in reservation and key not in ["id", "created_at"]:
-                reservation[key] = value
-        
-        return reservation, "Reservation modified successfully"
+        # Update fields; the booking may move to another slot or change status
+        changes = {
+            key: value for key, value in kwargs.items()
+            if key in reservation and key not in ["id", "created_at"]
+        }
+        while True:
+            old_key = self._booking_key(reservation)
+            new_key = (changes.get("restaurant_id", old_key[0]), changes.get("date", old_key[1]))
+            with self._booking_locks.holding(old_key, new_key):
+                # Another modify may have moved it between the read and the locks;
+                # then the stripes held are the wrong ones, so read it again
+                if self._booking_key(reservation) == old_key:
+                    self._commit("reservation_modified", {"id": reservation_id, "changes": changes})
+                    return reservation, "Reservation modified successfully"
@@ -1,7 +1,12 @@
 """Enhanced restaurant database with user management and time slot reservations."""
 import json
+import threading
 from datetime import datetime, timedelta, time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from data.catalog import CatalogIndex
+from data.journal import Journal, from_rows, to_rows
+from data.locking import AtomicCounter, LockStripes
 
 # Restaurant data
 RESTAURANTS = [
@@ -17,15 +22,112 @@ RESTAURANTS = [
     {"id": 10, "name": "Sakura Sushi", "cuisine": "Japanese", "location": "UB City", "city": "Bangalore"},
 ]
 
+CATALOG = CatalogIndex(RESTAURANTS)
+# Bump when RESTAURANTS changes so caches of catalog lookups are invalidated
+CATALOG_VERSION = 1
+
 class TableTurnerDatabase:
-    """Enhanced database for Table Turner reservation system."""
+    """Enhanced database for Table Turner reservation system.
+    
+    With a data_dir, every write is journaled there before it is applied,
+    and the store is rebuilt from the latest snapshot plus journal on
+    startup. Reads never touch disk.
     
-    def __init__(self):
+    Thread-safe: a booking's check-then-insert runs under the lock stripe
+    for its (restaurant, date), so bookings elsewhere proceed in parallel.
+    Every mutation is applied under a short commit lock that also orders
+    the journal.
+    """
+    
+    def __init__(self, data_dir: Optional[str] = None, fsync: str = "interval"):
         self.users = {}  # phone_number -> user_data
         self.reservations = []  # List of all reservations
         self.time_slots = self._generate_time_slots()
-        self.next_reservation_id = 1000
+        self.reservation_ids = AtomicCounter(1000)
+        
+        self._booking_locks = LockStripes()  # (restaurant_id, date) -> stripe
+        self._commit_lock = threading.Lock()
+        
+        # Secondary indexes, maintained on every write
+        self.reservations_by_id = {}  # reservation_id -> reservation
+        self.user_reservations = {}  # phone_number -> reservations, oldest first
+        self.booked_slots = {}  # (restaurant_id, date, time, table_size) -> confirmed reservation
+        
+        self.journal = None
+        if data_dir:
+            self.journal = Journal(data_dir, self._snapshot_state, fsync=fsync)
+            self._recover()
+    
+    @property
+    def next_reservation_id(self) -> int:
+        """Number of the next reservation ID to hand out."""
+        return self.reservation_ids.value
+    
+    @property
+    def catalog_version(self) -> int:
+        """Version of the restaurant catalog."""
+        return CATALOG_VERSION
+    
+    def _snapshot_state(self) -> Dict:
+        """Everything needed to rebuild the store; indexes are derived on load."""
+        return {
+            "users": self.users,
+            "reservations": to_rows(self.reservations),
+            "next_reservation_id": self.next_reservation_id
+        }
+    
+    def _restore(self, state: Dict):
+        """Load a snapshot taken by _snapshot_state."""
+        self.users = state["users"]
+        self.reservation_ids.value = state["next_reservation_id"]
+        for reservation in from_rows(state["reservations"]):
+            self._index_reservation(reservation)
+    
+    def _recover(self):
+        """Load the latest snapshot and replay the journal written after it."""
+        self.journal.recover(self._restore, self._replay)
+    
+    def _replay(self, op: str, payload: Dict):
+        """Apply a recovered operation, advancing the ID counter past created reservations.
+        
+        IDs are allocated under a stripe lock but journaled under the commit
+        lock, so the journal can hold them out of order.
+        """
+        if op == "reservation_created":
+            number = int(payload["reservation_id"][len("TT"):])
+            self.reservation_ids.value = max(self.reservation_ids.value, number + 1)
+        self._apply(op, payload)
+    
+    def _commit(self, op: str, payload: Dict):
+        """Journal an operation (when persistent), then apply it in memory."""
+        with self._commit_lock:
+            if self.journal:
+                self.journal.append(op, payload)
+            self._apply(op, payload)
+    
+    def _apply(self, op: str, payload: Dict):
+        """Apply one journaled operation to the in-memory state."""
+        if op == "user_created":
+            self.users[payload["phone_number"]] = payload
+        
+        elif op == "reservation_created":
+            self._index_reservation(payload)
+            if payload["phone_number"] in self.users:
+                self.users[payload["phone_number"]]["total_reservations"] += 1
         
+        elif op == "reservation_cancelled":
+            reservation = self.reservations_by_id[payload["reservation_id"]]
+            reservation["status"] = "cancelled"
+            key = self._slot_key(reservation["restaurant_id"], reservation["date"],
+                                 reservation["time"], reservation["table_size"])
+            if self.booked_slots.get(key) is reservation:
+                del self.booked_slots[key]
+    
+    def close(self):
+        """Flush the journal to disk."""
+        if self.journal:
+            self.journal.close()
+    
     def _generate_time_slots(self):
         """Generate 30-minute time slots from 11:00 AM to 11:00 PM."""
         slots = []
@@ -104,32 +206,44 @@ class TableTurnerDatabase:
             "created_at": datetime.now().isoformat(),
             "total_reservations": 0
         }
-        self.users[phone_number] = user
+        self._commit("user_created", user)
         return user
     
     def get_user_reservations(self, phone_number: str, limit: int = 5) -> List[Dict]:
-        """Get recent reservations for a user."""
-        user_reservations = [
-            r for r in self.reservations 
-            if r.get("phone_number") == phone_number and r.get("status") != "cancelled"
-        ]
-        # Sort by date descending
-        user_reservations.sort(
-            key=lambda x: datetime.fromisoformat(x.get("created_at", "2000-01-01")),
-            reverse=True
-        )
-        return user_reservations[:limit]
+        """Get recent reservations for a user, newest first.
+        
+        The per-user list is kept in creation order, so this walks it
+        backwards and stops after `limit` matches.
+        """
+        user_reservations = []
+        for reservation in reversed(self.user_reservations.get(phone_number, [])):
+            if len(user_reservations) >= limit:
+                break
+            if reservation["status"] != "cancelled":
+                user_reservations.append(reservation)
+        return user_reservations
+    
+    def get_reservation_by_id(self, reservation_id: str) -> Optional[Dict]:
+        """Get reservation details by ID."""
+        return self.reservations_by_id.get(reservation_id)
+    
+    def _slot_key(self, restaurant_id: int, date: str, time_slot: str,
+                  table_size: int) -> Tuple[int, str, str, int]:
+        """Key into booked_slots."""
+        return (restaurant_id, date, time_slot, table_size)
+    
+    def _index_reservation(self, reservation: Dict):
+        """Store a reservation and add it to the secondary indexes."""
+        self.reservations.append(reservation)
+        self.reservations_by_id[reservation["reservation_id"]] = reservation
+        self.user_reservations.setdefault(reservation["phone_number"], []).append(reservation)
+        if reservation["status"] == "confirmed":
+            key = self._slot_key(reservation["restaurant_id"], reservation["date"],
+                                 reservation["time"], reservation["table_size"])
+            self.booked_slots[key] = reservation
     
     def get_available_slots(self, restaurant_id: int, date: str, party_size: int) -> List[Dict]:
         """Get available time slots for a restaurant on a specific date."""
-        # Get all existing reservations for this restaurant and date
-        existing_reservations = [
-            r for r in self.reservations
-            if r["restaurant_id"] == restaurant_id
-            and r["date"] == date
-            and r["status"] == "confirmed"
-        ]
-        
         available_slots = []
         
         # Check each time slot
@@ -139,10 +253,7 @@ class TableTurnerDatabase:
                 # Check if this table size can accommodate party
                 if table_size >= party_size:
                     # Check if this slot is already booked
-                    slot_booked = any(
-                        r["time"] == time_slot and r["table_size"] == table_size
-                        for r in existing_reservations
-                    )
+                    slot_booked = self._slot_key(restaurant_id, date, time_slot, table_size) in self.booked_slots
                     
                     if not slot_booked:
                         available_slots.append({
@@ -159,11 +270,11 @@ class TableTurnerDatabase:
         """Find the nearest available slot after requested time."""
         available_slots = self.get_available_slots(restaurant_id, date, party_size)
         
-        # Filter slots that are after the requested time
-        requested_time_obj = datetime.strptime(requested_time, "%H:%M").time()
+        # Slots are zero-padded 'HH:MM', so string order is time order
+        requested_time = datetime.strptime(requested_time, "%H:%M").strftime("%H:%M")
         future_slots = [
             slot for slot in available_slots
-            if datetime.strptime(slot["time"], "%H:%M").time() >= requested_time_obj
+            if slot["time"] >= requested_time
         ]
         
         return future_slots[0] if future_slots else None
@@ -177,44 +288,44 @@ class TableTurnerDatabase:
         if not is_valid:
             return None, message
         
-        # Check if slot is still available
-        existing = any(
-            r["restaurant_id"] == restaurant_id
-            and r["date"] == date
-            and r["time"] == time_slot
-            and r["table_size"] == table_size
-            and r["status"] == "confirmed"
-            for r in self.reservations
-        )
-        
-        if existing:
-            return None, "This slot has just been booked. Please choose another time."
-        
-        # Generate unique reservation ID
-        reservation_id = f"TT{self.next_reservation_id}"
-        self.next_reservation_id += 1
-        
-        reservation = {
-            "reservation_id": reservation_id,
-            "restaurant_id": restaurant_id,
-            "phone_number": phone_number,
-            "customer_name": name,
-            "date": date,
-            "time": time_slot,
-            "party_size": party_size,
-            "table_size": table_size,
-            "status": "confirmed",
-            "created_at": datetime.now().isoformat()
-        }
-        
-        self.reservations.append(reservation)
-        
-        # Update user's reservation count
-        if phone_number in self.users:
-            self.users[phone_number]["total_reservations"] += 1
+        with self._booking_locks.lock((restaurant_id, date)):
+            # Check if slot is still available
+            if self._slot_key(restaurant_id, date, time_slot, table_size) in self.booked_slots:
+                return None, "This slot has just been booked. Please choose another time."
+            
+            # Generate unique reservation ID
+            reservation_id = f"TT{self.reservation_ids.next()}"
+            
+            reservation = {
+                "reservation_id": reservation_id,
+                "restaurant_id": restaurant_id,
+                "phone_number": phone_number,
+                "customer_name": name,
+                "date": date,
+                "time": time_slot,
+                "party_size": party_size,
+                "table_size": table_size,
+                "status": "confirmed",
+                "created_at": datetime.now().isoformat()
+            }
+            
+            # Stores and indexes it, and updates the user's reservation count
+            self._commit("reservation_created", reservation)
         
         return reservation, "Reservation created successfully"
     
+    def cancel_reservation(self, reservation_id: str) -> tuple[bool, str]:
+        """Cancel a reservation and free its slot."""
+        reservation = self.reservations_by_id.get(reservation_id)
+        if not reservation:
+            return False, "Reservation not found or already cancelled"
+        
+        with self._booking_locks.lock((reservation["restaurant_id"], reservation["date"])):
+            if reservation["status"] != "confirmed":
+                return False, "Reservation not found or already cancelled"
+            self._commit("reservation_cancelled", {"reservation_id": reservation_id})
+        return True, "Reservation cancelled successfully"
+    
     def get_restaurant_by_id(self, restaurant_id: int) -> Optional[Dict]:
         """Get restaurant details by ID."""
         for restaurant in RESTAURANTS:
@@ -233,14 +344,7 @@ class TableTurnerDatabase:
     def search_restaurants(self, cuisine: Optional[str] = None, 
                           location: Optional[str] = None) -> List[Dict]:
         """Search restaurants by cuisine or location."""
-        results = RESTAURANTS.copy()
-        
-        if cuisine:
-            results = [r for r in results if r["cuisine"].lower() == cuisine.lower()]
-        if location:
-            results = [r for r in results if r["location"].lower() == location.lower()]
-        
-        return results
+        return CATALOG.filter(cuisine=cuisine, location=location)
     
     def get_all_restaurants(self) -> List[Dict]:
         """Get all restaurants."""
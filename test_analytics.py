@@ -0,0 +1,69 @@
+"""Tests for the occupancy tensor (data/analytics.py)."""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+np = pytest.importorskip("numpy")
+
+from data.analytics import OccupancyAnalytics
+from data.database import TableTurnerDB
+
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = TableTurnerDB(str(tmp_path / "table_turner.db"))
+    database.seed_data()
+    database.create_user("9876543210", "Raj")
+    return database
+
+
+def book(database, restaurant_id, table_id, time_slot, party_size=2):
+    reservation, message = database.create_reservation(restaurant_id, table_id, "9876543210", "Raj",
+                                                       TOMORROW, time_slot, party_size)
+    assert reservation, message
+    return reservation
+
+
+def test_bookings_fill_every_slot_their_sitting_overlaps(database):
+    for table_id in (1, 2, 3):
+        book(database, 1, table_id, "19:00")  # every two-seater, 19:00-20:30
+    book(database, 1, 7, "22:30", party_size=6)  # runs past the last slot
+    cancelled = book(database, 2, 10, "12:00")
+    database.cancel_reservation(cancelled["reservation_id"])
+    
+    analytics = OccupancyAnalytics(database).load()
+    
+    assert analytics.dates == [TOMORROW]
+    assert analytics.capacities.tolist() == [2, 4, 6]
+    slots = analytics.time_slots
+    two_seaters = analytics.occupancy[0, 0, :, 0]
+    assert [slots[i] for i in np.flatnonzero(two_seaters)] == ["19:00", "19:30", "20:00"]
+    assert set(two_seaters[two_seaters > 0].tolist()) == {3}
+    assert [slots[i] for i in np.flatnonzero(analytics.occupancy[0, 0, :, 2])] == ["22:30", "23:00"]
+    assert analytics.occupancy[1:].sum() == 0
+
+
+def test_metrics_roll_occupancy_up_by_restaurant_and_cuisine(database):
+    for table_id in (1, 2, 3):
+        book(database, 1, table_id, "19:00")
+    book(database, 4, 28, "19:00")  # Bella Italia, a two-seater
+    
+    analytics = OccupancyAnalytics(database).load()
+    
+    table_slots = 90 * len(analytics.time_slots)
+    assert analytics.overall_utilization() == pytest.approx(12 / table_slots)
+    # Restaurant 1 is full for its two-seaters at 19:00, 19:30 and 20:00
+    assert analytics.turned_away_estimate().tolist() == [3] + [0] * 9
+    cuisines = analytics.cuisine_rollup()
+    assert cuisines["Indian"]["occupied_table_slots"] == 9
+    assert cuisines["Italian"]["occupied_table_slots"] == 3
+    assert cuisines["Indian"]["turned_away"] == 3
+    summary = analytics.dashboard_summary(top_n=3)
+    assert summary["busiest_restaurants"] == [1, 4]
+    assert summary["turned_away_total"] == 3
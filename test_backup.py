@@ -0,0 +1,67 @@
+"""Tests for online backup and replica shipping (data/backup.py)."""
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+from data.backup import ReplicaShipper, backup_database
+from data.database import TableTurnerDB
+
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def primary(tmp_path):
+    database = TableTurnerDB(str(tmp_path / "primary.db"))
+    database.seed_data()
+    database.create_user("9876543210", "Raj")
+    return database
+
+
+def rows(path, query):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+def test_backup_copies_a_live_database(primary, tmp_path):
+    primary.create_reservation(1, 1, "9876543210", "Raj", TOMORROW, "19:00", 2)
+    target = str(tmp_path / "backup.db")
+    
+    stats = backup_database(primary.db_path, target, pages_per_step=1, sleep_seconds=0)
+    
+    assert stats["steps"] >= stats["pages"] > 1
+    assert rows(target, "SELECT reservation_id FROM reservations") == [("TT1000",)]
+    assert rows(target, "PRAGMA integrity_check") == [("ok",)]
+
+
+def test_shipping_replays_bookings_cancellations_and_the_waitlist(primary, tmp_path):
+    shipper = ReplicaShipper(primary, str(tmp_path / "replica.db"))
+    shipper.initialize()
+    
+    primary.create_user("9123456780", "Asha")
+    reservation, _ = primary.create_reservation(1, 1, "9876543210", "Raj", TOMORROW, "19:00", 2)
+    entry, _ = primary.join_waitlist(1, TOMORROW, "19:00", "19:00", 2, "9123456780", "Asha")
+    primary.cancel_reservation(reservation["reservation_id"])
+    left, _ = primary.join_waitlist(1, TOMORROW, "21:00", "21:00", 4, "9876543210", "Raj")
+    primary.leave_waitlist(left["id"])
+    
+    result = shipper.ship(batch_size=3)
+    
+    assert result["replica_seq"] == primary.get_latest_event_seq()
+    replica = shipper.get_replica()
+    assert replica.get_reservation_by_id(reservation["reservation_id"])["status"] == "cancelled"
+    promoted = replica.get_waitlist_entry(entry["id"])
+    assert promoted == primary.get_waitlist_entry(entry["id"])
+    assert replica.get_reservation_by_id(promoted["reservation_id"])["phone_number"] == "9123456780"
+    assert replica.get_waitlist_entry(left["id"])["status"] == "cancelled"
+    assert replica.get_user("9123456780")["total_reservations"] == 1
+    
+    # Nothing new on the primary: nothing to ship
+    assert shipper.ship()["events_shipped"] == 0
@@ -0,0 +1,70 @@
+"""Tests for the catalog indexes (data/catalog.py)."""
+import itertools
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+
+from data.catalog import (DEFAULT_RECOMMENDATION, DIETARY_BUCKETS, OCCASION_BUCKETS,
+                          RECOMMENDATION_TOP_K, CatalogIndex, RecommendationEngine)
+from data.restaurants import RESTAURANTS
+
+
+def scan(cuisine=None, location=None, price_range=None, min_rating=None):
+    """The filter as a list scan, highest rated first."""
+    matches = [
+        r for r in RESTAURANTS
+        if (not cuisine or r["cuisine"].lower() == cuisine.lower())
+        and (not location or r["location"].lower() == location.lower())
+        and (not price_range or r["price_range"] == price_range)
+        and (min_rating is None or r["rating"] >= min_rating)
+    ]
+    return sorted(matches, key=lambda r: (-r["rating"], r["id"]))
+
+
+def test_filters_match_a_list_scan():
+    catalog = CatalogIndex(RESTAURANTS)
+    cuisines = [None, "Indian", "italian", "Thai"]
+    locations = [None, "Koramangala", "INDIRANAGAR"]
+    price_ranges = [None, "$$", "$$$"]
+    ratings = [None, 4.0, 4.5, 4.51]
+    
+    for filters in itertools.product(cuisines, locations, price_ranges, ratings):
+        assert catalog.filter(*filters) == scan(*filters), filters
+
+
+def test_unknown_values_match_nothing():
+    catalog = CatalogIndex(RESTAURANTS)
+    
+    assert catalog.filter(cuisine="Martian") == []
+    assert catalog.filter(price_range="$$$$$", min_rating=0) == []
+    assert catalog.filter(min_rating=5.1) == []
+
+
+def recommended(occasion=None, diet=None):
+    """Recommendations computed per request from the bucket rules."""
+    ranked = scan()
+    if occasion is None and diet is None:
+        return [r for r in ranked if DEFAULT_RECOMMENDATION(r)][:RECOMMENDATION_TOP_K]
+    matches = ranked
+    if occasion:
+        matches = [r for r in matches if OCCASION_BUCKETS[occasion][1](r)]
+    if diet:
+        both = [r for r in matches if DIETARY_BUCKETS[diet][1](r)]
+        matches = both or matches  # an unmatched pair falls back to the occasion
+    return matches[:RECOMMENDATION_TOP_K]
+
+
+def test_recommendations_match_the_bucket_rules():
+    engine = RecommendationEngine(CatalogIndex(RESTAURANTS))
+    requests = {
+        ("", ""): (None, None),
+        ("Romantic date night", ""): ("romantic", None),
+        ("business meeting", "vegan options"): ("business", "vegetarian"),
+        ("family dinner", "Vegetarian"): ("family", "vegetarian"),
+        ("romantic", "vegetarian"): ("romantic", "vegetarian"),
+        ("birthday", "vegetarian"): (None, "vegetarian"),
+    }
+    
+    for (occasion, diet), buckets in requests.items():
+        assert engine.recommend(occasion, diet) == recommended(*buckets), (occasion, diet)
@@ -0,0 +1,292 @@
+"""Tests for the SQLite TableTurnerDB (data/database.py)."""
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+from data.database import TableTurnerDB
+from data.geo import NEIGHBOURHOOD_COORDINATES, haversine_km
+
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+RAJ = ("9876543210", "Raj")
+ASHA = ("9123456780", "Asha")
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = TableTurnerDB(str(tmp_path / "table_turner.db"))
+    database.seed_data()
+    database.create_user(*RAJ)
+    database.create_user(*ASHA)
+    return database
+
+
+def book(database, table_id=1, time_slot="19:00", guest=RAJ, party_size=2):
+    reservation, message = database.create_reservation(1, table_id, guest[0], guest[1],
+                                                       TOMORROW, time_slot, party_size)
+    assert reservation, message
+    return reservation
+
+
+def last_event(database):
+    return database.read_events(after_seq=database.get_latest_event_seq() - 1)[0]
+
+
+def test_dining_durations_round_up_to_whole_slots_and_grow_with_the_party(database):
+    database.set_dining_duration(1, 100)
+    database.set_dining_duration(1, 150, min_party_size=4)
+    
+    assert database.get_dining_duration(1, 2) == 120
+    assert database.get_dining_duration(1, 4) == 150
+    assert database.get_dining_duration(1, 6) == 120  # the seeded 5+ override is closer
+    first = database.get_available_slots(1, TOMORROW, 2)[0]
+    assert (first["time"], first["end_time"], first["duration_minutes"]) == ("11:00", "13:00", 120)
+
+
+def test_a_booking_blocks_its_table_for_the_whole_sitting(database):
+    for table_id in range(1, 10):
+        book(database, table_id)  # every table, 19:00-20:30
+    
+    assert database.create_reservation(1, 1, *ASHA, TOMORROW, "20:00", 2)[0] is None
+    times = [slot["time"] for slot in database.get_available_slots(1, TOMORROW, 2)]
+    assert "17:30" in times and "20:30" in times
+    assert not {"18:00", "18:30", "19:00", "19:30", "20:00"} & set(times)
+    assert book(database, time_slot="20:30", guest=ASHA)["table_id"] == 1
+
+
+def test_a_hold_blocks_everyone_but_its_holder_until_it_becomes_a_booking(database):
+    hold, _ = database.create_hold(1, 1, TOMORROW, "19:00", 2, holder=RAJ[0])
+    
+    assert database.create_hold(1, 1, TOMORROW, "20:00", 2)[0] is None
+    assert database.create_reservation(1, 1, *ASHA, TOMORROW, "19:00", 2)[0] is None
+    def table_at_seven(holder):
+        slots = database.get_available_slots(1, TOMORROW, 2, holder=holder)
+        return next(slot["table_id"] for slot in slots if slot["time"] == "19:00")
+    assert table_at_seven(RAJ[0]) == 1
+    assert table_at_seven(ASHA[0]) == 2
+    
+    reservation, _ = database.create_reservation(1, 1, *RAJ, TOMORROW, "19:00", 2,
+                                                 hold_id=hold["hold_id"])
+    assert reservation["table_id"] == 1
+    assert database.get_hold(hold["hold_id"]) is None
+
+
+def test_released_and_expired_holds_free_the_table(database):
+    released, _ = database.create_hold(1, 1, TOMORROW, "19:00", 2)
+    assert database.release_hold(released["hold_id"])
+    assert not database.release_hold(released["hold_id"])
+    
+    expired, _ = database.create_hold(1, 2, TOMORROW, "19:00", 2, ttl_seconds=0)
+    assert database.get_hold(expired["hold_id"]) is None
+    assert book(database, table_id=2)["table_id"] == 2
+    assert database.sweep_expired_holds() == 1
+
+
+def test_a_freed_table_goes_to_the_largest_waiting_party_that_fits(database):
+    reservation = book(database, table_id=4, party_size=4)
+    smaller, _ = database.join_waitlist(1, TOMORROW, "19:00", "19:00", 2, *ASHA)
+    larger, _ = database.join_waitlist(1, TOMORROW, "18:30", "19:30", 4, *RAJ)
+    
+    database.cancel_reservation(reservation["reservation_id"])
+    
+    promoted = database.get_waitlist_entry(larger["id"])
+    assert promoted["status"] == "promoted"
+    rebooked = database.get_reservation_by_id(promoted["reservation_id"])
+    assert (rebooked["table_id"], rebooked["time_slot"]) == (4, "18:30")
+    # The table is taken again at 19:00, so the smaller party keeps waiting
+    assert database.get_waitlist_entry(smaller["id"])["status"] == "waiting"
+
+
+def test_text_date_reservations_are_migrated_to_integer_columns(database):
+    with database.get_connection() as conn:
+        # The schema before SCHEMA_VERSION 2; the second row predates end_time
+        conn.execute("DROP TABLE reservations")
+        conn.execute("""
+            CREATE TABLE reservations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, reservation_id TEXT UNIQUE NOT NULL,
+                restaurant_id INTEGER NOT NULL, table_id INTEGER NOT NULL,
+                phone_number TEXT NOT NULL, customer_name TEXT NOT NULL,
+                date TEXT NOT NULL, time_slot TEXT NOT NULL, end_time TEXT,
+                duration_minutes INTEGER, party_size INTEGER NOT NULL,
+                status TEXT DEFAULT 'confirmed', special_requests TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.executemany("""
+            INSERT INTO reservations (reservation_id, restaurant_id, table_id, phone_number,
+                                      customer_name, date, time_slot, end_time, party_size)
+            VALUES (?, 1, ?, ?, ?, ?, ?, ?, 2)
+        """, [("TT900", 1, *RAJ, TOMORROW, "19:00", "20:30"),
+              ("TT901", 2, *RAJ, TOMORROW, "21:00", None)])
+        conn.execute("PRAGMA user_version = 1")
+    
+    migrated = TableTurnerDB(database.db_path)
+    
+    assert migrated.get_reservation_by_id("TT900")["end_time"] == "20:30"
+    legacy = migrated.get_reservation_by_id("TT901")
+    assert (legacy["date"], legacy["time_slot"], legacy["end_time"]) == (TOMORROW, "21:00", "22:30")
+    assert migrated.create_reservation(1, 2, *ASHA, TOMORROW, "22:00", 2)[0] is None
+    with migrated.get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("UPDATE reservations SET day = ? WHERE reservation_id = 'TT900'", (TOMORROW,))
+
+
+def test_joining_the_waitlist_appends_an_event_with_the_entry(database):
+    entry, _ = database.join_waitlist(1, TOMORROW, "19:00", "19:30", 2, *ASHA)
+    
+    event = last_event(database)
+    assert (event["event_type"], event["entity_type"], event["entity_id"]) == \
+        ("waitlist_joined", "waitlist", str(entry["id"]))
+    assert event["payload"] == entry
+
+
+def test_leaving_the_waitlist_appends_an_event_with_the_cancelled_entry(database):
+    entry, _ = database.join_waitlist(1, TOMORROW, "19:00", "19:30", 2, *ASHA)
+    
+    assert database.leave_waitlist(entry["id"])[0]
+    event = last_event(database)
+    assert (event["event_type"], event["entity_id"]) == ("waitlist_left", str(entry["id"]))
+    assert event["payload"]["status"] == "cancelled"
+    
+    # Leaving twice changes nothing, so nothing is logged
+    seq = database.get_latest_event_seq()
+    assert not database.leave_waitlist(entry["id"])[0]
+    assert database.get_latest_event_seq() == seq
+
+
+def test_promotion_books_the_freed_table_and_logs_the_entry(database):
+    for table_id in (1, 2, 3):
+        reservation = book(database, table_id)
+    entry, _ = database.join_waitlist(1, TOMORROW, "19:00", "19:30", 2, *ASHA)
+    seq = database.get_latest_event_seq()
+    
+    assert database.cancel_reservation(reservation["reservation_id"])[0]
+    
+    events = {event["event_type"]: event for event in database.read_events(after_seq=seq)}
+    promoted = events["waitlist_promoted"]["payload"]
+    assert promoted["status"] == "promoted"
+    assert promoted["reservation_id"] == events["reservation_created"]["entity_id"]
+    assert database.get_waitlist_entry(entry["id"]) == {
+        key: value for key, value in promoted.items() if key != "waitlist_id"
+    }
+
+
+def test_promotion_without_auto_promote_holds_the_table_and_logs_the_entry(database):
+    reservation = book(database)
+    entry, _ = database.join_waitlist(1, TOMORROW, "19:00", "19:00", 2, *ASHA, auto_promote=False)
+    
+    database.cancel_reservation(reservation["reservation_id"])
+    
+    event = last_event(database)
+    assert event["event_type"] == "waitlist_notified"
+    assert event["payload"]["status"] == "notified"
+    assert database.get_hold(event["payload"]["hold_id"])["table_id"] == 1
+
+
+def test_events_can_be_filtered_and_read_in_pages(database):
+    first = book(database)
+    database.cancel_reservation(first["reservation_id"])
+    book(database, guest=ASHA)
+    
+    cancelled = database.read_events(event_types=["reservation_cancelled"])
+    assert [event["entity_id"] for event in cancelled] == [first["reservation_id"]]
+    
+    seqs, after_seq = [], 0
+    while page := database.read_events(after_seq=after_seq, limit=2):
+        seqs += [event["seq"] for event in page]
+        after_seq = page[-1]["seq"]
+    assert seqs == list(range(1, database.get_latest_event_seq() + 1))
+
+
+def test_compaction_keeps_the_latest_event_per_row(database):
+    first = book(database)
+    database.cancel_reservation(first["reservation_id"])
+    recent = database.get_latest_event_seq()
+    second = book(database)
+    database.cancel_reservation(second["reservation_id"])
+    everything = database.read_events()
+    
+    removed = database.compact_events(before_seq=recent)
+    
+    kept = database.read_events()
+    assert removed == len(everything) - len(kept)
+    assert [event for event in everything if event["seq"] >= recent] == \
+        [event for event in kept if event["seq"] >= recent]
+    
+    latest = {}
+    for event in everything:
+        latest[event["entity_type"], event["entity_id"]] = event
+    assert database.compact_events() > 0
+    assert database.read_events() == sorted(latest.values(), key=lambda event: event["seq"])
+    
+    # New events continue the numbering; consumers' saved seqs stay valid
+    book(database, guest=ASHA)
+    last_seq = everything[-1]["seq"]
+    assert database.read_events(after_seq=last_seq)[0]["seq"] == last_seq + 1
+
+
+def test_connection_in_use_during_close_is_retired_not_pooled(database):
+    with database.get_connection() as borrowed:
+        database.close()
+    
+    with pytest.raises(sqlite3.ProgrammingError):
+        borrowed.execute("SELECT 1")
+    with database.get_connection() as conn:
+        assert conn is not borrowed
+
+
+def test_reset_in_place_while_another_session_holds_a_connection(database):
+    # What app_resources.reset_database does, with a query in flight elsewhere
+    with database.get_connection() as borrowed:
+        database.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(database.db_path + suffix):
+                os.remove(database.db_path + suffix)
+        database.init_database()
+        database.seed_data()
+    
+    database.create_user(*RAJ)
+    book(database)
+    
+    conn = sqlite3.connect(database.db_path)
+    assert conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0] == 1
+    conn.close()
+    assert database.catalog_version == 3  # seeded twice: caches keyed on 2 are stale
+
+
+def test_nearby_restaurants_match_a_full_scan(database):
+    latitude, longitude = NEIGHBOURHOOD_COORDINATES["Koramangala"]
+    everything = sorted(
+        (round(haversine_km(latitude, longitude, r["latitude"], r["longitude"]), 2), r["id"])
+        for r in database.search_restaurants()
+    )
+    
+    nearest, _ = database.find_restaurants_near("Koramangala", limit=5)
+    within, _ = database.find_restaurants_near("Koramangala", radius_km=3, limit=100)
+    
+    assert [r["distance_km"] for r in nearest] == [distance for distance, _ in everything[:5]]
+    assert sorted(r["id"] for r in within) == sorted(i for distance, i in everything if distance <= 3)
+    assert database.find_restaurants_near("Atlantis") == (None, "Unknown location: Atlantis")
+
+
+def test_restaurants_without_grid_cells_are_backfilled_on_open(database):
+    with database.get_connection() as conn:
+        # The schema before grid cells: a (latitude, longitude) index instead
+        conn.execute("DROP INDEX idx_restaurants_grid")
+        conn.execute("ALTER TABLE restaurants DROP COLUMN grid_row")
+        conn.execute("ALTER TABLE restaurants DROP COLUMN grid_col")
+        conn.execute("CREATE INDEX idx_restaurants_lat_lng ON restaurants(latitude, longitude)")
+    
+    reopened = TableTurnerDB(database.db_path)
+    
+    nearest, _ = reopened.find_restaurants_near("Koramangala", limit=10)
+    assert len(nearest) == 10
+    with reopened.get_connection() as conn:
+        indexes = {row["name"] for row in conn.execute("PRAGMA index_list(restaurants)")}
+    assert "idx_restaurants_grid" in indexes and "idx_restaurants_lat_lng" not in indexes
@@ -0,0 +1,79 @@
+"""Tests for the columnar export (data/export.py)."""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+from data.database import TableTurnerDB
+from data.export import ColumnarExporter
+
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = TableTurnerDB(str(tmp_path / "table_turner.db"))
+    database.seed_data()
+    database.create_user("9876543210", "Raj")
+    database.create_user("9123456780", "Asha")
+    return database
+
+
+def book(database, table_id, phone_number="9876543210", customer_name="Raj"):
+    reservation, message = database.create_reservation(1, table_id, phone_number, customer_name,
+                                                       TOMORROW, "19:00", 2)
+    assert reservation, message
+    return reservation
+
+
+def test_parquet_export_streams_every_table_in_row_groups(database, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    for table_id in (1, 2, 3):
+        book(database, table_id)
+    
+    result = ColumnarExporter(database, str(tmp_path / "out"), chunk_rows=4,
+                              file_format="parquet").export()
+    
+    assert result["rows"] == {"restaurants": 10, "users": 2, "reservations": 3}
+    restaurants = pq.ParquetFile(str(tmp_path / "out" / "restaurants-00001.parquet"))
+    assert restaurants.metadata.num_row_groups == 3
+    reservations = pq.read_table(str(tmp_path / "out" / "reservations-00001.parquet")).to_pylist()
+    assert [(r["reservation_id"], r["date"], r["time_slot"]) for r in reservations] == \
+        [(f"TT{1000 + i}", TOMORROW, "19:00") for i in range(3)]
+
+
+def test_incremental_export_rewrites_only_rows_changed_since_the_last_run(database, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    exporter = ColumnarExporter(database, str(tmp_path / "out"), file_format="parquet")
+    first = book(database, 1)
+    exporter.export()
+    
+    database.cancel_reservation(first["reservation_id"])
+    second = book(database, 2)
+    result = exporter.export()
+    
+    assert result["incremental"] and result["rows"]["reservations"] == 2
+    reservations = pq.read_table(str(tmp_path / "out" / "reservations-00002.parquet")).to_pylist()
+    assert {r["reservation_id"]: r["status"] for r in reservations} == \
+        {first["reservation_id"]: "cancelled", second["reservation_id"]: "confirmed"}
+    # Raj's reservation count changed, Asha's row did not
+    users = pq.read_table(str(tmp_path / "out" / "users-00002.parquet")).to_pylist()
+    assert [(u["phone_number"], u["total_reservations"]) for u in users] == [("9876543210", 2)]
+
+
+def test_npz_export_writes_one_file_per_chunk(database, tmp_path):
+    np = pytest.importorskip("numpy")
+    book(database, 1)
+    
+    result = ColumnarExporter(database, str(tmp_path / "out"), chunk_rows=4,
+                              file_format="npz").export()
+    
+    assert result["rows"]["restaurants"] == 10
+    chunks = sorted(name for name in os.listdir(tmp_path / "out") if name.startswith("restaurants-"))
+    assert chunks == [f"restaurants-00001-0000{chunk}.npz" for chunk in range(3)]
+    reservations = np.load(str(tmp_path / "out" / "reservations-00001-00000.npz"))
+    assert reservations["reservation_id"].tolist() == ["TT1000"]
+    assert reservations["day"].dtype == np.int64
@@ -0,0 +1,80 @@
+"""Tests for the rule-based booking fast path."""
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+from agent.fast_path import FAST_PATH_MIN_CONFIDENCE, BookingExtractor
+
+NOW = datetime(2025, 1, 15, 12, 0)
+RESTAURANTS = [{"id": 1, "name": "Bella Italia"}, {"id": 2, "name": "Spice Garden"}]
+
+
+def extract(message):
+    return BookingExtractor(RESTAURANTS).extract(message, NOW)
+
+
+def test_plain_booking_request_takes_fast_path():
+    request = extract("Book Bella Italia tomorrow at 7 PM for 4 people, 9876543210 I'm Raj")
+    
+    assert request["confidence"] >= FAST_PATH_MIN_CONFIDENCE
+    assert request["refused"] is None
+    assert (request["date"], request["time"], request["party_size"]) == ("2025-01-16", "19:00", 4)
+
+
+@pytest.mark.parametrize("message", [
+    "Cancel my booking at Bella Italia tomorrow at 7 PM for 4 people, 9876543210 I'm Raj",
+    "Please cancel the reservation at Bella Italia tomorrow at 7 PM for 4 people, 9876543210",
+    "Reschedule my booking at Bella Italia to tomorrow at 7 PM for 4 people, 9876543210",
+])
+def test_cancel_and_change_requests_are_refused(message):
+    request = extract(message)
+    
+    assert request["confidence"] == 0.0
+    assert request["refused"] == "change"
+
+
+@pytest.mark.parametrize("message", [
+    "Book Bella Italia tomorrow at 7 PM for 4? Is it vegetarian friendly? 9876543210 I'm Raj",
+    "Can I book Bella Italia tomorrow at 7 PM for 4 people, 9876543210",
+])
+def test_questions_are_refused(message):
+    request = extract(message)
+    
+    assert request["confidence"] == 0.0
+    assert request["refused"] == "question"
+
+
+def test_negations_are_refused():
+    request = extract("Don't book Bella Italia tomorrow at 7 PM for 4 people, 9876543210 I'm Raj")
+    
+    assert request["confidence"] == 0.0
+    assert request["refused"] == "negation"
+
+
+def test_booking_verb_is_required():
+    request = extract("Bella Italia tomorrow at 7 PM for 4 people, 9876543210 I'm Raj")
+    
+    assert request["confidence"] == 0.0
+    assert request["refused"] == "no booking verb"
+
+
+def test_cancel_message_does_not_hold_or_book():
+    pytest.importorskip("google.generativeai")
+    from agent.hybrid_agent_v3 import HybridAgentV3
+    from data.database import TableTurnerDB
+    
+    database = TableTurnerDB(os.path.join(tempfile.mkdtemp(), "fast_path.db"))
+    database.seed_data()
+    agent = HybridAgentV3("test", database)
+    agent.start_chat()
+    
+    reply = agent._try_fast_path("Cancel my booking at Bella Italia tomorrow at 7 PM for 4 people, 9876543210 I'm Raj")
+    
+    assert reply is None
+    assert agent.user_context["pending_booking"] == {}
+    assert not database.check_user_exists("9876543210")
@@ -0,0 +1,62 @@
+"""Tests for bounded chat history (agent/history.py)."""
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+genai = pytest.importorskip("google.generativeai")
+
+from agent.history import SUMMARY_PREFIX, HistoryManager, split_turns
+
+
+def text(role, value):
+    return genai.protos.Content(role=role, parts=[genai.protos.Part(text=value)])
+
+
+def tool_result(name):
+    response = genai.protos.FunctionResponse(name=name, response={"result": "ok"})
+    return genai.protos.Content(role="user", parts=[genai.protos.Part(function_response=response)])
+
+
+def turn(number):
+    """A user message, a tool round trip and the model's reply."""
+    return [text("user", f"message {number}"), text("model", "calling a tool"),
+            tool_result("search_restaurants"), text("model", f"reply {number}")]
+
+
+def messages(history):
+    return [content.parts[0].text for content in history if content.parts[0].text]
+
+
+def test_function_responses_stay_in_the_turn_that_made_the_call():
+    turns = split_turns(turn(1) + turn(2))
+    
+    assert [len(t) for t in turns] == [4, 4]
+    assert messages(turns[1]) == ["message 2", "calling a tool", "reply 2"]
+
+
+def test_old_turns_are_folded_into_a_summary_of_the_current_state():
+    state = {"restaurant": "Spice Garden"}
+    history = HistoryManager(lambda: f"Restaurant: {state['restaurant']}", max_turns=3)
+    chat = SimpleNamespace(history=[content for number in range(1, 9) for content in turn(number)])
+    
+    assert history.compact(chat)
+    
+    summary, ack, *recent = chat.history
+    assert summary.parts[0].text.startswith(f"{SUMMARY_PREFIX} 5 earlier turns")
+    assert summary.parts[0].text.endswith("Restaurant: Spice Garden")
+    assert ack.role == "model"
+    assert len(recent) == 12
+    assert messages(recent) == messages(turn(6) + turn(7) + turn(8))
+    assert not history.compact(chat)
+    
+    # The next compaction replaces the summary rather than stacking another one
+    state["restaurant"] = "Bella Italia"
+    chat.history += turn(9) + turn(10)
+    assert history.compact(chat)
+    assert messages(chat.history)[0].startswith(f"{SUMMARY_PREFIX} 7 earlier turns")
+    assert messages(chat.history)[0].endswith("Restaurant: Bella Italia")
+    assert len(split_turns(chat.history)) == 3
@@ -0,0 +1,154 @@
+"""Tests for the journaled in-memory stores (data/restaurants.py, data/table_turner_db.py)."""
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+
+from data.journal import JOURNAL_FILE
+from data.restaurants import SEATS_PER_BOOKING, ReservationDatabase
+from data.table_turner_db import TableTurnerDatabase
+
+TODAY = datetime.now().strftime("%Y-%m-%d")
+
+
+def write_journal(directory, entries):
+    """Write [seq, op, payload] entries as a journal file."""
+    with open(os.path.join(directory, JOURNAL_FILE), "w", encoding="utf-8") as f:
+        for seq, (op, payload) in enumerate(entries, start=1):
+            f.write(json.dumps([seq, op, payload]) + "\n")
+
+
+def reservation(reservation_id, time="19:00"):
+    """A ReservationDatabase reservation as create_reservation journals it."""
+    return {
+        "id": reservation_id, "restaurant_id": 1, "customer_name": "Raj", "customer_phone": "9876543210",
+        "date": TODAY, "time": time, "party_size": 2, "special_requests": "", "status": "confirmed",
+        "created_at": "2025-01-15T12:00:00",
+    }
+
+
+def table_turner_reservation(reservation_id, time_slot="19:00"):
+    """A TableTurnerDatabase reservation as create_reservation journals it."""
+    return {
+        "reservation_id": reservation_id, "restaurant_id": 1, "phone_number": "9876543210",
+        "customer_name": "Raj", "date": TODAY, "time": time_slot, "party_size": 2, "table_size": 2,
+        "status": "confirmed", "created_at": "2025-01-15T12:00:00",
+    }
+
+
+def test_recovery_after_out_of_order_ids_hands_out_a_fresh_id(tmp_path):
+    # A booking can reach the journal after one that was given a later id
+    write_journal(tmp_path, [
+        ("reservation_created", reservation(2)),
+        ("reservation_created", reservation(1, time="20:00")),
+    ])
+    
+    db = ReservationDatabase(data_dir=str(tmp_path))
+    booked, _ = db.create_reservation(1, "Asha", "9123456780", TODAY, "21:00", 2)
+    
+    assert db.next_id == 4
+    assert booked["id"] == 3
+    assert sorted(db.reservations_by_id) == [1, 2, 3]
+
+
+def test_table_turner_recovery_after_out_of_order_ids_hands_out_a_fresh_id(tmp_path):
+    write_journal(tmp_path, [
+        ("reservation_created", table_turner_reservation("TT1001")),
+        ("reservation_created", table_turner_reservation("TT1000", time_slot="20:00")),
+    ])
+    
+    db = TableTurnerDatabase(data_dir=str(tmp_path))
+    booked, _ = db.create_reservation(1, "9123456780", "Asha", TODAY, "21:00", 2, 2)
+    
+    assert booked["reservation_id"] == "TT1002"
+    assert len(db.reservations_by_id) == 3
+
+
+def test_table_turner_indexes_follow_bookings_and_cancellations():
+    db = TableTurnerDatabase()
+    db.create_user("9876543210", "Raj")
+    first, _ = db.create_reservation(1, "9876543210", "Raj", TODAY, "19:00", 2, 2)
+    second, _ = db.create_reservation(1, "9876543210", "Raj", TODAY, "20:00", 2, 2)
+    
+    assert db.create_reservation(1, "9123456780", "Asha", TODAY, "19:00", 2, 2)[0] is None
+    assert db.find_nearest_available_slot(1, TODAY, "19:00", 2)["table_size"] == 4
+    
+    assert db.cancel_reservation(first["reservation_id"])[0]
+    assert not db.cancel_reservation(first["reservation_id"])[0]
+    assert db.get_user_reservations("9876543210") == [second]
+    assert db.get_user("9876543210")["total_reservations"] == 2
+    assert db.find_nearest_available_slot(1, TODAY, "19:00", 2)["table_size"] == 2
+    assert db.create_reservation(1, "9123456780", "Asha", TODAY, "19:00", 2, 2)[0]
+
+
+def test_seat_counts_follow_bookings_moves_and_cancellations():
+    db = ReservationDatabase()
+    capacity = db.get_restaurant_by_id(1)["capacity"]
+    booked = []
+    while (reservation := db.create_reservation(1, "Raj", "9876543210", TODAY, "19:00", 2)[0]):
+        booked.append(reservation)
+    
+    # Every booking counts SEATS_PER_BOOKING seats, whatever the party size
+    assert len(booked) == (capacity - 2) // SEATS_PER_BOOKING + 1
+    db.modify_reservation(booked[0]["id"], time="20:00")
+    db.cancel_reservation(booked[1]["id"])
+    
+    seats = len(booked) * SEATS_PER_BOOKING
+    assert db.booked_seats == {(1, TODAY, "19:00"): seats - 2 * SEATS_PER_BOOKING,
+                               (1, TODAY, "20:00"): SEATS_PER_BOOKING}
+    assert db.check_availability(1, TODAY, "19:00", 2)[0]
+    db.modify_reservation(booked[0]["id"], status="cancelled")
+    assert (1, TODAY, "20:00") not in db.booked_seats
+
+
+def distinct_stripe_dates(db, count):
+    """Dates whose (restaurant 1, date) keys land on different lock stripes."""
+    dates, stripes = [], set()
+    day = datetime.now()
+    while len(dates) < count:
+        day += timedelta(days=1)
+        date = day.strftime("%Y-%m-%d")
+        stripe = db._booking_locks.lock((1, date))
+        if stripe not in stripes:
+            stripes.add(stripe)
+            dates.append(date)
+    return dates
+
+
+def test_modify_rereads_a_reservation_moved_while_it_waited_for_the_locks():
+    db = ReservationDatabase()
+    first, moved, target = distinct_stripe_dates(db, 3)
+    booked, _ = db.create_reservation(1, "Raj", "9876543210", first, "19:00", 2)
+    
+    # Every commit must hold the stripe of the slot it takes seats from
+    commit = db._commit
+    unguarded = []
+    def checked_commit(op, payload):
+        reservation = db.reservations_by_id[payload["id"]]
+        if not db._booking_locks.lock((reservation["restaurant_id"], reservation["date"])).locked():
+            unguarded.append(reservation["date"])
+        commit(op, payload)
+    db._commit = checked_commit
+    
+    holding = db._booking_locks.holding
+    waiting = threading.Event()
+    def signalling_holding(*keys):
+        waiting.set()
+        return holding(*keys)
+    db._booking_locks.holding = signalling_holding
+    
+    with db._booking_locks.lock((1, first)):
+        worker = threading.Thread(target=db.modify_reservation, args=(booked["id"],), kwargs={"date": target})
+        worker.start()
+        waiting.wait()
+        # Another modify moves it while the worker waits for the first date's stripe
+        with db._booking_locks.lock((1, moved)):
+            commit("reservation_modified", {"id": booked["id"], "changes": {"date": moved}})
+    worker.join()
+    
+    assert unguarded == []
+    assert db.get_reservation(booked["id"])["date"] == target
+    assert db.booked_seats == {(1, target, "19:00"): 4}
@@ -0,0 +1,48 @@
+"""Tests for per-turn round-trip, token and latency accounting (agent/metrics.py)."""
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(__file__))
+
+import agent.metrics
+from agent.metrics import SessionMetrics
+
+
+def response(prompt_tokens, response_tokens):
+    usage = SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=response_tokens)
+    return SimpleNamespace(usage_metadata=usage)
+
+
+def test_a_turn_counts_round_trips_tokens_and_tool_calls():
+    session = SessionMetrics()
+    turn = session.start_turn()
+    
+    turn.call_model(lambda message: response(100, 10), "Book Spice Garden")
+    with turn.timing_tools():
+        turn.track(lambda name, args: "ok")("check_availability", {})
+    # Streamed chunks carry the usage so far; only the last one counts
+    chunks = list(turn.stream_model(lambda: [response(150, 5), response(150, 20)]))
+    session.finish_turn(turn)
+    
+    assert len(chunks) == 2
+    recorded = session.last_turn
+    assert (recorded["path"], recorded["round_trips"]) == ("llm", 2)
+    assert (recorded["prompt_tokens"], recorded["response_tokens"]) == (250, 30)
+    assert [tool["name"] for tool in recorded["tools"]] == ["check_availability"]
+    assert recorded["total_seconds"] >= recorded["model_seconds"] + recorded["tool_seconds"] - 1e-3
+
+
+def test_sessions_keep_recent_turns_and_running_totals(monkeypatch):
+    monkeypatch.setattr(agent.metrics, "SESSION_TURN_LIMIT", 3)
+    session = SessionMetrics()
+    for path in ("llm", "fast_path", "cache", "llm", "llm"):
+        turn = session.start_turn()
+        turn.call_model(lambda: response(10, 1))
+        session.finish_turn(turn, path=path)
+    
+    summary = session.summary()
+    assert len(session.turns) == 3
+    assert summary["turns"] == 5
+    assert summary["paths"] == {"llm": 3, "fast_path": 1, "cache": 1}
+    assert summary["per_turn"]["prompt_tokens"] == 10
@@ -0,0 +1,107 @@
+"""Tests for the shared reply and catalog caches (agent/response_cache.py)."""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+pytest.importorskip("google.generativeai")
+
+from agent.response_cache import (ConversationCache, LRUCache, catalog_lookup,
+                                  response_cache, tool_cache)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    response_cache.clear()
+    tool_cache.clear()
+    yield
+    response_cache.clear()
+    tool_cache.clear()
+
+
+class Catalog:
+    """A database stand-in that counts catalog queries."""
+    
+    db_path = "catalog.db"
+    
+    def __init__(self):
+        self.catalog_version = 1
+        self.queries = 0
+        self.context = {}
+    
+    def search_restaurants(self, cuisine=None):
+        self.queries += 1
+        return [{"name": "Spice Garden", "cuisine": cuisine}]
+
+
+def test_lru_cache_evicts_the_least_recently_used_and_expires_old_entries():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+    
+    expiring = LRUCache(maxsize=2, ttl=0.01)
+    expiring.put("a", 1)
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+    assert expiring.stats()["expirations"] == 1
+
+
+def test_catalog_lookups_are_shared_until_the_catalog_changes():
+    database = Catalog()
+    
+    first = catalog_lookup(database, database.search_restaurants, cuisine="Indian")
+    again = catalog_lookup(database, database.search_restaurants, cuisine="Indian")
+    catalog_lookup(database, database.search_restaurants, cuisine="Thai")
+    assert again is first
+    assert database.queries == 2
+    
+    database.catalog_version = 2
+    catalog_lookup(database, database.search_restaurants, cuisine="Indian")
+    assert database.queries == 3
+
+
+def conversation(database):
+    return ConversationCache("agent", database, frozenset({"search_restaurants"}),
+                             lambda: database.context)
+
+
+def answer(cache, message, reply, tool="search_restaurants"):
+    """One turn: a cache miss answered by calling `tool`, then stored."""
+    assert cache.lookup(message) is None
+    cache.track(lambda name, args: None)(tool, {})
+    cache.store(reply)
+
+
+def test_stateless_conversations_share_replies():
+    database = Catalog()
+    first = conversation(database)
+    answer(first, "Show me Indian restaurants", "Spice Garden")
+    answer(first, "Any in Koramangala?", "Spice Garden, Koramangala")
+    
+    second = conversation(database)
+    assert second.lookup("show me   indian restaurants!") == "Spice Garden"
+    assert second.lookup("Any in Koramangala") == "Spice Garden, Koramangala"
+    # Replies are keyed by the whole conversation, not the last message
+    assert conversation(database).lookup("Any in Koramangala?") is None
+
+
+def test_a_conversation_stops_caching_once_it_has_state():
+    database = Catalog()
+    booking = conversation(database)
+    answer(booking, "Book Spice Garden for 2", "Which time?", tool="make_reservation")
+    answer(booking, "Show me Indian restaurants", "Spice Garden")
+    assert response_cache.stats()["size"] == 0
+    
+    signed_in = conversation(database)
+    answer(signed_in, "Show me Indian restaurants", "Spice Garden")
+    database.context["phone"] = "9876543210"
+    assert signed_in.lookup("Any in Koramangala?") is None
+    assert response_cache.stats()["size"] == 1
@@ -0,0 +1,82 @@
+"""Tests for executing a model turn's function calls (agent/tool_calls.py)."""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(__file__))
+
+pytest.importorskip("google.generativeai")
+
+from agent.tool_calls import execute_function_calls, execute_function_calls_async, ordered_context_write
+
+LOOKUP_SECONDS = 0.2
+
+
+class Tools:
+    """Lookups that sleep, then record what they found; finish is a barrier."""
+    
+    def __init__(self):
+        self.context = {}
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def execute(self, name, args):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            if name == "lookup":
+                time.sleep(args["seconds"])
+                with ordered_context_write():
+                    self.context["selected"] = args["value"]
+            else:
+                self.context["finished_with"] = self.context.get("selected")
+            return args.get("value")
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+CALLS = [
+    # The first lookup finishes last, but the model emitted it first
+    ("lookup", {"value": "first", "seconds": LOOKUP_SECONDS}),
+    ("lookup", {"value": "second", "seconds": 0.0}),
+    ("finish", {}),
+    ("lookup", {"value": "third", "seconds": 0.0}),
+]
+
+
+def check(tools, results, seconds):
+    assert results == ["first", "second", None, "third"]
+    assert tools.peak == 2
+    assert seconds < 2 * LOOKUP_SECONDS
+    # Writes landed in call order, and the barrier saw the batch before it
+    assert tools.context == {"selected": "third", "finished_with": "second"}
+
+
+def test_lookups_run_together_and_write_context_in_call_order():
+    tools = Tools()
+    
+    started = time.perf_counter()
+    results = execute_function_calls(CALLS, tools.execute, frozenset({"lookup"}))
+    
+    check(tools, results, time.perf_counter() - started)
+
+
+def test_async_lookups_run_together_and_write_context_in_call_order():
+    tools = Tools()
+    
+    started = time.perf_counter()
+    results = asyncio.run(execute_function_calls_async(CALLS, tools.execute, frozenset({"lookup"})))
+    
+    check(tools, results, time.perf_counter() - started)
+
+
+def test_context_writes_outside_a_batch_do_not_wait():
+    with ordered_context_write():
+        pass
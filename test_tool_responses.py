@@ -0,0 +1,43 @@
+"""Tests for shaping tool results before they reach the model (agent/tool_responses.py)."""
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+
+from agent.tool_responses import RESTAURANT_FIELDS, ResponseShape, shape_response
+
+RESTAURANTS = [
+    {"id": i, "name": f"Restaurant {i}", "cuisine": "Indian", "location": "Koramangala",
+     "rating": 4.5, "price_range": "$$", "latitude": 12.9, "longitude": 77.6,
+     "description": "A long description the model does not need"}
+    for i in range(1, 13)
+]
+
+SHAPES = {
+    "search_restaurants": ResponseShape({"restaurants": RESTAURANT_FIELDS}, page="restaurants"),
+    "check_availability": ResponseShape({"restaurant": ("id", "name")}, tabular=False),
+}
+
+
+def test_lists_are_projected_tabulated_and_paged():
+    result = {"success": True, "restaurants": RESTAURANTS}
+    
+    first = shape_response(SHAPES, "search_restaurants", result, {})
+    last = shape_response(SHAPES, "search_restaurants", result, {"cursor": 10})
+    
+    assert first["restaurants"]["columns"] == list(RESTAURANT_FIELDS)
+    assert first["restaurants"]["rows"][0] == [1, "Restaurant 1", "Indian", "Koramangala", 4.5, "$$"]
+    assert (len(first["restaurants"]["rows"]), first["total"], first["next_cursor"]) == (5, 12, 5)
+    assert [row[0] for row in last["restaurants"]["rows"]] == [11, 12]
+    assert last["next_cursor"] is None
+    assert result["restaurants"] is RESTAURANTS  # the original result is left alone
+
+
+def test_dicts_are_projected_and_other_results_pass_through():
+    result = {"available": True, "restaurant": RESTAURANTS[0]}
+    
+    assert shape_response(SHAPES, "check_availability", result, {}) == \
+        {"available": True, "restaurant": {"id": 1, "name": "Restaurant 1"}}
+    assert shape_response(SHAPES, "search_restaurants", "Error: no database", {}) == "Error: no database"
+    assert shape_response(SHAPES, "make_reservation", result, {}) is result
+    assert shape_response(None, "search_restaurants", result, {}) is result